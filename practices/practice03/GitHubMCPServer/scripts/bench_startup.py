@@ -0,0 +1,132 @@
+"""Measure GitHub MCP Server cold start, with lazy and eager tool registration.
+
+Two measurements per mode (GITHUB_LAZY_TOOLS=true / false):
+
+- import time: ``python -X importtime -c "import github_mcp_server.server"``,
+  reporting the cumulative time of the server import, the part spent in
+  github_mcp_server modules and the slowest of them;
+- time to first tools/list: spawn the stdio server, send initialize,
+  notifications/initialized and tools/list, and time until the tools/list
+  response arrives (the latency a new agent session sees).
+
+Usage:
+    python scripts/bench_startup.py [--runs 5] [--top 8] [--mode lazy|eager|both]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+SERVER_MODULE = "github_mcp_server.server"
+PROTOCOL_VERSION = "2025-06-18"
+
+
+def _env(lazy: bool) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_PATH), env.get("PYTHONPATH")]))
+    env["GITHUB_LAZY_TOOLS"] = "true" if lazy else "false"
+    return env
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure_import(lazy: bool) -> List[Tuple[str, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {SERVER_MODULE}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=_env(lazy),
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_first_list(lazy: bool) -> Tuple[float, int]:
+    """Seconds from spawning the stdio server to its tools/list response."""
+    messages = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "bench_startup", "version": "0"},
+        }},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+    ]
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", SERVER_MODULE],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=_env(lazy),
+    )
+    try:
+        process.stdin.write("".join(json.dumps(message) + "\n" for message in messages))
+        process.stdin.flush()
+        for line in process.stdout:
+            response = json.loads(line)
+            if response.get("id") == 2:
+                elapsed = time.perf_counter() - started
+                return elapsed, len(response["result"]["tools"])
+        raise RuntimeError("Server exited before answering tools/list")
+    finally:
+        process.kill()
+        process.wait()
+
+
+def report(mode: str, runs: int, top: int) -> None:
+    lazy = mode == "lazy"
+    print(f"\n== {mode} (GITHUB_LAZY_TOOLS={'true' if lazy else 'false'}) ==")
+
+    totals, own = [], []
+    rows: List[Tuple[str, int, int]] = []
+    for _ in range(runs):
+        rows = measure_import(lazy)
+        totals.append(next(c for name, _, c in rows if name == SERVER_MODULE))
+        own.append(sum(s for name, s, _ in rows if name.startswith("github_mcp_server")))
+    print(f"import {SERVER_MODULE}: median {statistics.median(totals) / 1000:.1f} ms "
+          f"(github_mcp_server modules: {statistics.median(own) / 1000:.1f} ms self)")
+    slowest = sorted((r for r in rows if r[0].startswith("github_mcp_server")), key=lambda r: -r[1])[:top]
+    for name, self_us, _ in slowest:
+        print(f"  {self_us / 1000:7.1f} ms  {name}")
+
+    timings = []
+    tool_count = 0
+    for _ in range(runs):
+        elapsed, tool_count = measure_first_list(lazy)
+        timings.append(elapsed)
+    print(f"spawn -> first tools/list ({tool_count} tools): median {statistics.median(timings) * 1000:.1f} ms, "
+          f"min {min(timings) * 1000:.1f} ms over {runs} runs")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement (default 5)")
+    parser.add_argument("--top", type=int, default=8, help="Slowest github_mcp_server modules to list")
+    parser.add_argument("--mode", choices=["lazy", "eager", "both"], default="both")
+    args = parser.parse_args()
+
+    for mode in (["lazy", "eager"] if args.mode == "both" else [args.mode]):
+        report(mode, args.runs, args.top)
+
+
+if __name__ == "__main__":
+    main()
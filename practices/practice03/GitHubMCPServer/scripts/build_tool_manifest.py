@@ -0,0 +1,27 @@
+"""Regenerate src/github_mcp_server/tools/manifest.json.
+
+The manifest lets the server register its tools without importing them
+(GITHUB_LAZY_TOOLS). Run this after changing a tool's input model,
+docstring or annotations; the server falls back to eager registration while
+the manifest is stale.
+"""
+
+import sys
+from pathlib import Path
+
+# Ensure 'src' is on sys.path so imports like 'github_mcp_server.*' work without installing the package
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+
+def main() -> None:
+    from github_mcp_server.utils.tool_registry import MANIFEST_PATH, write_manifest
+
+    manifest = write_manifest()
+    print(f"Wrote {len(manifest['tools'])} tools to {MANIFEST_PATH.relative_to(PROJECT_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
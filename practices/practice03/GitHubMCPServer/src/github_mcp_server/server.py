@@ -1,18 +1,13 @@
 """GitHub MCP Server main file."""
 
 import os
+import math
 import logging
+from contextlib import asynccontextmanager
 from fastmcp import FastMCP
-
-# Import tool submodules explicitly to avoid __init__ re-exports
-import importlib
-search_issues_mod = importlib.import_module("github_mcp_server.tools.search_issues")
-list_pull_requests_mod = importlib.import_module("github_mcp_server.tools.list_pull_requests")
-get_file_content_mod = importlib.import_module("github_mcp_server.tools.get_file_content")
-list_repository_contents_mod = importlib.import_module("github_mcp_server.tools.list_repository_contents")
-get_issue_details_mod = importlib.import_module("github_mcp_server.tools.get_issue_details")
-get_pull_request_details_mod = importlib.import_module("github_mcp_server.tools.get_pull_request_details")
-search_code_mod = importlib.import_module("github_mcp_server.tools.search_code")
+from github_mcp_server.utils.tool_registry import LazyTool, registered_tools
+from github_mcp_server.utils.drain import DrainMiddleware, drain_timeout
+from github_mcp_server.utils.env import env_bool, env_int
 
 # Configure logging
 logging.basicConfig(
@@ -22,28 +17,104 @@ logging.basicConfig(
 logger = logging.getLogger("github-mcp-server")
 
 
+# Tracks in-flight tool calls for graceful shutdown
+drain = DrainMiddleware()
+
+# Set when serving over HTTP: SIGINT/SIGTERM then start draining
+_drain_on_signal = False
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Open shared resources on startup and release them on shutdown.
+
+    The pooled HTTP client lives for the whole server process so every tool
+    call reuses warm connections to the GitHub API. The cache sweeper removes
+    expired entries in the background, and configured git mirrors are cloned
+    and fetched periodically. With GITHUB_SHARED_STATE the caches and quotas
+    are shared with the other server processes. On shutdown, in-flight tool
+    calls are drained before the HTTP client is closed.
+
+    The HTTP stack and the caches are imported here rather than at module
+    level, so listing the tools does not load them.
+    """
+    from github_mcp_server.utils.http_client import get_client_manager
+    from github_mcp_server.utils.conditional import get_conditional_stats
+    from github_mcp_server.utils.cache import start_sweeper, stop_sweeper, cache_stats
+    from github_mcp_server.utils.rate_limit import get_rate_limit_stats
+    from github_mcp_server.utils.retry import get_retry_stats
+    from github_mcp_server.utils.blob_store import get_blob_store_stats
+    from github_mcp_server.utils.result_store import get_result_store, get_result_store_stats
+    from github_mcp_server.utils.git_mirror import get_mirror_manager
+    from github_mcp_server.utils.shared_state import (
+        attach_shared_state,
+        detach_shared_state,
+        get_shared_state_stats,
+    )
+
+    attach_shared_state()
+    drain.reset()
+    restore_signals = drain.install_signal_handlers() if _drain_on_signal else None
+    client_manager = get_client_manager()
+    await client_manager.start()
+    result_store = get_result_store()
+    start_sweeper(also=[result_store.sweep] if result_store is not None else [])
+    mirrors = get_mirror_manager()
+    mirrors.start()
+    try:
+        yield {}
+    finally:
+        drain.begin()
+        await drain.wait_idle(drain_timeout())
+        if restore_signals is not None:
+            restore_signals()
+        await mirrors.stop()
+        await stop_sweeper()
+        await client_manager.aclose()
+        logger.info("HTTP client pool closed")
+        logger.info(f"Drain stats: {drain.stats()}")
+        logger.info(f"Conditional request stats: {get_conditional_stats()}")
+        logger.info(f"Cache stats: {cache_stats()}")
+        logger.info(f"Blob store stats: {get_blob_store_stats()}")
+        logger.info(f"Result store stats: {get_result_store_stats()}")
+        logger.info(f"Rate limit stats: {get_rate_limit_stats()}")
+        retry_summary = {k: v for k, v in get_retry_stats().items() if k != "recent"}
+        logger.info(f"Retry stats: {retry_summary}")
+        shared_stats = get_shared_state_stats()
+        if shared_stats is not None:
+            logger.info(f"Shared state stats: {shared_stats}")
+        detach_shared_state()
+
+
 # Create main FastMCP instance
 mcp = FastMCP(
     name="GitHub MCP Server",
     version="0.1.0",
+    lifespan=lifespan,
     instructions="""
 A Model Context Protocol server that provides tools for interacting with GitHub.
 
 Available tools:
 - search_issues: Search GitHub issues across repositories
+- search_across_repositories: Search issues or code in a list of repositories or an organization with one call
 - list_pull_requests: List pull requests for a specific repository
+- get_pull_request_diff: Changed files of a pull request, then the hunks of one file at a time
 - get_file_content: Get content of files from GitHub repositories
 - list_repository_contents: Browse repository file structures
+- get_issue_details_batch / get_pull_request_details_batch: Details for many issues or PRs in one call
+- fetch_more: Continue a truncated response from its 'next_cursor' (no GitHub calls)
 
 Authentication:
 - Set GITHUB_TOKEN environment variable with a GitHub Personal Access Token
+- Several tokens can be pooled via GITHUB_TOKENS (comma-separated) or GITHUB_TOKENS_FILE
 - Token requires 'repo' scope for private repositories
 - Public repositories can be accessed without authentication (but rate limits apply)
 
 Rate Limits:
 - Authenticated requests: 5000 requests per hour
 - Unauthenticated requests: 60 requests per hour
-- The server handles rate limiting and provides helpful error messages
+- Requests are paced per quota bucket (core, search, code_search); when a quota
+  is exhausted, calls are queued until reset instead of failing immediately
 
 Response Formats:
 - JSON: Structured data for programmatic use
@@ -52,22 +123,35 @@ Response Formats:
 Detail Levels:
 - Concise: Summary information with key details
 - Detailed: Complete information with all available data
+
+Truncation:
+- Responses larger than the output limit end with '_truncation' (JSON) or a
+  'next_cursor' note (Markdown); pass its 'next_cursor' to fetch_more to read
+  the rest
 """
 )
 
 
+# Refuse new tool calls and wait for running ones on shutdown
+mcp.add_middleware(drain)
+
+
 def check_environment() -> None:
     """Check if required environment variables are set."""
-    github_token = os.getenv("GITHUB_TOKEN")
+    from github_mcp_server.utils.token_pool import get_token_pool
+
+    token_count = len(get_token_pool())
     
-    if not github_token or github_token == "your_github_personal_access_token_here":
+    if token_count == 0:
         logger.warning(
             "GITHUB_TOKEN not set or using default value. "
             "Some features may be limited due to rate restrictions. "
             "Set GITHUB_TOKEN with a valid GitHub Personal Access Token for full functionality."
         )
-    else:
+    elif token_count == 1:
         logger.info("GitHub token configured successfully")
+    else:
+        logger.info(f"GitHub token pool configured with {token_count} tokens")
 
 
 def register_tools() -> None:
@@ -76,41 +160,89 @@ def register_tools() -> None:
     Note: This function is synchronous so it can be safely called at import time.
     This ensures tools are available when using `fastmcp dev`, which imports the
     module and may not execute the `__main__` block.
+
+    With GITHUB_LAZY_TOOLS (the default) tools are registered from the
+    generated manifest and each tool module is imported on the tool's first
+    call; see utils/tool_registry.py.
     """
-    tools_to_register = [
-        (search_issues_mod, "search_issues"),
-        (list_pull_requests_mod, "list_pull_requests"),
-        (get_file_content_mod, "get_file_content"),
-        (list_repository_contents_mod, "list_repository_contents"),
-        (get_issue_details_mod, "get_issue_details"),
-        (get_pull_request_details_mod, "get_pull_request_details"),
-        (search_code_mod, "search_code"),
-    ]
-
-    for module, func_name in tools_to_register:
-        try:
-            func = getattr(module, func_name)
-            annotations = getattr(module, "TOOL_ANNOTATIONS", {})
-            # Register tool function with annotations into the single MCP instance
-            mcp.tool(annotations=annotations)(func)
-            logger.info(f"Registered tool: {func_name}")
-        except Exception as e:
-            logger.error(f"Failed to register tool '{func_name}': {e}")
+    for tool in registered_tools():
+        mcp.add_tool(tool)
+        mode = "lazy" if isinstance(tool, LazyTool) else "eager"
+        logger.info(f"Registered tool: {tool.name} ({mode})")
 
 
 # Register tools at import time so FastMCP dev can discover them immediately
 register_tools()
 
 
+def _http_stateless() -> bool:
+    return env_bool("GITHUB_HTTP_STATELESS", True)
+
+
+def create_http_app():
+    """Build the streamable HTTP application.
+
+    This is also the uvicorn factory each worker process calls when
+    GITHUB_WORKERS > 1. In stateless mode every request carries its own
+    context, so consecutive calls of one client may be served by different
+    workers.
+    """
+    global _drain_on_signal
+    _drain_on_signal = True
+    return mcp.http_app(path=os.getenv("GITHUB_HTTP_PATH", "/mcp"), stateless_http=_http_stateless())
+
+
+def run_http() -> None:
+    """Serve over streamable HTTP with GITHUB_WORKERS worker processes.
+
+    Several workers share the listening socket; their caches, continuation
+    cursors and rate-limit quotas are shared through GITHUB_SHARED_STATE
+    (by default a SQLite file in GITHUB_CACHE_DIR). On SIGTERM or SIGINT each
+    worker stops accepting connections, refuses new tool calls and waits up
+    to GITHUB_DRAIN_TIMEOUT seconds for the calls in flight.
+    """
+    import uvicorn
+    from github_mcp_server.utils.shared_state import default_state_path
+
+    host = os.getenv("GITHUB_HTTP_HOST", "127.0.0.1")
+    port = env_int("GITHUB_HTTP_PORT", 8000)
+    workers = env_int("GITHUB_WORKERS", 1, minimum=1)
+    options = {
+        "host": host,
+        "port": port,
+        "lifespan": "on",
+        "log_level": "info",
+        "timeout_graceful_shutdown": math.ceil(drain_timeout()),
+    }
+
+    if workers == 1:
+        logger.info(f"Starting GitHub MCP Server on http://{host}:{port} ...")
+        uvicorn.run(create_http_app(), **options)
+        return
+
+    if not _http_stateless():
+        # Sessions live in one process; any worker must be able to answer any request
+        logger.warning("GITHUB_HTTP_STATELESS=false is not supported with several workers; serving statelessly")
+        os.environ["GITHUB_HTTP_STATELESS"] = "true"
+    if not os.getenv("GITHUB_SHARED_STATE"):
+        # Inherited by the worker processes
+        os.environ["GITHUB_SHARED_STATE"] = str(default_state_path())
+    logger.info(f"Starting GitHub MCP Server on http://{host}:{port} with {workers} workers ...")
+    uvicorn.run("github_mcp_server.server:create_http_app", factory=True, workers=workers, **options)
+
+
 if __name__ == "__main__":
     # Check environment
     check_environment()
-    
-    # Run the server with stdio transport (default for MCP)
-    logger.info("Starting GitHub MCP Server...")
-    
+
+    transport = os.getenv("GITHUB_TRANSPORT", "stdio").strip().lower()
     try:
-        mcp.run()
+        if transport == "http":
+            run_http()
+        else:
+            # Run the server with stdio transport (default for MCP)
+            logger.info("Starting GitHub MCP Server...")
+            mcp.run()
     except Exception as e:
         logger.error(f"Failed to start server: {e}")
         raise
\ No newline at end of file
@@ -1,13 +1,12 @@
-"""Tools package for GitHub MCP Server."""
+"""Tools package for GitHub MCP Server.
 
-# Import all tools for easy access
-from .search_issues import search_issues
-from .list_repository_contents import list_repository_contents
-from .list_pull_requests import list_pull_requests
-from .get_file_content import get_file_content
-from .get_issue_details import get_issue_details
-from .get_pull_request_details import get_pull_request_details
-from .search_code import search_code
+Each tool function is re-exported lazily: its module is imported on first
+attribute access, so the server can register tools without importing them.
+"""
+
+import importlib
+import sys
+import types
 
 __all__ = [
     "search_issues",
@@ -16,5 +15,31 @@ __all__ = [
     "get_file_content",
     "get_issue_details",
     "get_pull_request_details",
+    "get_pull_request_diff",
     "search_code",
-]
\ No newline at end of file
+    "search_across_repositories",
+    "get_issue_details_batch",
+    "get_pull_request_details_batch",
+    "fetch_more",
+]
+
+
+class _ToolsPackage(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a tool module binds it on the package; every tool lives in
+        # a module of the same name, so bind the tool function instead
+        if name in __all__ and isinstance(value, types.ModuleType):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+    def __getattr__(self, name):
+        if name not in __all__:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        importlib.import_module(f".{name}", __name__)
+        return self.__dict__[name]
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(__all__))
+
+
+sys.modules[__name__].__class__ = _ToolsPackage
@@ -0,0 +1,124 @@
+"""Continue a truncated response tool (function-only; registration done in server)."""
+
+from pydantic import BaseModel, Field
+from typing import Any, Literal, Optional
+from ..utils import json_codec
+from ..utils.budget import count_tokens, fit_prefix, output_limit
+from ..utils.formatters import format_markdown_detailed, json_compact, truncate_response
+from ..utils.pagination import Resume
+from ..utils.result_store import StoredResult, continuation, get_result_store, parse_cursor
+from ..utils.serializer import TAIL_RESERVE, TRUNCATION_KEY, encode_json
+from ..utils.errors import MCPError
+
+
+class FetchMoreInput(BaseModel):
+    """Input model for fetch_more tool."""
+
+    cursor: str = Field(
+        description="The 'next_cursor' value from a truncated response",
+        min_length=1,
+        max_length=200,
+    )
+
+    format: Optional[Literal["json", "markdown"]] = Field(
+        default=None,
+        description="Response format; defaults to the format of the original response",
+    )
+
+
+# Tool annotations (used by server during registration)
+TOOL_ANNOTATIONS = {
+    "readOnlyHint": True,
+    "idempotentHint": True,
+    "openWorldHint": False,
+}
+
+
+async def _items_page(stored: StoredResult, result_id: str, offset: int, format: str) -> str:
+    payload = stored.payload
+    envelope = {} if isinstance(payload, list) else {k: v for k, v in payload.items() if k != "items"}
+    items = (payload if isinstance(payload, list) else payload["items"])[offset:]
+    limit = output_limit()
+
+    def cursor(emitted: int) -> str:
+        return f"{result_id}:{offset + emitted}"
+
+    more = False
+    if stored.resume is not None:
+        # The listing stopped at the output budget: continue it from GitHub
+        # once the stored items no longer fill a page
+        resume: Optional[Resume] = Resume.from_state(stored.resume)
+        used = count_tokens(json_codec.dumps(items, compact=True))
+        if used <= limit:
+            fetched, resume = await resume.collect(limit - used)
+            items = items + fetched
+        more = resume is not None
+        # Later cursors point into the remaining and newly fetched items
+        cursor = continuation(
+            "items",
+            items if isinstance(payload, list) else {**envelope, "items": items},
+            format,
+            stored.table,
+            resume.to_state() if resume is not None else None,
+        )
+
+    page: Any = {**envelope, "offset": offset, "items": items}
+    if format == "json":
+        return encode_json(
+            page, limit, measure=count_tokens, cursor=cursor, compact=json_compact(), more=more
+        ).text
+    formatted = format_markdown_detailed(page, limit, cursor, stored.table, count_tokens, more)
+    return truncate_response(formatted, limit, measure=count_tokens)
+
+
+def _text_page(stored: StoredResult, result_id: str, offset: int, format: str) -> str:
+    text = stored.payload
+    rest = text[offset:]
+    chunk = rest[:fit_prefix(rest, output_limit() - TAIL_RESERVE)]
+    end = offset + len(chunk)
+    next_cursor = f"{result_id}:{end}" if end < len(text) else None
+    if format == "json":
+        page = {"offset": offset, "total_length": len(text), "content": chunk}
+        if next_cursor:
+            page[TRUNCATION_KEY] = {"next_cursor": next_cursor}
+        return json_codec.dumps(page, compact=json_compact())
+    if next_cursor:
+        return f'{chunk}\n\n... [Response truncated due to length]\n\nCall fetch_more(cursor="{next_cursor}") to continue reading.\n'
+    return chunk
+
+
+async def fetch_more(input: FetchMoreInput) -> str:
+    """Continue reading a truncated response without calling GitHub again.
+
+    Truncated responses of other tools carry a '_truncation.next_cursor'; the
+    full result is kept on the server for a few minutes
+    (GITHUB_RESULT_STORE_TTL), and each call returns the next page that fits
+    the output limit together with a new 'next_cursor' while anything is
+    left. Listings that stopped fetching at the output limit are continued
+    from GitHub once the kept items run out.
+
+    Args:
+        cursor: The 'next_cursor' value from a truncated response
+        format: Output format - "json" or "markdown" (default: as originally requested)
+
+    Returns:
+        The next page of the stored result
+
+    Examples:
+        fetch_more(cursor="Jq0x3v2dS1b9kXw4:150")
+    """
+    result_id, offset = parse_cursor(input.cursor)
+    store = get_result_store()
+    stored = await store.aload(result_id) if store is not None else None
+    if stored is None:
+        raise MCPError(
+            message="Cursor expired or unknown",
+            code=404,
+            details={"cursor": input.cursor},
+            suggestion="Repeat the original tool call to get a fresh cursor, or narrow it with filters or 'fields'.",
+        )
+
+    format = input.format or stored.format
+    if stored.kind == "text":
+        return _text_page(stored, result_id, offset, format)
+    return await _items_page(stored, result_id, offset, format)
@@ -1,11 +1,24 @@
 """Get GitHub file content tool (function-only; registration done in server)."""
 
+import logging
 from pydantic import BaseModel, Field
-from typing import Literal, Optional
-import base64
-from ..utils.api_client import make_github_request, parse_repository
-from ..utils.formatters import format_response
+from typing import List, Literal, Optional, Tuple
+from ..utils import json_codec
+from ..utils.api_client import make_github_request, parse_repository, is_commit_sha
+from ..utils.blobs import Blob, blob_max_bytes, bounded, fit_bytes, load_blob, looks_binary, read_blob
+from ..utils.budget import count_tokens, output_limit
+from ..utils.cache import cache_aget, cache_set
+from ..utils.git_mirror import get_mirror
+from ..utils.formatters import format_response, CHARACTER_LIMIT
+from ..utils.serializer import TAIL_RESERVE
+from ..utils.projection import Projection
+from ..utils.tables import Column, TableSchema
 from ..utils.errors import MCPError
+from ..utils.tool_cache import CachePolicy
+from ..utils.token_pool import credential_scope
+
+
+logger = logging.getLogger("github-mcp-server")
 
 
 class GetFileContentInput(BaseModel):
@@ -41,6 +54,39 @@ class GetFileContentInput(BaseModel):
         description="Detail level: 'concise' for summary, 'detailed' for full information"
     )
 
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Return only these fields, as dot paths relative to one result "
+            "(e.g. 'path', 'sha', 'decoded_content'). Overrides 'detail'"
+        ),
+        max_length=50,
+    )
+    
+    start_line: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="First line to return (1-based). Returns a line window instead of the whole file"
+    )
+    
+    end_line: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Last line to return (inclusive). Default: as many lines as fit the response limit"
+    )
+    
+    byte_offset: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Byte offset to start reading at. Returns a byte window instead of the whole file"
+    )
+    
+    byte_length: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Number of bytes to return from byte_offset. Default: as many as fit the response limit"
+    )
+
 
 # Tool annotations (used by server during registration)
 TOOL_ANNOTATIONS = {
@@ -49,6 +95,38 @@ TOOL_ANNOTATIONS = {
     "openWorldHint": False,
 }
 
+# Fields returned in concise mode
+PROJECTION = Projection([
+    "name",
+    "path",
+    "type",
+    "size",
+    "sha",
+    "html_url",
+])
+
+# Markdown columns for lists of results
+TABLE = TableSchema([
+    Column("path"),
+    Column("type"),
+    Column("size"),
+])
+
+
+def _cache_ttl(input: GetFileContentInput) -> int:
+    """Content at a commit SHA never changes; branches and tags can move."""
+    return 86400 if is_commit_sha(input.ref) else 300
+
+
+CACHE_POLICY = CachePolicy(ttl=_cache_ttl)
+
+# Contents metadata (without the body) by repository, ref and path, so that
+# further windows of a file resolve its blob SHA without another request
+METADATA_CACHE_PREFIX = "file-meta:"
+
+# Tokens reserved for the window fields and 'next_window' of a response
+WINDOW_FIELDS_RESERVE = 64
+
 
 async def get_file_content(input: GetFileContentInput) -> str:
     """Get content of a file from a GitHub repository.
@@ -62,6 +140,19 @@ async def get_file_content(input: GetFileContentInput) -> str:
         ref: Git reference (branch, tag, or commit SHA). Defaults to default branch
         format: Output format - "json" for structured data, "markdown" for readable text
         detail: "concise" returns summary information, "detailed" returns full file content
+        fields: Optional dot paths selecting the returned fields (overrides detail)
+        start_line: First line of a line window (1-based)
+        end_line: Last line of a line window (inclusive)
+        byte_offset: Start of a byte window
+        byte_length: Length of a byte window
+    
+    Line and byte windows are returned in both detail levels together with
+    the total line count (or byte size) and a 'next_window' hint for reading
+    on. A window holds as many whole lines (or bytes) as fit the response
+    limit, and 'next_window' starts right after the last one returned.
+    Windows are served from a cache keyed by the file's blob SHA, and the
+    path's SHA is remembered for the tool's cache TTL, so reading a file
+    window by window fetches its content only once.
     
     Returns:
         Formatted file content with metadata
@@ -69,49 +160,65 @@ async def get_file_content(input: GetFileContentInput) -> str:
     Examples:
         get_file_content(repository="facebook/react", path="README.md", format="json")
         get_file_content(repository="microsoft/vscode", path="src/main.js", ref="main", format="markdown")
+        get_file_content(repository="python/cpython", path="Lib/json/decoder.py", start_line=200, end_line=400)
     
     Error Handling:
         - Invalid repository: Use format 'owner/repo'
         - File not found: Check file path
-        - Large files: Files over 100MB may not be supported
+        - Large files: Only the first CHARACTER_LIMIT bytes are returned
+          ('content_truncated' is set); files over 100MB are not supported
         - Access denied: Check token permissions
     """
     try:
         # Parse repository name
         repo_info = parse_repository(input.repository)
+        windowed = _validate_window(input)
         
-        # Prepare API parameters
-        params = {}
-        if input.ref:
-            params["ref"] = input.ref
+        # Mirrored repositories are read locally; the API covers the rest
+        mirrored = await _read_from_mirror(repo_info, input)
+        if mirrored is not None:
+            response_data, blob = mirrored
+        else:
+            blob = None
+            response_data = await cache_aget(_metadata_key(repo_info, input)) if windowed else None
+        if response_data is None:
+            # Prepare API parameters
+            params = {}
+            if input.ref:
+                params["ref"] = input.ref
+            
+            # Make API request
+            response_data = await make_github_request(
+                endpoint=f"/repos/{repo_info['owner']}/{repo_info['repo']}/contents/{input.path}",
+                params=params
+            )
+            if isinstance(response_data, dict) and response_data.get("type") == "file":
+                metadata = {key: value for key, value in response_data.items() if key != "content"}
+                cache_set(_metadata_key(repo_info, input), metadata, _cache_ttl(input))
         
-        # Make API request
-        response_data = await make_github_request(
-            endpoint=f"/repos/{repo_info['owner']}/{repo_info['repo']}/contents/{input.path}",
-            params=params
-        )
+        if windowed and isinstance(response_data, dict) and response_data.get("type") == "file":
+            if blob is None:
+                blob = await load_blob(
+                    repo_info["owner"],
+                    repo_info["repo"],
+                    response_data["sha"],
+                    inline_content=response_data.get("content")
+                )
+            return format_response(_window(response_data, blob, input), format=input.format, detail="detailed", fields=input.fields)
         
-        # Decode base64 content if present
-        if "content" in response_data and response_data["content"]:
-            try:
-                # Remove newlines from base64 content and decode
-                content = response_data["content"].replace("\n", "")
-                decoded_content = base64.b64decode(content).decode("utf-8")
-                response_data["decoded_content"] = decoded_content
-                
-                # Add language hint based on file extension
-                response_data["language"] = detect_language(input.path)
-                
-            except (base64.binascii.Error, UnicodeDecodeError):
-                # Handle binary files or encoding issues
-                response_data["decoded_content"] = "[Binary file content not displayed]"
-                response_data["is_binary"] = True
+        # Directories, symlinks and submodules are returned as-is; concise
+        # output omits file bodies, so nothing needs to be decoded
+        if (input.detail == "detailed" or input.fields) and isinstance(response_data, dict) and response_data.get("type") == "file":
+            await _attach_content(response_data, repo_info, input.path, blob)
         
         # Format response
         formatted_response = format_response(
             response_data,
             format=input.format,
-            detail=input.detail
+            detail=input.detail,
+            projection=PROJECTION,
+            fields=input.fields,
+            table=TABLE,
         )
         
         return formatted_response
@@ -132,6 +239,174 @@ async def get_file_content(input: GetFileContentInput) -> str:
         )
 
 
+def _validate_window(input: GetFileContentInput) -> bool:
+    """Check window parameters; return True if a window was requested."""
+    lines = input.start_line is not None or input.end_line is not None
+    bytes_ = input.byte_offset is not None or input.byte_length is not None
+    if lines and bytes_:
+        raise MCPError(
+            message="Line and byte windows cannot be combined.",
+            code=400,
+            details={"path": input.path},
+            suggestion="Use either start_line/end_line or byte_offset/byte_length."
+        )
+    if input.end_line is not None and input.end_line < (input.start_line or 1):
+        raise MCPError(
+            message=f"end_line ({input.end_line}) is before start_line ({input.start_line}).",
+            code=400,
+            details={"start_line": input.start_line, "end_line": input.end_line},
+            suggestion="Use an end_line greater than or equal to start_line."
+        )
+    return lines or bytes_
+
+
+def _metadata_key(repo_info: dict, input: GetFileContentInput) -> str:
+    return f"{METADATA_CACHE_PREFIX}{credential_scope()}:{repo_info['owner']}/{repo_info['repo']}@{input.ref or ''}:{input.path.strip('/')}"
+
+
+def _content_tokens(text: str) -> int:
+    """Tokens ``text`` takes as a JSON string (escaping included)."""
+    return count_tokens(json_codec.dumps(text))
+
+
+def _window(response_data: dict, blob: Blob, input: GetFileContentInput) -> dict:
+    """Build the response for a line or byte window of a file.
+    
+    The window is sized in tokens: the output limit minus the rest of the
+    response. Line windows hold whole lines only, so 'end_line' and
+    'next_window' never skip text; a single line over the budget is
+    returned in part and continued with a byte window.
+    """
+    result = {
+        "name": response_data.get("name"),
+        "path": response_data.get("path"),
+        "sha": response_data.get("sha"),
+        "size": response_data.get("size"),
+        "html_url": response_data.get("html_url"),
+        "language": detect_language(input.path),
+    }
+    text = None if blob.is_binary else blob.text()
+    if text is None:
+        result["content"] = "[Binary file content not displayed]"
+        result["is_binary"] = True
+        return result
+    
+    budget = output_limit() - TAIL_RESERVE - WINDOW_FIELDS_RESERVE - count_tokens(json_codec.dumps(result))
+    next_window = None
+    if input.byte_offset is not None or input.byte_length is not None:
+        offset = input.byte_offset or 0
+        if offset >= len(blob.data) and not blob.complete:
+            raise _beyond_readable(input, len(blob.data))
+        chunk = blob.byte_range(offset, input.byte_length or len(blob.data))
+        # Windows end on a character boundary (the start is the caller's choice)
+        end = blob.char_boundary(offset + fit_bytes(chunk, budget, _content_tokens), floor=offset)
+        chunk = chunk[:end - offset]
+        length = input.byte_length or len(chunk)
+        result.update({
+            "byte_offset": offset,
+            "byte_length": len(chunk),
+            "total_bytes": response_data.get("size"),
+            # A window starting inside a multi-byte character shows it as U+FFFD
+            "content": chunk.decode("utf-8", errors="replace"),
+        })
+        if end < (response_data.get("size") or 0):
+            next_window = {"byte_offset": end, "byte_length": length}
+    else:
+        start = input.start_line or 1
+        if start > blob.total_lines and not blob.complete:
+            raise _beyond_readable(input, len(blob.data))
+        content, last = blob.lines(start, input.end_line, budget, _content_tokens)
+        result.update({
+            "start_line": start,
+            "end_line": last,
+            # Unknown when the file is too large to be read in full
+            "total_lines": blob.total_lines if blob.complete else None,
+            "content": content,
+        })
+        if last < start:
+            # Line 'start' alone exceeds the budget: continue it byte-wise
+            offset = blob.byte_offset_of(blob.line_starts[start - 1] + len(content))
+            result["line_truncated"] = True
+            next_window = {"byte_offset": offset, "byte_length": len(content.encode("utf-8"))}
+        elif last < blob.total_lines or not blob.complete:
+            span = (input.end_line - start + 1) if input.end_line else max(1, last - start + 1)
+            next_window = {"start_line": last + 1, "end_line": last + span}
+    
+    result["next_window"] = next_window
+    return result
+
+
+def _beyond_readable(input: GetFileContentInput, readable: int) -> MCPError:
+    return MCPError(
+        message=f"Requested window lies beyond the first {readable} bytes read from this large file.",
+        code=413,
+        details={"repository": input.repository, "path": input.path, "readable_bytes": readable},
+        suggestion="Request an earlier window or raise GITHUB_BLOB_MAX_BYTES."
+    )
+
+
+async def _read_from_mirror(repo_info: dict, input: GetFileContentInput) -> Optional[Tuple[dict, Blob]]:
+    """Read the file from a local mirror; None if not mirrored, not found there or unreadable.
+    
+    Files over ``blob_max_bytes`` are read only up to it, as from the API.
+    """
+    mirror = get_mirror(repo_info["owner"], repo_info["repo"])
+    if mirror is None:
+        return None
+    try:
+        found = await mirror.read_file(input.ref, input.path, blob_max_bytes())
+    except Exception as e:
+        logger.warning(f"Mirror read failed for {input.repository}:{input.path}, using the API: {e}")
+        return None
+    if found is None:
+        return None
+    sha, size, data = found
+    path = input.path.strip("/")
+    response_data = {
+        "type": "file",
+        "name": path.rsplit("/", 1)[-1],
+        "path": path,
+        "sha": sha,
+        "size": size,
+        "html_url": f"https://github.com/{repo_info['owner']}/{repo_info['repo']}/blob/{input.ref or 'HEAD'}/{path}",
+    }
+    return response_data, Blob(sha, data, complete=len(data) == size, is_binary=looks_binary(data))
+
+
+async def _attach_content(response_data: dict, repo_info: dict, path: str, blob: Optional[Blob] = None) -> None:
+    """Replace the base64 body with up to CHARACTER_LIMIT bytes of decoded text.
+    
+    Mirrored files are already in memory. Otherwise blobs in the disk store
+    are read from there; inline content is decoded only as far as the
+    budget, and files too large to be embedded by the contents API (over
+    1 MB) are streamed from the blobs API instead, stopping once the budget
+    is reached.
+    """
+    if blob is not None:
+        read = bounded(blob.data, CHARACTER_LIMIT)
+        read.complete = read.complete and blob.complete
+    else:
+        read = await read_blob(
+            repo_info["owner"],
+            repo_info["repo"],
+            response_data["sha"],
+            CHARACTER_LIMIT,
+            inline_content=response_data.pop("content", None)
+        )
+    
+    text = None if read.is_binary else read.text()
+    if text is None:
+        # Handle binary files or encoding issues
+        response_data["decoded_content"] = "[Binary file content not displayed]"
+        response_data["is_binary"] = True
+        return
+    
+    response_data["decoded_content"] = text
+    response_data["content_truncated"] = not read.complete
+    # Add language hint based on file extension
+    response_data["language"] = detect_language(path)
+
+
 def detect_language(file_path: str) -> str:
     """Detect programming language from file extension.
     
@@ -1,10 +1,12 @@
 """Get GitHub issue details tool (function-only; registration done in server)."""
 
 from pydantic import BaseModel, Field
-from typing import Literal
+from typing import List, Literal, Optional
 from ..utils.api_client import make_github_request, parse_repository
 from ..utils.formatters import format_response
+from ..utils.projection import Projection
 from ..utils.errors import MCPError
+from ..utils.tool_cache import CachePolicy
 
 
 class GetIssueDetailsInput(BaseModel):
@@ -33,6 +35,15 @@ class GetIssueDetailsInput(BaseModel):
         description="Detail level: 'concise' for summary, 'detailed' for full information",
     )
 
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Return only these fields, as dot paths relative to one result "
+            "(e.g. 'title', 'user.login', 'labels[].name'). Overrides 'detail'"
+        ),
+        max_length=50,
+    )
+
 
 # Tool annotations (used by server during registration)
 TOOL_ANNOTATIONS = {
@@ -41,6 +52,25 @@ TOOL_ANNOTATIONS = {
     "openWorldHint": False,
 }
 
+# Fields returned in concise mode
+PROJECTION = Projection([
+    "number",
+    "title",
+    "state",
+    "html_url",
+    "user.login",
+    "labels[].name",
+    "assignees[].login",
+    "milestone.title",
+    "comments",
+    "created_at",
+    "updated_at",
+    "closed_at",
+])
+
+# Issue state/comments may change: short-to-medium TTL
+CACHE_POLICY = CachePolicy(ttl=120)
+
 
 async def get_issue_details(input: GetIssueDetailsInput) -> str:
     """Get detailed information for a specific GitHub issue.
@@ -50,6 +80,7 @@ async def get_issue_details(input: GetIssueDetailsInput) -> str:
         issue_number: The issue number to retrieve
         format: Output format - "json" for structured data, "markdown" for readable text
         detail: "concise" returns summary information, "detailed" returns full issue details
+        fields: Optional dot paths selecting the returned fields (overrides detail)
 
     Returns:
         Formatted issue details
@@ -73,6 +104,8 @@ async def get_issue_details(input: GetIssueDetailsInput) -> str:
             response_data,
             format=input.format,
             detail=input.detail,
+            projection=PROJECTION,
+            fields=input.fields,
         )
 
         return formatted_response
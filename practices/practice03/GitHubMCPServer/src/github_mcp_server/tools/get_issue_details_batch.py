@@ -0,0 +1,146 @@
+"""Batch issue details tool (function-only; registration done in server)."""
+
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from ..utils.batch_details import fetch_details
+from ..utils.formatters import format_response
+from ..utils.projection import Projection
+from ..utils.tables import Column, TableSchema
+from ..utils.errors import MCPError
+from ..utils.tool_cache import CachePolicy
+
+
+class GetIssueDetailsBatchInput(BaseModel):
+    """Input model for get_issue_details_batch tool."""
+
+    items: List[str] = Field(
+        description="Issues as 'owner/repo#number' (may span repositories), or plain numbers when 'repository' is set",
+        min_length=1,
+        max_length=100,
+        examples=[["facebook/react#123", "vercel/next.js#456"], ["12", "34"]],
+    )
+
+    repository: Optional[str] = Field(
+        default=None,
+        description="Default repository ('owner/repo') for items given as plain numbers",
+        min_length=3,
+        max_length=100,
+        examples=["facebook/react"],
+    )
+
+    format: Literal["json", "markdown"] = Field(
+        default="json",
+        description="Response format: 'json' for structured data, 'markdown' for readable text",
+    )
+
+    detail: Literal["concise", "detailed"] = Field(
+        default="concise",
+        description="Detail level: 'concise' for summary, 'detailed' for full information",
+    )
+
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Return only these fields, as dot paths relative to one result "
+            "(e.g. 'number', 'author', 'labels'). Overrides 'detail'"
+        ),
+        max_length=50,
+    )
+
+
+# Tool annotations (used by server during registration)
+TOOL_ANNOTATIONS = {
+    "readOnlyHint": True,
+    "idempotentHint": True,
+    "openWorldHint": False,
+}
+
+# Fields returned in concise mode
+PROJECTION = Projection([
+    "repository",
+    "number",
+    "title",
+    "state",
+    "html_url",
+    "author",
+    "labels",
+    "comments",
+    "updated_at",
+    "reference",
+    "error",
+])
+
+# Markdown columns for lists of results
+TABLE = TableSchema([
+    Column("repository"),
+    Column("number", "#"),
+    Column("title"),
+    Column("state"),
+    Column("author"),
+    Column("labels"),
+    Column("updated_at", "updated"),
+    Column("error.message", "error"),
+])
+
+# Same freshness as get_issue_details
+CACHE_POLICY = CachePolicy(ttl=120)
+
+
+async def get_issue_details_batch(input: GetIssueDetailsBatchInput) -> str:
+    """Get details for many issues in one call.
+
+    Items are fetched with chunked GraphQL queries (REST when no token is
+    configured) and returned in input order. An item that cannot be fetched
+    gets an 'error' entry; the rest of the batch is still returned.
+
+    Args:
+        items: Issues as 'owner/repo#number', or numbers when 'repository' is set
+        repository: Default repository for plain numbers
+        format: Output format - "json" for structured data, "markdown" for readable text
+        detail: "concise" returns summary information, "detailed" adds bodies and assignees
+        fields: Optional dot paths selecting the returned fields (overrides detail)
+
+    Returns:
+        Formatted list of issue details
+
+    Examples:
+        get_issue_details_batch(items=["facebook/react#123", "vercel/next.js#456"])
+        get_issue_details_batch(repository="facebook/react", items=["1", "2", "3"], detail="detailed")
+    """
+    try:
+        results = await fetch_details(
+            "issue",
+            input.items,
+            repository=input.repository,
+            detailed=input.detail == "detailed" or bool(input.fields),
+        )
+
+        response_data = {
+            "total_count": len(results),
+            "failed": sum(1 for entry in results if "error" in entry),
+            "items": results,
+        }
+
+        # Items are already reduced to the requested detail level
+        formatted_response = format_response(
+            response_data,
+            format=input.format,
+            detail=input.detail,
+            projection=PROJECTION,
+            fields=input.fields,
+            table=TABLE,
+        )
+
+        return formatted_response
+
+    except MCPError:
+        # Re-raise MCP errors
+        raise
+    except Exception as e:
+        # Convert other exceptions to MCP errors
+        raise MCPError(
+            message=f"Unexpected error getting issue details: {str(e)}",
+            code=500,
+            details={"items": input.items[:10], "repository": input.repository},
+            suggestion="Please try again or contact support if the issue persists.",
+        )
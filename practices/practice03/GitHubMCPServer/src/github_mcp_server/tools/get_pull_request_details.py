@@ -1,10 +1,12 @@
 """Get GitHub pull request details tool (function-only; registration done in server)."""
 
 from pydantic import BaseModel, Field
-from typing import Literal
+from typing import List, Literal, Optional
 from ..utils.api_client import make_github_request, parse_repository
 from ..utils.formatters import format_response
+from ..utils.projection import Projection
 from ..utils.errors import MCPError
+from ..utils.tool_cache import CachePolicy
 
 
 class GetPullRequestDetailsInput(BaseModel):
@@ -33,6 +35,15 @@ class GetPullRequestDetailsInput(BaseModel):
         description="Detail level: 'concise' for summary, 'detailed' for full information",
     )
 
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Return only these fields, as dot paths relative to one result "
+            "(e.g. 'title', 'head.ref', 'requested_reviewers[].login'). Overrides 'detail'"
+        ),
+        max_length=50,
+    )
+
 
 # Tool annotations (used by server during registration)
 TOOL_ANNOTATIONS = {
@@ -41,6 +52,34 @@ TOOL_ANNOTATIONS = {
     "openWorldHint": False,
 }
 
+# Fields returned in concise mode
+PROJECTION = Projection([
+    "number",
+    "title",
+    "state",
+    "draft",
+    "merged",
+    "mergeable_state",
+    "html_url",
+    "user.login",
+    "head.ref",
+    "head.sha",
+    "base.ref",
+    "labels[].name",
+    "commits",
+    "additions",
+    "deletions",
+    "changed_files",
+    "comments",
+    "review_comments",
+    "created_at",
+    "updated_at",
+    "merged_at",
+])
+
+# PR state/reviews may change: short-to-medium TTL
+CACHE_POLICY = CachePolicy(ttl=120)
+
 
 async def get_pull_request_details(input: GetPullRequestDetailsInput) -> str:
     """Get detailed information for a specific GitHub pull request.
@@ -50,6 +89,7 @@ async def get_pull_request_details(input: GetPullRequestDetailsInput) -> str:
         pull_number: The pull request number to retrieve
         format: Output format - "json" for structured data, "markdown" for readable text
         detail: "concise" returns summary information, "detailed" returns full PR details
+        fields: Optional dot paths selecting the returned fields (overrides detail)
 
     Returns:
         Formatted pull request details
@@ -73,6 +113,8 @@ async def get_pull_request_details(input: GetPullRequestDetailsInput) -> str:
             response_data,
             format=input.format,
             detail=input.detail,
+            projection=PROJECTION,
+            fields=input.fields,
         )
 
         return formatted_response
@@ -0,0 +1,225 @@
+"""Pull request diff tool (function-only; registration done in server)."""
+
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from ..utils.api_client import make_github_request, parse_repository
+from ..utils.budget import count_tokens, output_limit
+from ..utils.diffs import get_diff_index
+from ..utils.formatters import format_response, truncate_response
+from ..utils.projection import Projection
+from ..utils.result_store import continuation
+from ..utils.serializer import TAIL_RESERVE
+from ..utils.tables import Column, TableSchema
+from ..utils.errors import MCPError
+from ..utils.tool_cache import CachePolicy
+
+
+class GetPullRequestDiffInput(BaseModel):
+    """Input model for get_pull_request_diff tool."""
+
+    repository: str = Field(
+        description="Repository name in format 'owner/repo'. Example: 'facebook/react'",
+        min_length=3,
+        max_length=100,
+        examples=["facebook/react", "microsoft/vscode"],
+    )
+
+    pull_number: int = Field(
+        description="Pull request number (e.g., 123)",
+        ge=1,
+        examples=[1, 42, 1234],
+    )
+
+    file: Optional[str] = Field(
+        default=None,
+        description="Path of a changed file: return its hunks instead of the file index",
+        max_length=1000,
+        examples=["src/index.js"],
+    )
+
+    hunk: int = Field(
+        default=1,
+        ge=1,
+        description="First hunk to return (1-based, with 'file')",
+    )
+
+    max_hunks: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=1000,
+        description="Maximum number of hunks to return (with 'file'); never more than fit the output limit",
+    )
+
+    source: Literal["files", "diff"] = Field(
+        default="files",
+        description=(
+            "Where the changes come from: 'files' (files API, up to 3000 files) or 'diff' "
+            "(streamed unified diff; includes patches the files API omits for large files)"
+        ),
+    )
+
+    format: Literal["json", "markdown"] = Field(
+        default="json",
+        description="Response format: 'json' for structured data, 'markdown' for readable text",
+    )
+
+    detail: Literal["concise", "detailed"] = Field(
+        default="concise",
+        description="Detail level of the file index: 'concise' for counts, 'detailed' adds hunk ranges",
+    )
+
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Return only these fields, as dot paths relative to one result "
+            "(e.g. 'path', 'status', 'hunks[].new'). Overrides 'detail'"
+        ),
+        max_length=50,
+    )
+
+
+# Tool annotations (used by server during registration)
+TOOL_ANNOTATIONS = {
+    "readOnlyHint": True,
+    "idempotentHint": True,
+    "openWorldHint": False,
+}
+
+# Fields of the file index returned in concise mode
+PROJECTION = Projection([
+    "path",
+    "previous_path",
+    "status",
+    "additions",
+    "deletions",
+    "hunk_count",
+    "binary",
+    "patch_missing",
+])
+
+# Markdown columns of the file index
+TABLE = TableSchema([
+    Column("path"),
+    Column("status"),
+    Column("additions", "+"),
+    Column("deletions", "-"),
+    Column("hunk_count", "hunks"),
+])
+
+# Same freshness as get_pull_request_details; parsed diffs are cached by SHA
+CACHE_POLICY = CachePolicy(ttl=120)
+
+# Tokens kept for the fields added to a hunk window after it is sized
+WINDOW_FIELDS_RESERVE = 64
+
+
+def _hunks_markdown(window: dict) -> str:
+    lines = [f"## {window['path']}"]
+    if window.get("previous_path"):
+        lines.append(f"Renamed from `{window['previous_path']}`")
+    lines.append(
+        f"**{window['status']}**, +{window['additions']} -{window['deletions']}, "
+        f"{window['hunk_count']} hunks"
+    )
+    if window["items"]:
+        patch = "".join(item["patch"] for item in window["items"])
+        lines.append(f"```diff\n{patch.rstrip()}\n```")
+    if window.get("next_hunk"):
+        lines.append(f"More hunks follow: call again with hunk={window['next_hunk']}.")
+    return "\n\n".join(lines)
+
+
+async def get_pull_request_diff(input: GetPullRequestDiffInput) -> str:
+    """Get the changes of a pull request as a file index or windows of hunks.
+
+    Without 'file' this returns the index of changed files (status, added and
+    deleted lines, number of hunks; 'detailed' adds each hunk's line ranges).
+    With 'file' it returns that file's hunks, starting at 'hunk', with their
+    patch text: as many whole hunks as fit the output limit, and
+    'next_hunk' when more follow. Large pull requests are read page by page, or streamed as a
+    unified diff with source="diff", and the parsed diff is cached per head
+    commit, so reading further windows does not fetch the diff again.
+
+    Args:
+        repository: Repository name in format 'owner/repo' (e.g., 'facebook/react')
+        pull_number: The pull request number
+        file: Path of a changed file to return hunks for
+        hunk: First hunk to return (1-based)
+        max_hunks: Maximum number of hunks to return
+        source: "files" (files API) or "diff" (streamed unified diff)
+        format: Output format - "json" for structured data, "markdown" for readable text
+        detail: "concise" or "detailed" file index
+        fields: Optional dot paths selecting the returned fields (overrides detail)
+
+    Returns:
+        File index, or the requested hunks of one file
+
+    Examples:
+        get_pull_request_diff(repository="facebook/react", pull_number=123)
+        get_pull_request_diff(repository="facebook/react", pull_number=123, file="src/index.js", hunk=3, max_hunks=5)
+    """
+    try:
+        repo_info = parse_repository(input.repository)
+        owner, repo = repo_info["owner"], repo_info["repo"]
+
+        # The head and base commits key the cached diff
+        pull = await make_github_request(endpoint=f"/repos/{owner}/{repo}/pulls/{input.pull_number}", params={})
+        head_sha = pull.get("head", {}).get("sha", "")
+        base_sha = pull.get("base", {}).get("sha", "")
+        index = await get_diff_index(owner, repo, input.pull_number, head_sha, base_sha, input.source)
+
+        if input.file is None:
+            response_data = {"pull_number": input.pull_number, "head_sha": head_sha, **index.summary()}
+            return format_response(
+                response_data,
+                format=input.format,
+                detail=input.detail,
+                projection=PROJECTION,
+                fields=input.fields,
+                table=TABLE,
+            )
+
+        diff_file = index.find(input.file)
+        if diff_file is None:
+            raise MCPError(
+                message=f"File not changed in pull request #{input.pull_number}: {input.file}",
+                code=404,
+                details={"repository": input.repository, "pull_number": input.pull_number, "file": input.file},
+                suggestion="Call get_pull_request_diff without 'file' to list the changed files.",
+            )
+        if input.hunk > max(1, len(diff_file.hunks)):
+            raise MCPError(
+                message=f"Hunk {input.hunk} out of range: {input.file} has {len(diff_file.hunks)} hunks",
+                code=400,
+                details={"file": diff_file.path, "hunk_count": len(diff_file.hunks)},
+                suggestion="Pass a hunk number from the file index.",
+            )
+
+        # Whole hunks up to the token budget, so next_hunk always continues
+        # where this window stops
+        window = index.window(
+            diff_file,
+            input.hunk,
+            input.max_hunks,
+            limit=output_limit() - TAIL_RESERVE - WINDOW_FIELDS_RESERVE,
+            measure=count_tokens,
+        )
+        window["head_sha"] = head_sha
+        if input.format == "markdown" and not input.fields:
+            text = _hunks_markdown(window)
+            return truncate_response(
+                text, output_limit(), cursor=continuation("text", text, "markdown"), measure=count_tokens
+            )
+        return format_response(window, format=input.format, detail="detailed", fields=input.fields)
+
+    except MCPError:
+        # Re-raise MCP errors
+        raise
+    except Exception as e:
+        # Convert other exceptions to MCP errors
+        raise MCPError(
+            message=f"Unexpected error getting pull request diff: {str(e)}",
+            code=500,
+            details={"repository": input.repository, "pull_number": input.pull_number},
+            suggestion="Please try again or contact support if the issue persists.",
+        )
@@ -1,10 +1,15 @@
 """List GitHub pull requests tool (function-only; registration done in server)."""
 
 from pydantic import BaseModel, Field
-from typing import Literal
-from ..utils.api_client import make_github_request, parse_repository
-from ..utils.formatters import format_response
+from typing import List, Literal, Optional
+from ..utils.api_client import parse_repository
+from ..utils.budget import output_limit
+from ..utils.formatters import format_response, response_projection
+from ..utils.projection import Projection
+from ..utils.tables import Column, TableSchema
+from ..utils.pagination import collect_pages
 from ..utils.errors import MCPError
+from ..utils.tool_cache import CachePolicy
 
 
 class ListPullRequestsInput(BaseModel):
@@ -31,12 +36,21 @@ class ListPullRequestsInput(BaseModel):
         default="concise",
         description="Detail level: 'concise' for summary, 'detailed' for full information"
     )
+
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Return only these fields, as dot paths relative to one result "
+            "(e.g. 'number', 'user.login', 'head.ref'). Overrides 'detail'"
+        ),
+        max_length=50,
+    )
     
     limit: int = Field(
         default=10,
         ge=1,
-        le=100,
-        description="Maximum number of results to return (1-100)"
+        le=5000,
+        description="Maximum number of results to return (1-5000). More than 100 results are fetched across pages automatically"
     )
     
     sort: Literal["created", "updated", "popularity"] = Field(
@@ -57,6 +71,38 @@ TOOL_ANNOTATIONS = {
     "openWorldHint": False,
 }
 
+# Fields returned in concise mode
+PROJECTION = Projection([
+    "number",
+    "title",
+    "state",
+    "draft",
+    "html_url",
+    "user.login",
+    "head.ref",
+    "base.ref",
+    "labels[].name",
+    "created_at",
+    "updated_at",
+    "merged_at",
+])
+
+# Markdown columns for lists of results
+TABLE = TableSchema([
+    Column("number", "#"),
+    Column("title"),
+    Column("state"),
+    Column("draft"),
+    Column("user.login", "author"),
+    Column("head.ref", "head"),
+    Column("base.ref", "base"),
+    Column("updated_at", "updated"),
+    Column("html_url", "url"),
+])
+
+# PR lists change moderately often: medium TTL
+CACHE_POLICY = CachePolicy(ttl=300)
+
 
 async def list_pull_requests(input: ListPullRequestsInput) -> str:
     """List pull requests for a specific GitHub repository.
@@ -69,7 +115,8 @@ async def list_pull_requests(input: ListPullRequestsInput) -> str:
         state: Filter by pull request state - 'open', 'closed', or 'all'
         format: Output format - "json" for structured data, "markdown" for readable text
         detail: "concise" returns summary information, "detailed" returns full PR details
-        limit: Maximum number of results to return (1-100)
+        fields: Optional dot paths selecting the returned fields (overrides detail)
+        limit: Maximum number of results to return (1-5000, auto-paginated)
         sort: Sort order - "created", "updated", or "popularity"
         direction: Sort direction - "asc" for ascending, "desc" for descending
     
@@ -93,22 +140,29 @@ async def list_pull_requests(input: ListPullRequestsInput) -> str:
         # Prepare API parameters
         params = {
             "state": input.state,
-            "per_page": input.limit,
             "sort": input.sort,
             "direction": input.direction
         }
         
-        # Make API request
-        response_data = await make_github_request(
+        # Fetch pages up to the limit, or until they fill the output budget;
+        # the rest is returned through next_cursor / fetch_more
+        response_data, _, resume = await collect_pages(
             endpoint=f"/repos/{repo_info['owner']}/{repo_info['repo']}/pulls",
-            params=params
+            params=params,
+            limit=input.limit,
+            budget=output_limit(),
+            projection=response_projection(input.detail, PROJECTION, input.fields),
         )
         
         # Format response
         formatted_response = format_response(
             response_data,
             format=input.format,
-            detail=input.detail
+            detail=input.detail,
+            projection=PROJECTION,
+            fields=input.fields,
+            table=TABLE,
+            resume=resume,
         )
         
         return formatted_response
@@ -1,10 +1,19 @@
 """List GitHub repository contents tool (function-only; registration done in server)."""
 
+import logging
 from pydantic import BaseModel, Field
-from typing import Literal, Optional
-from ..utils.api_client import make_github_request, parse_repository
+from typing import List, Literal, Optional
+from ..utils.api_client import make_github_request, parse_repository, is_commit_sha
 from ..utils.formatters import format_response
+from ..utils.projection import Projection
+from ..utils.tables import Column, TableSchema
 from ..utils.errors import MCPError
+from ..utils.tool_cache import CachePolicy
+from ..utils.trees import fetch_tree_index
+from ..utils.git_mirror import get_mirror
+
+
+logger = logging.getLogger("github-mcp-server")
 
 
 class ListRepositoryContentsInput(BaseModel):
@@ -39,10 +48,40 @@ class ListRepositoryContentsInput(BaseModel):
         default="concise",
         description="Detail level: 'concise' for summary, 'detailed' for full information"
     )
+
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Return only these fields, as dot paths relative to one result "
+            "(e.g. 'path', 'type', 'size'). Overrides 'detail'"
+        ),
+        max_length=50,
+    )
     
     recursive: bool = Field(
         default=False,
-        description="Whether to list contents recursively (GitHub API limitation: max 1000 files)"
+        description="List every entry below 'path' using the Git Trees API (one request for the whole tree)"
+    )
+    
+    pattern: Optional[str] = Field(
+        default=None,
+        description="Glob filter for recursive listings. Matched against the file name, or the full path if it contains '/'",
+        max_length=200,
+        examples=["*.py", "src/**/test_*.ts", "Dockerfile"]
+    )
+    
+    max_depth: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=50,
+        description="Maximum depth below 'path' for recursive listings (1 = direct children)"
+    )
+    
+    limit: int = Field(
+        default=1000,
+        ge=1,
+        le=100000,
+        description="Maximum number of entries to return for recursive listings"
     )
 
 
@@ -53,6 +92,31 @@ TOOL_ANNOTATIONS = {
     "openWorldHint": False,
 }
 
+# Fields returned in concise mode
+PROJECTION = Projection([
+    "name",
+    "path",
+    "type",
+    "size",
+    "sha",
+    "html_url",
+])
+
+# Markdown columns for lists of results
+TABLE = TableSchema([
+    Column("path"),
+    Column("type"),
+    Column("size"),
+])
+
+
+def _cache_ttl(input: ListRepositoryContentsInput) -> int:
+    """Listings at a commit SHA never change; branches and tags can move."""
+    return 86400 if is_commit_sha(input.ref) else 300
+
+
+CACHE_POLICY = CachePolicy(ttl=_cache_ttl)
+
 
 async def list_repository_contents(input: ListRepositoryContentsInput) -> str:
     """List contents of a GitHub repository directory.
@@ -66,7 +130,11 @@ async def list_repository_contents(input: ListRepositoryContentsInput) -> str:
         ref: Git reference (branch, tag, or commit SHA). Defaults to default branch
         format: Output format - "json" for structured data, "markdown" for readable text
         detail: "concise" returns summary information, "detailed" returns full details
-        recursive: Whether to list contents recursively (limited to 1000 files)
+        fields: Optional dot paths selecting the returned fields (overrides detail)
+        recursive: List every entry below 'path' via the Git Trees API
+        pattern: Glob filter for recursive listings (e.g. '*.py')
+        max_depth: Maximum depth below 'path' for recursive listings
+        limit: Maximum number of entries for recursive listings
     
     Returns:
         Formatted list of repository contents
@@ -74,6 +142,7 @@ async def list_repository_contents(input: ListRepositoryContentsInput) -> str:
     Examples:
         list_repository_contents(repository="facebook/react", path="src", format="json")
         list_repository_contents(repository="microsoft/vscode", recursive=True, format="markdown")
+        list_repository_contents(repository="python/cpython", path="Lib", recursive=True, pattern="test_*.py", max_depth=2)
     
     Error Handling:
         - Invalid repository: Use format 'owner/repo'
@@ -85,12 +154,19 @@ async def list_repository_contents(input: ListRepositoryContentsInput) -> str:
         # Parse repository name
         repo_info = parse_repository(input.repository)
         
+        if input.recursive:
+            response_data = await _list_recursive(repo_info, input)
+            return format_response(response_data, format=input.format, detail=input.detail, projection=PROJECTION, fields=input.fields, table=TABLE)
+        
+        # Mirrored repositories are listed locally
+        listing = await _list_from_mirror(repo_info, input)
+        if listing is not None:
+            return format_response(listing, format=input.format, detail=input.detail, projection=PROJECTION, fields=input.fields, table=TABLE)
+        
         # Prepare API parameters
         params = {}
         if input.ref:
             params["ref"] = input.ref
-        if input.recursive:
-            params["recursive"] = "true"
         
         # Build endpoint URL
         endpoint = f"/repos/{repo_info['owner']}/{repo_info['repo']}/contents"
@@ -107,7 +183,10 @@ async def list_repository_contents(input: ListRepositoryContentsInput) -> str:
         formatted_response = format_response(
             response_data,
             format=input.format,
-            detail=input.detail
+            detail=input.detail,
+            projection=PROJECTION,
+            fields=input.fields,
+            table=TABLE,
         )
         
         return formatted_response
@@ -125,4 +204,54 @@ async def list_repository_contents(input: ListRepositoryContentsInput) -> str:
                 "path": input.path
             },
             suggestion="Please try again or contact support if the issue persists."
-        )
\ No newline at end of file
+        )
+
+
+async def _list_from_mirror(repo_info: dict, input: ListRepositoryContentsInput) -> Optional[list]:
+    """List the directory from a local mirror; None if not mirrored, not found there or unreadable."""
+    mirror = get_mirror(repo_info["owner"], repo_info["repo"])
+    if mirror is None:
+        return None
+    try:
+        return await mirror.list_directory(input.ref, input.path or "")
+    except Exception as e:
+        logger.warning(f"Mirror read failed for {input.repository}:{input.path or '/'}, using the API: {e}")
+        return None
+
+
+async def _list_recursive(repo_info: dict, input: ListRepositoryContentsInput) -> dict:
+    """Build a recursive listing from the repository's tree index.
+    
+    Concise output lists paths (directories end with '/'); detailed output
+    lists path, type, size and blob SHA for every entry.
+    """
+    prefix = (input.path or "").strip("/")
+    index = None
+    mirror = get_mirror(repo_info["owner"], repo_info["repo"])
+    if mirror is not None:
+        try:
+            index = await mirror.tree_index(input.ref, prefix=prefix, max_depth=input.max_depth)
+        except Exception as e:
+            logger.warning(f"Mirror read failed for {input.repository}, using the API: {e}")
+    if index is None:
+        index = await fetch_tree_index(
+            repo_info["owner"],
+            repo_info["repo"],
+            ref=input.ref,
+            prefix=prefix,
+            max_depth=input.max_depth
+        )
+    
+    matches = list(index.select(prefix, pattern=input.pattern, max_depth=input.max_depth))
+    selected = matches[:input.limit]
+    if input.detail == "concise" and not input.fields:
+        items = [index.paths[i] + ("/" if index.types[i] == "d" else "") for i in selected]
+    else:
+        items = [index.entry(i) for i in selected]
+    
+    return {
+        "total_count": len(matches),
+        "tree_sha": index.tree_sha,
+        "limit_reached": len(matches) > len(selected),
+        "items": items
+    }
\ No newline at end of file
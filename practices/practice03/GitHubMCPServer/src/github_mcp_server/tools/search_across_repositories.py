@@ -0,0 +1,226 @@
+"""Multi-repository search tool (function-only; registration done in server)."""
+
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+from ..utils.api_client import parse_repository
+from ..utils.fanout import fan_out_search, pack_qualifiers
+from ..utils.formatters import format_response
+from ..utils.projection import Projection
+from ..utils.tables import Column, TableSchema
+from ..utils.errors import MCPError
+from ..utils.tool_cache import CachePolicy
+
+
+class SearchAcrossRepositoriesInput(BaseModel):
+    """Input model for search_across_repositories tool."""
+
+    query: str = Field(
+        description="Search terms, without 'repo:' or 'org:' qualifiers. Examples: 'memory leak', 'label:bug state:open'",
+        min_length=1,
+        max_length=200,
+        examples=["memory leak label:bug", "def authenticate"],
+    )
+
+    repositories: Optional[List[str]] = Field(
+        default=None,
+        description="Repositories to search, as 'owner/repo'",
+        max_length=200,
+        examples=[["facebook/react", "facebook/jest"]],
+    )
+
+    organization: Optional[str] = Field(
+        default=None,
+        description="Search every repository of this organization or user instead of a repository list",
+        min_length=1,
+        max_length=100,
+        examples=["facebook"],
+    )
+
+    type: Literal["issues", "code"] = Field(
+        default="issues",
+        description="What to search: 'issues' (issues and pull requests) or 'code'",
+    )
+
+    format: Literal["json", "markdown"] = Field(
+        default="json",
+        description="Response format: 'json' for structured data, 'markdown' for readable text",
+    )
+
+    detail: Literal["concise", "detailed"] = Field(
+        default="concise",
+        description="Detail level: 'concise' for summary, 'detailed' for full information",
+    )
+
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Return only these fields, as dot paths relative to one result "
+            "(issues: e.g. 'repository', 'title'; code: e.g. 'path', 'repository.full_name'). Overrides 'detail'"
+        ),
+        max_length=50,
+    )
+
+    limit: int = Field(
+        default=30,
+        ge=1,
+        le=1000,
+        description="Maximum number of merged results to return (1-1000)",
+    )
+
+    sort: Literal["best-match", "created", "updated", "comments"] = Field(
+        default="best-match",
+        description="Ranking of the merged results: 'best-match', 'created', 'updated' or 'comments' (issues only)",
+    )
+
+    order: Literal["asc", "desc"] = Field(
+        default="desc",
+        description="Sort direction: 'asc' for ascending, 'desc' for descending",
+    )
+
+
+# Tool annotations (used by server during registration)
+TOOL_ANNOTATIONS = {
+    "readOnlyHint": True,
+    "idempotentHint": True,
+    "openWorldHint": True,
+}
+
+# Fields returned in concise mode, per search type
+PROJECTIONS = {
+    "issues": Projection([
+        "repository",
+        "number",
+        "title",
+        "state",
+        "html_url",
+        "user.login",
+        "labels[].name",
+        "comments",
+        "created_at",
+        "updated_at",
+    ]),
+    "code": Projection([
+        "name",
+        "path",
+        "sha",
+        "html_url",
+        "repository.full_name",
+    ]),
+}
+
+# Markdown columns for lists of results, per search type
+TABLES = {
+    "issues": TableSchema([
+        Column("repository"),
+        Column("number", "#"),
+        Column("title"),
+        Column("state"),
+        Column("user.login", "author"),
+        Column("comments"),
+        Column("updated_at", "updated"),
+        Column("html_url", "url"),
+    ]),
+    "code": TableSchema([
+        Column("repository.full_name", "repository"),
+        Column("path"),
+        Column("html_url", "url"),
+    ]),
+}
+
+# Search results change quickly: short TTL
+CACHE_POLICY = CachePolicy(ttl=60)
+
+
+def _with_repository(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Add 'owner/repo' to an issue result (GitHub only gives repository_url)."""
+    url = item.get("repository_url")
+    if not isinstance(url, str) or "/repos/" not in url:
+        return item
+    return {"repository": url.split("/repos/", 1)[1], **item}
+
+
+async def search_across_repositories(input: SearchAcrossRepositoriesInput) -> str:
+    """Search issues or code in many repositories with one call.
+
+    The 'repo:' qualifiers of the given repositories are packed into as few
+    searches as GitHub's query length limit allows (an organization needs a
+    single 'org:' search). The searches run concurrently within the search
+    rate limit, and their results are merged into one list: duplicates are
+    removed and results are ranked by 'sort'. Searches that fail are listed
+    under 'errors'; the others are still returned.
+
+    Args:
+        query: Search terms and qualifiers other than repo:/org:
+        repositories: Repositories to search ('owner/repo')
+        organization: Organization or user whose repositories are searched
+        type: "issues" or "code"
+        format: Output format - "json" for structured data, "markdown" for readable text
+        detail: "concise" returns summary information, "detailed" returns full details
+        fields: Optional dot paths selecting the returned fields (overrides detail)
+        limit: Maximum number of merged results
+        sort: "best-match", "created", "updated" or "comments" (code: best-match only)
+        order: "asc" or "desc"
+
+    Returns:
+        Merged search results with the number of searches run
+
+    Examples:
+        search_across_repositories(query="memory leak", repositories=["facebook/react", "facebook/jest"])
+        search_across_repositories(query="def login", organization="pallets", type="code", format="markdown")
+    """
+    try:
+        if bool(input.repositories) == bool(input.organization):
+            raise MCPError(
+                message="Provide either 'repositories' or 'organization'",
+                code=400,
+                details={"repositories": input.repositories, "organization": input.organization},
+                suggestion="Pass a list of 'owner/repo' names, or an organization name.",
+            )
+
+        if input.organization:
+            queries = [f"{input.query.strip()} org:{input.organization.strip()}"]
+        else:
+            qualifiers = []
+            for repository in input.repositories:
+                repo_info = parse_repository(repository.strip())
+                qualifiers.append(f"repo:{repo_info['owner']}/{repo_info['repo']}")
+            queries = pack_qualifiers(input.query, qualifiers)
+
+        # Code search can only be ranked by best match
+        sort = input.sort if input.type == "issues" else "best-match"
+        params = {} if sort == "best-match" else {"sort": sort, "order": input.order}
+
+        response_data = await fan_out_search(
+            endpoint=f"/search/{input.type}",
+            queries=queries,
+            params=params,
+            limit=input.limit,
+            sort=sort,
+            order=input.order,
+        )
+        if input.type == "issues":
+            response_data["items"] = [_with_repository(item) for item in response_data["items"]]
+
+        # Format response
+        formatted_response = format_response(
+            response_data,
+            format=input.format,
+            detail=input.detail,
+            projection=PROJECTIONS[input.type],
+            fields=input.fields,
+            table=TABLES[input.type],
+        )
+
+        return formatted_response
+
+    except MCPError:
+        # Re-raise MCP errors
+        raise
+    except Exception as e:
+        # Convert other exceptions to MCP errors
+        raise MCPError(
+            message=f"Unexpected error searching repositories: {str(e)}",
+            code=500,
+            details={"query": input.query, "organization": input.organization},
+            suggestion="Please try again or contact support if the issue persists.",
+        )
@@ -1,10 +1,15 @@
 """Search GitHub code tool (function-only; registration done in server)."""
 
 from pydantic import BaseModel, Field
-from typing import Literal, Optional
-from ..utils.api_client import make_github_request, parse_repository
-from ..utils.formatters import format_response
+from typing import List, Literal, Optional
+from ..utils.api_client import parse_repository
+from ..utils.budget import output_limit
+from ..utils.formatters import format_response, response_projection
+from ..utils.projection import Projection
+from ..utils.tables import Column, TableSchema
+from ..utils.pagination import collect_search_results
 from ..utils.errors import MCPError
+from ..utils.tool_cache import CachePolicy
 
 
 class SearchCodeInput(BaseModel):
@@ -33,11 +38,20 @@ class SearchCodeInput(BaseModel):
         description="Detail level: 'concise' for summary, 'detailed' for full information",
     )
 
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Return only these fields, as dot paths relative to one result "
+            "(e.g. 'path', 'repository.full_name', 'html_url'). Overrides 'detail'"
+        ),
+        max_length=50,
+    )
+
     limit: int = Field(
         default=10,
         ge=1,
-        le=100,
-        description="Maximum number of results to return (1-100)",
+        le=1000,
+        description="Maximum number of results to return (1-1000). More than 100 results are fetched across pages automatically",
     )
 
 
@@ -48,6 +62,25 @@ TOOL_ANNOTATIONS = {
     "openWorldHint": True,
 }
 
+# Fields returned in concise mode
+PROJECTION = Projection([
+    "name",
+    "path",
+    "sha",
+    "html_url",
+    "repository.full_name",
+])
+
+# Markdown columns for lists of results
+TABLE = TableSchema([
+    Column("path"),
+    Column("repository.full_name", "repository"),
+    Column("html_url", "url"),
+])
+
+# Search results change quickly: short TTL
+CACHE_POLICY = CachePolicy(ttl=60)
+
 
 async def search_code(input: SearchCodeInput) -> str:
     """Search code on GitHub, optionally scoped to a repository.
@@ -57,7 +90,8 @@ async def search_code(input: SearchCodeInput) -> str:
         repository: Optional repository in format 'owner/repo' to limit the search
         format: Output format - "json" for structured data, "markdown" for readable text
         detail: "concise" returns summary information, "detailed" returns full details
-        limit: Maximum number of results to return (1-100)
+        fields: Optional dot paths selecting the returned fields (overrides detail)
+        limit: Maximum number of results to return (1-1000, auto-paginated)
 
     Returns:
         Formatted search results for code query
@@ -76,13 +110,16 @@ async def search_code(input: SearchCodeInput) -> str:
         # Prepare API parameters
         params = {
             "q": q,
-            "per_page": input.limit,
         }
 
-        # Make API request
-        response_data = await make_github_request(
+        # Fetch and merge result pages up to the limit, or until they fill
+        # the output budget; fetch_more continues from the next page
+        response_data, resume = await collect_search_results(
             endpoint="/search/code",
             params=params,
+            limit=input.limit,
+            budget=output_limit(),
+            projection=response_projection(input.detail, PROJECTION, input.fields),
         )
 
         # Format response
@@ -90,6 +127,10 @@ async def search_code(input: SearchCodeInput) -> str:
             response_data,
             format=input.format,
             detail=input.detail,
+            projection=PROJECTION,
+            fields=input.fields,
+            table=TABLE,
+            resume=resume,
         )
 
         return formatted_response
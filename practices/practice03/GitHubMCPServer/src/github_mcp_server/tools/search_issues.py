@@ -1,10 +1,14 @@
 """Search GitHub issues tool (function-only; registration done in server)."""
 
 from pydantic import BaseModel, Field
-from typing import Literal
-from ..utils.api_client import make_github_request
-from ..utils.formatters import format_response
+from typing import List, Literal, Optional
+from ..utils.budget import output_limit
+from ..utils.formatters import format_response, response_projection
+from ..utils.projection import Projection
+from ..utils.tables import Column, TableSchema
+from ..utils.pagination import collect_search_results
 from ..utils.errors import MCPError
+from ..utils.tool_cache import CachePolicy
 
 
 class SearchIssuesInput(BaseModel):
@@ -26,12 +30,21 @@ class SearchIssuesInput(BaseModel):
         default="concise",
         description="Detail level: 'concise' for summary, 'detailed' for full information"
     )
+
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Return only these fields, as dot paths relative to one result "
+            "(e.g. 'title', 'user.login', 'labels[].name'). Overrides 'detail'"
+        ),
+        max_length=50,
+    )
     
     limit: int = Field(
         default=10,
         ge=1,
-        le=100,
-        description="Maximum number of results to return (1-100)"
+        le=1000,
+        description="Maximum number of results to return (1-1000). More than 100 results are fetched across pages automatically"
     )
     
     sort: Literal["created", "updated", "comments"] = Field(
@@ -52,6 +65,34 @@ TOOL_ANNOTATIONS = {
     "openWorldHint": True,
 }
 
+# Fields returned in concise mode
+PROJECTION = Projection([
+    "number",
+    "title",
+    "state",
+    "html_url",
+    "user.login",
+    "labels[].name",
+    "comments",
+    "created_at",
+    "updated_at",
+])
+
+# Markdown columns for lists of results
+TABLE = TableSchema([
+    Column("number", "#"),
+    Column("title"),
+    Column("state"),
+    Column("user.login", "author"),
+    Column("labels[].name", "labels"),
+    Column("comments"),
+    Column("updated_at", "updated"),
+    Column("html_url", "url"),
+])
+
+# Search results change quickly: short TTL
+CACHE_POLICY = CachePolicy(ttl=60)
+
 
 async def search_issues(input: SearchIssuesInput) -> str:
     """Search GitHub issues with advanced filtering.
@@ -68,7 +109,8 @@ async def search_issues(input: SearchIssuesInput) -> str:
             - Author: 'author:octocat'
         format: Output format - "json" for structured data, "markdown" for readable text
         detail: "concise" returns summary information, "detailed" returns full issue details
-        limit: Maximum number of results to return (1-100)
+        fields: Optional dot paths selecting the returned fields (overrides detail)
+        limit: Maximum number of results to return (1-1000, auto-paginated)
         sort: Sort order - "created", "updated", or "comments"
         order: Sort direction - "asc" for ascending, "desc" for descending
     
@@ -89,22 +131,29 @@ async def search_issues(input: SearchIssuesInput) -> str:
         # Prepare API parameters
         params = {
             "q": input.query,
-            "per_page": input.limit,
             "sort": input.sort,
             "order": input.order
         }
         
-        # Make API request
-        response_data = await make_github_request(
+        # Fetch and merge result pages up to the limit, or until they fill
+        # the output budget; fetch_more continues from the next page
+        response_data, resume = await collect_search_results(
             endpoint="/search/issues",
-            params=params
+            params=params,
+            limit=input.limit,
+            budget=output_limit(),
+            projection=response_projection(input.detail, PROJECTION, input.fields),
         )
         
         # Format response
         formatted_response = format_response(
             response_data,
             format=input.format,
-            detail=input.detail
+            detail=input.detail,
+            projection=PROJECTION,
+            fields=input.fields,
+            table=TABLE,
+            resume=resume,
         )
         
         return formatted_response
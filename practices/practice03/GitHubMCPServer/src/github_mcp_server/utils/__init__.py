@@ -1,19 +1,43 @@
-"""GitHub MCP Server utilities package."""
-
-from .api_client import make_github_request, handle_rate_limit
-from .errors import MCPError, create_error_response, suggest_next_steps
-from .formatters import format_response, truncate_response
-from .cache import cache_get, cache_set, cache_clear
-
-__all__ = [
-    'make_github_request',
-    'handle_rate_limit',
-    'MCPError',
-    'create_error_response',
-    'suggest_next_steps',
-    'format_response',
-    'truncate_response',
-    'cache_get',
-    'cache_set',
-    'cache_clear',
-]
\ No newline at end of file
+"""GitHub MCP Server utilities package.
+
+The names below are re-exported lazily (on first attribute access) so that
+importing one utility module, as the server does at startup, does not import
+all of them.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'make_github_request': 'api_client',
+    'handle_rate_limit': 'api_client',
+    'get_client_manager': 'http_client',
+    'get_http_client': 'http_client',
+    'MCPError': 'errors',
+    'create_error_response': 'errors',
+    'suggest_next_steps': 'errors',
+    'format_response': 'formatters',
+    'truncate_response': 'formatters',
+    'cache_get': 'cache',
+    'cache_aget': 'cache',
+    'cache_set': 'cache',
+    'cache_clear': 'cache',
+    'cache_stats': 'cache',
+    'get_conditional_stats': 'conditional',
+    'get_rate_limit_stats': 'rate_limit',
+    'RetryPolicy': 'retry',
+    'get_retry_stats': 'retry',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,32 +1,95 @@
 """GitHub API client utilities."""
 
-import os
+import time
 import httpx
 import asyncio
-from typing import Dict, Any, Optional
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
 from .errors import MCPError, handle_api_error
+from .http_client import get_http_client
+from . import conditional, json_codec
+from .rate_limit import get_scheduler, resource_for, credential_id, retry_after_seconds
+from .retry import IDEMPOTENT_METHODS, get_retry_policy, retry_stats
+from .token_pool import authorization_for, get_token_pool, quarantine_hint
+
+
+logger = logging.getLogger("github-mcp-server")
 
 
 # GitHub API configuration
 GITHUB_API_BASE = "https://api.github.com"
 GITHUB_API_VERSION = "2022-11-28"
 
+# Attempts for requests answered with a rate-limit response (403/429)
+RATE_LIMIT_ATTEMPTS = 3
+
+
+class SingleFlight:
+    """Coalesce concurrent identical requests into one in-flight call.
+    
+    The first caller for a key starts the call as a task; callers arriving
+    while it is running await the same task and receive its result or its
+    exception. Cancelling one caller does not cancel the shared call.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is not None and not task.done():
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self.started += 1
+            task.add_done_callback(lambda t, k=key: self._finish(k, t))
+        return await asyncio.shield(task)
+    
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception as retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+
+_inflight = SingleFlight()
+
+
+def get_inflight_stats() -> Dict[str, int]:
+    """Return request coalescing statistics."""
+    return _inflight.stats()
+
 
 async def make_github_request(
     endpoint: str,
     method: str = "GET",
     params: Optional[Dict[str, Any]] = None,
     data: Optional[Dict[str, Any]] = None,
-    timeout: float = 30.0
+    timeout: Optional[float] = None
 ) -> Dict[str, Any]:
     """Make a request to GitHub API.
     
+    Requests go through the shared pooled client (see ``http_client``), so
+    connections to api.github.com are reused across tool invocations.
+    
     Args:
         endpoint: API endpoint path (e.g., "/search/issues")
         method: HTTP method (GET, POST, etc.)
         params: Query parameters
         data: Request body data
-        timeout: Request timeout in seconds
+        timeout: Request timeout in seconds (defaults to API_TIMEOUT)
         
     Returns:
         JSON response from GitHub API
@@ -34,85 +97,331 @@ async def make_github_request(
     Raises:
         MCPError: If the request fails
     """
-    # Get GitHub token from environment
-    github_token = os.getenv("GITHUB_TOKEN")
+    try:
+        response = await send_github_request(
+            endpoint,
+            method=method,
+            params=params,
+            data=data,
+            timeout=timeout
+        )
+        return json_codec.loads(response.content)
+        
+    except Exception as e:
+        raise to_mcp_error(e)
+
+
+async def graphql_request(query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Run a GraphQL query against the GitHub GraphQL API.
     
-    # Prepare headers
+    Args:
+        query: GraphQL query document
+        variables: Query variables
+        
+    Returns:
+        Full response body (``data`` and, for partial failures, ``errors``)
+        
+    Raises:
+        MCPError: If the request fails or no data is returned at all
+    """
+    body = await make_github_request(
+        "/graphql",
+        method="POST",
+        data={"query": query, "variables": variables or {}}
+    )
+    if body.get("data") is None:
+        errors = body.get("errors") or []
+        raise MCPError(
+            message=f"GraphQL query failed: {errors[0].get('message') if errors else 'no data returned'}",
+            code=502,
+            details={"errors": errors[:5]},
+            suggestion="Please try again or contact support if the issue persists."
+        )
+    return body
+
+
+def to_mcp_error(error: Exception) -> MCPError:
+    """Convert any exception raised while talking to GitHub into an MCPError.
+    
+    Args:
+        error: Exception raised by the request pipeline
+        
+    Returns:
+        The MCPError to raise
+    """
+    if isinstance(error, MCPError):
+        return error
+    if isinstance(error, httpx.HTTPError):
+        # Convert HTTP errors to MCP errors
+        return handle_api_error(error)
+    return MCPError(
+        message=f"Unexpected error: {str(error)}",
+        code=500,
+        details={"error_type": "unexpected"},
+        suggestion="Please try again or contact support if the issue persists."
+    )
+
+
+def build_headers(
+    accept: str = "application/vnd.github.v3+json",
+    token: Optional[str] = None
+) -> Dict[str, str]:
+    """Build the default GitHub request headers.
+    
+    Args:
+        accept: Value of the Accept header
+        token: GitHub token to authenticate with (omitted for anonymous access)
+        
+    Returns:
+        Header dictionary
+    """
     headers = {
-        "Accept": "application/vnd.github.v3+json",
+        "Accept": accept,
         "X-GitHub-Api-Version": GITHUB_API_VERSION,
         "User-Agent": "GitHub-MCP-Server/0.1.0"
     }
-    if github_token and github_token != "your_github_personal_access_token_here":
-        headers["Authorization"] = f"Bearer {github_token}"
+    if token:
+        headers["Authorization"] = authorization_for(token)
+    return headers
+
+
+async def send_github_request(
+    endpoint: str,
+    method: str = "GET",
+    params: Optional[Dict[str, Any]] = None,
+    data: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> httpx.Response:
+    """Send a request to GitHub API and return the raw response.
+    
+    Unlike ``make_github_request`` this keeps the status and headers available
+    to callers (pagination, conditional requests, ...). Concurrent identical
+    GETs are coalesced into a single upstream request.
+    
+    Args:
+        endpoint: API endpoint path (e.g., "/search/issues")
+        method: HTTP method (GET, POST, etc.)
+        params: Query parameters
+        data: Request body data
+        timeout: Request timeout in seconds (defaults to API_TIMEOUT)
+        headers: Extra headers merged over the defaults
+        
+    Returns:
+        Successful ``httpx.Response``
+        
+    Raises:
+        httpx.HTTPError: If the request fails or returns an error status
+        MCPError: If the rate limit is exceeded
+    """
+    request_headers = build_headers()
+    if headers:
+        request_headers.update(headers)
+    
+    if method.upper() != "GET":
+        return await _perform_request(endpoint, method, params, data, timeout, request_headers, None)
+    
+    # Identical concurrent GETs share one upstream request
+    request_key = conditional.request_key(
+        endpoint,
+        params,
+        request_headers.get("Accept", ""),
+        request_headers.get("Authorization") or get_token_pool().fingerprint()
+    )
+    return await _inflight.do(
+        request_key,
+        lambda: _perform_request(endpoint, method, params, data, timeout, request_headers, request_key)
+    )
+
+
+@asynccontextmanager
+async def stream_github_request(
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None
+) -> AsyncIterator[httpx.Response]:
+    """Send a GET whose body is read incrementally by the caller.
+    
+    The request goes through the same token routing, pacing and retry logic
+    as ``send_github_request`` (retries happen before any body bytes are
+    handed out), but is neither coalesced nor stored for conditional reuse.
+    Leaving the context closes the response, so callers can stop reading
+    early without downloading the rest of the body.
+    
+    Args:
+        endpoint: API endpoint path (e.g., "/repos/o/r/git/blobs/{sha}")
+        params: Query parameters
+        headers: Extra headers merged over the defaults (e.g., a raw Accept)
+        timeout: Request timeout in seconds (defaults to API_TIMEOUT)
+        
+    Yields:
+        Successful, unread ``httpx.Response``
+        
+    Raises:
+        httpx.HTTPError: If the request fails or returns an error status
+        MCPError: If the rate limit is exceeded
+    """
+    request_headers = build_headers()
+    if headers:
+        request_headers.update(headers)
+    response = await _perform_request(endpoint, "GET", params, None, timeout, request_headers, None, stream=True)
+    try:
+        yield response
+    finally:
+        await response.aclose()
+
+
+async def _perform_request(
+    endpoint: str,
+    method: str,
+    params: Optional[Dict[str, Any]],
+    data: Optional[Dict[str, Any]],
+    timeout: Optional[float],
+    request_headers: Dict[str, str],
+    request_key: Optional[str],
+    stream: bool = False
+) -> httpx.Response:
+    """Send one request through the shared client.
+    
+    GETs are conditional when validators are stored; requests are paced by
+    the rate-limit scheduler; idempotent requests are retried on transient
+    failures according to the retry policy. With ``stream`` the successful
+    response is returned unread.
+    """
+    # Conditional GETs: replay validators so unchanged resources come back as 304
+    entry = None
+    cache_key = request_key if conditional.conditional_requests_enabled() else None
+    if cache_key is not None:
+        entry = await conditional.lookup(cache_key)
+        if entry is not None:
+            request_headers = {**request_headers, **entry.validator_headers()}
     
     # Build full URL
     url = f"{GITHUB_API_BASE}{endpoint}"
     
-    # Make the request
-    # trust_env=False prevents picking up system HTTP(S)_PROXY/SOCKS settings
-    async with httpx.AsyncClient(trust_env=False) as client:
+    scheduler = get_scheduler()
+    resource = resource_for(endpoint)
+    pool = get_token_pool()
+    client = get_http_client()
+    
+    policy = get_retry_policy()
+    stats = retry_stats()
+    retryable = method.upper() in IDEMPOTENT_METHODS
+    started = time.monotonic()
+    attempt = 0
+    rate_limited = 0
+    auth_failures = 0
+    
+    while True:
+        attempt += 1
+        # Route to the pooled token with the most headroom (unless the caller
+        # supplied its own Authorization header)
+        token = None
+        attempt_headers = request_headers
+        if "Authorization" not in request_headers:
+            token = pool.select(resource)
+            if token:
+                attempt_headers = {**request_headers, "Authorization": authorization_for(token)}
+        credential = credential_id(attempt_headers.get("Authorization"))
+        
+        # Queue until the resource bucket has quota for this credential
+        await scheduler.acquire(credential, resource)
         try:
-            response = await client.request(
+            request = client.build_request(
                 method=method,
                 url=url,
-                headers=headers,
+                headers=attempt_headers,
                 params=params,
                 json=data,
-                timeout=timeout
-            )
-            response.raise_for_status()
-            
-            # Handle rate limiting
-            await handle_rate_limit(response)
-            
-            return response.json()
-            
-        except httpx.HTTPError as e:
-            # Convert HTTP errors to MCP errors
-            raise handle_api_error(e)
-        except Exception as e:
-            raise MCPError(
-                message=f"Unexpected error: {str(e)}",
-                code=500,
-                details={"error_type": "unexpected"},
-                suggestion="Please try again or contact support if the issue persists."
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
             )
+            response = await client.send(request, stream=stream)
+        except httpx.TransportError as e:
+            # Timeouts and network blips: retry idempotent requests with backoff
+            reason = type(e).__name__
+            delay = policy.next_delay(attempt, started) if retryable and policy.is_retryable_error(e) else None
+            if delay is None:
+                if attempt > 1:
+                    stats.record_exhausted(method, endpoint, attempt, reason)
+                raise
+            stats.record_retry(method, endpoint, attempt, reason, delay)
+            await asyncio.sleep(delay)
+            continue
+        
+        if response.status_code == 401 and token:
+            # Bad or revoked token: take it out of rotation and try another one
+            pool.quarantine(token, quarantine_hint(response))
+            if auth_failures < len(pool) - 1 and pool.has_alternative(token, resource):
+                auth_failures += 1
+                attempt -= 1
+                await response.aclose()
+                continue
+        
+        await handle_rate_limit(response, resource)
+        
+        # Primary quota exhausted or secondary limit (Retry-After): the
+        # scheduler now blocks this bucket, so the next attempt waits for it
+        if retry_after_seconds(response) is not None and rate_limited < RATE_LIMIT_ATTEMPTS - 1:
+            rate_limited += 1
+            attempt -= 1  # waiting for quota is not a transient-failure attempt
+            logger.warning(f"Rate limited on '{resource}' (HTTP {response.status_code}); request queued for retry")
+            await response.aclose()
+            continue
+        
+        # Transient upstream errors (502/503/...): retry idempotent requests
+        if retryable and policy.is_retryable_status(response.status_code):
+            reason = f"HTTP {response.status_code}"
+            delay = policy.next_delay(attempt, started)
+            if delay is not None:
+                stats.record_retry(method, endpoint, attempt, reason, delay)
+                await response.aclose()
+                await asyncio.sleep(delay)
+                continue
+            if attempt > 1:
+                stats.record_exhausted(method, endpoint, attempt, reason)
+        break
+    
+    if response.status_code == 304 and entry is not None:
+        # 304s are free: serve the stored body
+        return conditional.revalidated(cache_key, entry, response)
+    
+    if stream and response.is_error:
+        # Error details are parsed from the body
+        await response.aread()
+    response.raise_for_status()
+    
+    if cache_key is not None:
+        conditional.record_fetch()
+        conditional.store(cache_key, response)
+    
+    return response
 
 
-async def handle_rate_limit(response: httpx.Response) -> None:
+async def handle_rate_limit(response: httpx.Response, resource: Optional[str] = None) -> None:
     """Handle GitHub API rate limiting.
     
+    Feeds the response's ``x-ratelimit-*`` headers into the shared scheduler,
+    which paces and queues later requests. A successful response is never
+    turned into an error here.
+    
     Args:
         response: HTTP response from GitHub API
-        
-    Raises:
-        MCPError: If rate limit is exceeded
+        resource: Rate-limit resource the request was paced against; used
+            when the response does not name one (e.g. secondary-limit 403s)
     """
-    rate_limit_remaining = response.headers.get("x-ratelimit-remaining")
-    rate_limit_reset = response.headers.get("x-ratelimit-reset")
+    resource = response.headers.get("x-ratelimit-resource") or resource or "core"
+    get_scheduler().observe(response, resource)
     
-    if rate_limit_remaining and int(rate_limit_remaining) <= 10:
+    rate_limit_remaining = response.headers.get("x-ratelimit-remaining")
+    if rate_limit_remaining and rate_limit_remaining.isdigit() and int(rate_limit_remaining) <= 10:
         # If we're getting close to the limit, log a warning
-        print(f"Warning: Rate limit getting low. Remaining: {rate_limit_remaining}")
-    
-    if rate_limit_remaining == "0":
-        # Calculate wait time until reset
-        reset_time = int(rate_limit_reset) if rate_limit_reset else None
-        current_time = asyncio.get_event_loop().time()
-        
-        if reset_time:
-            wait_seconds = max(0, reset_time - current_time)
-            raise MCPError(
-                message="Rate limit exceeded. Please wait before making more requests.",
-                code=429,
-                details={
-                    "rate_limit_remaining": rate_limit_remaining,
-                    "rate_limit_reset": reset_time,
-                    "wait_seconds": wait_seconds
-                },
-                suggestion="Wait before making more requests or use a token with higher limits."
-            )
+        rate_limit_reset = response.headers.get("x-ratelimit-reset")
+        wait_seconds = max(0, int(rate_limit_reset) - int(time.time())) if rate_limit_reset and rate_limit_reset.isdigit() else None
+        logger.warning(
+            f"Rate limit getting low for '{resource}'. "
+            f"Remaining: {rate_limit_remaining}, resets in {wait_seconds}s"
+        )
 
 
 def validate_repository_format(repository: str) -> bool:
@@ -134,6 +443,18 @@ def validate_repository_format(repository: str) -> bool:
     return True
 
 
+def is_commit_sha(ref: Optional[str]) -> bool:
+    """Check whether a git reference is a full commit SHA (immutable).
+    
+    Args:
+        ref: Git reference (branch, tag, or commit SHA)
+        
+    Returns:
+        True if ref is a 40-character hexadecimal SHA
+    """
+    return bool(ref) and len(ref) == 40 and all(c in "0123456789abcdefABCDEF" for c in ref)
+
+
 def parse_repository(repository: str) -> Dict[str, str]:
     """Parse repository name into owner and repo components.
     
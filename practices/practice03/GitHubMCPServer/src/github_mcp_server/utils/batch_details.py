@@ -0,0 +1,271 @@
+"""Batch retrieval of issue and pull request details.
+
+Items are fetched in chunks of ``GITHUB_GRAPHQL_BATCH_SIZE`` with one GraphQL
+query per chunk, each item under its own alias (``i0: repository(...) {
+issue(number: ...) }``), so items may span repositories. Without a token
+(GraphQL requires authentication), or when a whole chunk fails, the items
+are fetched from the REST API instead, at most ``GITHUB_BATCH_CONCURRENCY``
+at a time. Results keep the input order, and a failing item yields an error
+entry instead of failing the batch. GraphQL and REST results are normalized
+to the same flat shape.
+"""
+
+import re
+import asyncio
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+
+from .api_client import graphql_request, make_github_request, validate_repository_format
+from .env import env_int
+from .errors import MCPError
+from .token_pool import get_token_pool
+
+
+Kind = Literal["issue", "pull_request"]
+
+_REF_RE = re.compile(r"^\s*(?:(?P<repository>[^\s#]+/[^\s#]+))?#?(?P<number>\d+)\s*$")
+
+_GRAPHQL_FIELDS = {
+    ("issue", False): (
+        "number title state url createdAt updatedAt closedAt author { login } "
+        "labels(first: 20) { nodes { name } } comments { totalCount }"
+    ),
+    ("pull_request", False): (
+        "number title state url createdAt updatedAt closedAt mergedAt isDraft author { login } "
+        "labels(first: 20) { nodes { name } } comments { totalCount } baseRefName headRefName"
+    ),
+}
+_GRAPHQL_FIELDS[("issue", True)] = _GRAPHQL_FIELDS[("issue", False)] + (
+    " body assignees(first: 20) { nodes { login } } milestone { title }"
+)
+_GRAPHQL_FIELDS[("pull_request", True)] = _GRAPHQL_FIELDS[("pull_request", False)] + (
+    " body assignees(first: 20) { nodes { login } } milestone { title }"
+    " merged additions deletions changedFiles headRefOid commits { totalCount }"
+)
+
+
+class BatchItem:
+    """One requested issue or pull request."""
+
+    __slots__ = ("owner", "repo", "number")
+
+    def __init__(self, owner: str, repo: str, number: int):
+        self.owner = owner
+        self.repo = repo
+        self.number = number
+
+    @property
+    def repository(self) -> str:
+        return f"{self.owner}/{self.repo}"
+
+
+def parse_items(refs: List[str], repository: Optional[str] = None) -> List[Union[BatchItem, Dict[str, Any]]]:
+    """Parse references like 'owner/repo#123' (or '123' with a default repository).
+
+    Unparseable references become error entries rather than failing the batch.
+    """
+    items: List[Union[BatchItem, Dict[str, Any]]] = []
+    for ref in refs:
+        match = _REF_RE.match(str(ref))
+        target = (match.group("repository") if match else None) or repository
+        if match is None or target is None or not validate_repository_format(target):
+            items.append({
+                "reference": ref,
+                "error": {
+                    "code": 400,
+                    "message": "Expected 'owner/repo#number', or a number when 'repository' is set.",
+                },
+            })
+            continue
+        owner, repo = target.split("/")
+        items.append(BatchItem(owner, repo, int(match.group("number"))))
+    return items
+
+
+def _logins(connection: Optional[Dict[str, Any]]) -> List[str]:
+    return [node["login"] for node in (connection or {}).get("nodes", []) if node]
+
+
+def _from_graphql(node: Dict[str, Any], kind: Kind, detailed: bool) -> Dict[str, Any]:
+    state = (node.get("state") or "").lower()
+    result = {
+        "number": node.get("number"),
+        "title": node.get("title"),
+        # REST reports merged pull requests as closed
+        "state": "closed" if state == "merged" else state,
+        "html_url": node.get("url"),
+        "author": (node.get("author") or {}).get("login"),
+        "labels": [label["name"] for label in (node.get("labels") or {}).get("nodes", []) if label],
+        "comments": (node.get("comments") or {}).get("totalCount"),
+        "created_at": node.get("createdAt"),
+        "updated_at": node.get("updatedAt"),
+        "closed_at": node.get("closedAt"),
+    }
+    if kind == "pull_request":
+        result.update({
+            "draft": node.get("isDraft"),
+            "merged_at": node.get("mergedAt"),
+            "base": node.get("baseRefName"),
+            "head": node.get("headRefName"),
+        })
+    if detailed:
+        result.update({
+            "body": node.get("body"),
+            "assignees": _logins(node.get("assignees")),
+            "milestone": (node.get("milestone") or {}).get("title"),
+        })
+        if kind == "pull_request":
+            result.update({
+                "merged": node.get("merged"),
+                "additions": node.get("additions"),
+                "deletions": node.get("deletions"),
+                "changed_files": node.get("changedFiles"),
+                "head_sha": node.get("headRefOid"),
+                "commits": (node.get("commits") or {}).get("totalCount"),
+            })
+    return result
+
+
+def _from_rest(body: Dict[str, Any], kind: Kind, detailed: bool) -> Dict[str, Any]:
+    result = {
+        "number": body.get("number"),
+        "title": body.get("title"),
+        "state": body.get("state"),
+        "html_url": body.get("html_url"),
+        "author": (body.get("user") or {}).get("login"),
+        "labels": [label.get("name") for label in body.get("labels") or []],
+        "comments": body.get("comments"),
+        "created_at": body.get("created_at"),
+        "updated_at": body.get("updated_at"),
+        "closed_at": body.get("closed_at"),
+    }
+    if kind == "pull_request":
+        result.update({
+            "draft": body.get("draft"),
+            "merged_at": body.get("merged_at"),
+            "base": (body.get("base") or {}).get("ref"),
+            "head": (body.get("head") or {}).get("ref"),
+        })
+    if detailed:
+        result.update({
+            "body": body.get("body"),
+            "assignees": [user.get("login") for user in body.get("assignees") or []],
+            "milestone": (body.get("milestone") or {}).get("title"),
+        })
+        if kind == "pull_request":
+            result.update({
+                "merged": body.get("merged"),
+                "additions": body.get("additions"),
+                "deletions": body.get("deletions"),
+                "changed_files": body.get("changed_files"),
+                "head_sha": (body.get("head") or {}).get("sha"),
+                "commits": body.get("commits"),
+            })
+    return result
+
+
+def _error_entry(item: BatchItem, code: int, message: str) -> Dict[str, Any]:
+    return {
+        "repository": item.repository,
+        "number": item.number,
+        "error": {"code": code, "message": message},
+    }
+
+
+def build_query(kind: Kind, chunk: List[BatchItem], detailed: bool) -> Tuple[str, Dict[str, Any]]:
+    """Build one aliased GraphQL query (and its variables) for a chunk."""
+    field = "issue" if kind == "issue" else "pullRequest"
+    type_name = "Issue" if kind == "issue" else "PullRequest"
+    definitions = []
+    selections = []
+    variables: Dict[str, Any] = {}
+    for i, item in enumerate(chunk):
+        definitions.append(f"$o{i}: String!, $r{i}: String!, $n{i}: Int!")
+        selections.append(f"i{i}: repository(owner: $o{i}, name: $r{i}) {{ {field}(number: $n{i}) {{ ...Item }} }}")
+        variables.update({f"o{i}": item.owner, f"r{i}": item.repo, f"n{i}": item.number})
+    query = (
+        f"query({', '.join(definitions)}) {{ {' '.join(selections)} }} "
+        f"fragment Item on {type_name} {{ {_GRAPHQL_FIELDS[(kind, detailed)]} }}"
+    )
+    return query, variables
+
+
+async def _fetch_chunk_graphql(kind: Kind, chunk: List[BatchItem], detailed: bool) -> List[Dict[str, Any]]:
+    query, variables = build_query(kind, chunk, detailed)
+    body = await graphql_request(query, variables)
+    data = body.get("data") or {}
+    errors: Dict[str, Dict[str, Any]] = {}
+    for error in body.get("errors") or []:
+        path = error.get("path") or []
+        if path:
+            errors.setdefault(str(path[0]), error)
+
+    field = "issue" if kind == "issue" else "pullRequest"
+    results = []
+    for i, item in enumerate(chunk):
+        node = (data.get(f"i{i}") or {}).get(field)
+        if node is not None:
+            results.append({"repository": item.repository, **_from_graphql(node, kind, detailed)})
+            continue
+        error = errors.get(f"i{i}") or {}
+        code = 404 if error.get("type") in (None, "NOT_FOUND") else 502
+        results.append(_error_entry(item, code, error.get("message") or "Resource not found."))
+    return results
+
+
+async def _fetch_rest(kind: Kind, item: BatchItem, detailed: bool, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    path = "issues" if kind == "issue" else "pulls"
+    try:
+        async with semaphore:
+            body = await make_github_request(f"/repos/{item.owner}/{item.repo}/{path}/{item.number}")
+    except MCPError as e:
+        return _error_entry(item, e.code, e.message)
+    return {"repository": item.repository, **_from_rest(body, kind, detailed)}
+
+
+async def fetch_details(
+    kind: Kind,
+    refs: List[str],
+    repository: Optional[str] = None,
+    detailed: bool = False,
+) -> List[Dict[str, Any]]:
+    """Fetch many issues or pull requests, preserving input order.
+
+    Args:
+        kind: "issue" or "pull_request"
+        refs: References ('owner/repo#123', or numbers with ``repository``)
+        repository: Default repository for bare numbers
+        detailed: Include bodies, assignees and (for PRs) diff statistics
+
+    Returns:
+        One entry per reference; failed items carry an ``error`` object
+    """
+    items = parse_items(refs, repository)
+    results: List[Optional[Dict[str, Any]]] = [
+        None if isinstance(item, BatchItem) else item for item in items
+    ]
+    pending = [(i, item) for i, item in enumerate(items) if isinstance(item, BatchItem)]
+    semaphore = asyncio.Semaphore(env_int("GITHUB_BATCH_CONCURRENCY", 8, minimum=1))
+
+    async def rest(positions: List[Tuple[int, BatchItem]]) -> None:
+        fetched = await asyncio.gather(*(_fetch_rest(kind, item, detailed, semaphore) for _, item in positions))
+        for (i, _), entry in zip(positions, fetched):
+            results[i] = entry
+
+    async def graphql(positions: List[Tuple[int, BatchItem]]) -> None:
+        try:
+            async with semaphore:
+                fetched = await _fetch_chunk_graphql(kind, [item for _, item in positions], detailed)
+        except MCPError:
+            # The whole query failed (e.g. GraphQL unavailable): use REST
+            await rest(positions)
+            return
+        for (i, _), entry in zip(positions, fetched):
+            results[i] = entry
+
+    if len(get_token_pool()) == 0:
+        # GraphQL requires authentication
+        await rest(pending)
+    else:
+        size = env_int("GITHUB_GRAPHQL_BATCH_SIZE", 25, minimum=1)
+        await asyncio.gather(*(graphql(pending[i:i + size]) for i in range(0, len(pending), size)))
+    return results
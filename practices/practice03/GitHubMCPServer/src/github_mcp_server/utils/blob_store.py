@@ -0,0 +1,211 @@
+"""Disk-backed, content-addressed store for git objects.
+
+A git object never changes for a given SHA, so blob contents (and tree
+listings) fetched once can be reused across sessions and server restarts.
+Objects are stored zlib-compressed in a sharded directory under
+``GITHUB_CACHE_DIR`` (``<dir>/objects/<scope>/ab/cdef...``), written
+atomically. ``scope`` identifies the credentials that fetched an object
+(see ``token_pool.credential_scope``): content one token could read is never
+served to a caller holding different credentials. The store is bounded by ``GITHUB_BLOB_STORE_MAX_BYTES`` of compressed data:
+reads refresh a file's modification time, and the least recently used files
+are removed once the budget is exceeded. Setting the budget to 0 disables the
+store.
+"""
+
+import os
+import re
+import zlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .env import env_int
+
+
+logger = logging.getLogger("github-mcp-server")
+
+_SHA_RE = re.compile(r"^[0-9a-f]{40}$|^[0-9a-f]{64}$")
+_SCOPE_RE = re.compile(r"^[0-9a-z]+$")
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "github-mcp-server"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def is_object_sha(value: Optional[str]) -> bool:
+    """Whether a value is a full git object SHA (SHA-1 or SHA-256)."""
+    return bool(value) and bool(_SHA_RE.match(value.lower()))
+
+
+class BlobStore:
+    """Sharded directory of zlib-compressed objects with LRU eviction.
+
+    Args:
+        root: Cache directory (objects live in ``root/objects``)
+        max_bytes: Budget for the compressed size of all stored objects
+        level: zlib compression level
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES, level: int = 6):
+        self.root = Path(root) / "objects"
+        self.max_bytes = max_bytes
+        self.level = level
+        self._lock = threading.Lock()
+        self._total: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def path_for(self, sha: str, kind: str = "blob", scope: str = "anonymous") -> Path:
+        """File path of an object.
+
+        ``kind`` separates e.g. blobs from tree listings; ``scope`` is the
+        credential partition the object was fetched under.
+        """
+        sha = sha.lower()
+        if not _SHA_RE.match(sha):
+            raise ValueError(f"Not a git object SHA: {sha!r}")
+        if not _SCOPE_RE.match(scope):
+            raise ValueError(f"Not a credential scope: {scope!r}")
+        name = sha[2:] if kind == "blob" else f"{sha[2:]}.{kind}"
+        return self.root / scope / sha[:2] / name
+
+    def _total_bytes(self) -> int:
+        if self._total is None:
+            self._total = sum(f.stat().st_size for f in self.root.glob("*/*/*") if f.is_file())
+        return self._total
+
+    def get(self, sha: str, kind: str = "blob", scope: str = "anonymous") -> Optional[bytes]:
+        """Return an object stored under ``scope``, or None if it is not stored."""
+        path = self.path_for(sha, kind, scope)
+        try:
+            data = zlib.decompress(path.read_bytes())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, zlib.error) as e:
+            logger.warning(f"Dropping unreadable blob store entry {path}: {e}")
+            self._discard(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU: mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, sha: str, data: bytes, kind: str = "blob", scope: str = "anonymous") -> None:
+        """Store an object under ``scope`` (no-op if already stored)."""
+        path = self.path_for(sha, kind, scope)
+        if path.exists():
+            return
+        compressed = zlib.compress(data, self.level)
+        if len(compressed) > self.max_bytes:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        except OSError as e:
+            logger.warning(f"Could not write blob store entry {path}: {e}")
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write blob store entry {path}: {e}")
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self.writes += 1
+            self._total = self._total_bytes() + len(compressed)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _discard(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        if self._total is not None:
+            self._total -= size
+
+    def _evict(self) -> None:
+        """Remove least recently used objects until 90% of the budget is free."""
+        target = int(self.max_bytes * 0.9)
+        files = []
+        for f in self.root.glob("*/*/*"):
+            try:
+                stat = f.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, f))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, f in files:
+            if total <= target:
+                break
+            try:
+                f.unlink()
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._total = total
+
+    def clear(self) -> None:
+        """Remove every stored object."""
+        with self._lock:
+            for f in self.root.glob("*/*/*"):
+                try:
+                    f.unlink()
+                except OSError:
+                    pass
+            self._total = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "root": str(self.root),
+            "bytes": self._total_bytes(),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+
+_store: Optional[BlobStore] = None
+_configured = False
+
+
+def get_blob_store() -> Optional[BlobStore]:
+    """Return the process-wide blob store, or None if it is disabled."""
+    global _store, _configured
+    if not _configured:
+        _configured = True
+        max_bytes = env_int("GITHUB_BLOB_STORE_MAX_BYTES", DEFAULT_MAX_BYTES)
+        if max_bytes > 0:
+            root = Path(os.getenv("GITHUB_CACHE_DIR") or DEFAULT_CACHE_DIR).expanduser()
+            _store = BlobStore(root, max_bytes=max_bytes)
+    return _store
+
+
+def reset_blob_store() -> None:
+    """Forget the store so it is reconfigured from the environment on next use."""
+    global _store, _configured
+    _store = None
+    _configured = False
+
+
+def get_blob_store_stats() -> Optional[Dict[str, Any]]:
+    """Return blob store statistics (None if disabled)."""
+    store = get_blob_store()
+    return store.stats() if store is not None else None
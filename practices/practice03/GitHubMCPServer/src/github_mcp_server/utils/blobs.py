@@ -0,0 +1,352 @@
+"""Incremental reads of repository file contents.
+
+The contents API embeds files up to 1 MB as base64 and refuses to embed larger
+ones (``encoding: "none"``). Rather than decoding whole files only to truncate
+them afterwards, file bodies are read up to a byte budget: inline base64 is
+decoded only as far as needed, and large files are streamed from the blobs API
+with the raw media type and the connection is closed once the budget is
+reached. Binary files are recognized from the first chunk (a NUL byte, as git
+does) instead of failing a full UTF-8 decode.
+
+Blob content never changes for a given git SHA, so fully read blobs are kept
+in the shared cache under ``blob:<scope>:<sha>`` (``scope`` being the
+credentials that read it, see ``token_pool.credential_scope``) together with a lazily built line
+index; successive line or byte windows into the same file are served from it
+without refetching the body. Complete text blobs are also persisted in the
+disk-backed ``blob_store`` and read from there before going to the network.
+"""
+
+import asyncio
+import base64
+import codecs
+from array import array
+from bisect import bisect_right
+from typing import AsyncIterator, Optional, Tuple
+
+from .api_client import stream_github_request, to_mcp_error
+from .blob_store import get_blob_store, is_object_sha
+from .budget import Measure, fit_prefix
+from .cache import cache_aget, cache_set
+from .env import env_int
+from .token_pool import credential_scope
+
+
+# Accept header returning the raw bytes of a blob
+RAW_ACCEPT = "application/vnd.github.raw+json"
+
+# Bytes inspected for NUL when sniffing binary content
+SNIFF_BYTES = 8000
+
+BLOB_CACHE_PREFIX = "blob:"
+
+# Blobs are immutable; the TTL only bounds how long they occupy memory
+BLOB_CACHE_TTL = 86400
+
+# Upper bound on the characters one token covers; bounds the text measured
+# for a window so a huge file is not tokenized in full to fill one response
+MAX_CHARS_PER_TOKEN = 32
+
+
+def blob_max_bytes() -> int:
+    """Largest blob read in full for windowed reads (GITHUB_BLOB_MAX_BYTES)."""
+    return env_int("GITHUB_BLOB_MAX_BYTES", 10 * 1024 * 1024)
+
+
+def looks_binary(sample: bytes) -> bool:
+    """Whether a leading sample of a file looks like binary content."""
+    return b"\0" in sample[:SNIFF_BYTES]
+
+
+class BlobRead:
+    """Result of a bounded read.
+
+    Attributes:
+        data: Bytes read (at most the requested budget)
+        complete: True if ``data`` is the whole file
+        is_binary: True if the file was detected as binary (``data`` is empty)
+    """
+
+    __slots__ = ("data", "complete", "is_binary")
+
+    def __init__(self, data: bytes, complete: bool, is_binary: bool = False):
+        self.data = data
+        self.complete = complete
+        self.is_binary = is_binary
+
+    def text(self) -> Optional[str]:
+        """Decode as UTF-8, or None if the bytes are not valid UTF-8.
+
+        A multi-byte character cut by the budget is dropped rather than
+        treated as invalid.
+        """
+        try:
+            return codecs.getincrementaldecoder("utf-8")().decode(self.data, final=self.complete)
+        except UnicodeDecodeError:
+            return None
+
+
+async def read_limited(chunks: AsyncIterator[bytes], max_bytes: int) -> BlobRead:
+    """Read from a byte stream until it ends or ``max_bytes`` is exceeded.
+
+    Args:
+        chunks: Async iterator of body chunks
+        max_bytes: Byte budget
+
+    Returns:
+        BlobRead with at most ``max_bytes`` bytes
+    """
+    buffer = bytearray()
+    first = True
+    async for chunk in chunks:
+        if first and chunk:
+            first = False
+            if looks_binary(chunk):
+                return BlobRead(b"", complete=False, is_binary=True)
+        buffer.extend(chunk)
+        if len(buffer) > max_bytes:
+            return BlobRead(bytes(buffer[:max_bytes]), complete=False)
+    return BlobRead(bytes(buffer), complete=True)
+
+
+def decode_inline(content: str, max_bytes: int) -> BlobRead:
+    """Decode the base64 ``content`` of a contents response up to a budget.
+
+    Args:
+        content: Base64 text (GitHub wraps it with newlines)
+        max_bytes: Byte budget
+
+    Returns:
+        BlobRead with at most ``max_bytes`` bytes
+    """
+    encoded = content.replace("\n", "")
+    # 4 base64 characters encode 3 bytes; decode one byte past the budget
+    # to learn whether anything is left
+    needed = -(-(max_bytes + 1) // 3) * 4
+    data = base64.b64decode(encoded[:needed])
+    if looks_binary(data):
+        return BlobRead(b"", complete=False, is_binary=True)
+    if len(data) > max_bytes:
+        return BlobRead(data[:max_bytes], complete=False)
+    return BlobRead(data, complete=True)
+
+
+def bounded(data: bytes, max_bytes: int) -> BlobRead:
+    """Wrap bytes already in memory as a bounded read."""
+    if looks_binary(data):
+        return BlobRead(b"", complete=False, is_binary=True)
+    return BlobRead(data[:max_bytes], complete=len(data) <= max_bytes)
+
+
+async def load_stored(sha: str) -> Optional[bytes]:
+    """Read a blob from the disk store, if enabled and present."""
+    store = get_blob_store()
+    if store is None or not is_object_sha(sha):
+        return None
+    return await asyncio.to_thread(store.get, sha, "blob", credential_scope())
+
+
+async def persist(sha: str, data: bytes) -> None:
+    """Write a complete blob to the disk store, if enabled."""
+    store = get_blob_store()
+    if store is not None and is_object_sha(sha):
+        await asyncio.to_thread(store.put, sha, data, "blob", credential_scope())
+
+
+async def read_blob(
+    owner: str,
+    repo: str,
+    sha: str,
+    max_bytes: int,
+    inline_content: Optional[str] = None,
+) -> BlobRead:
+    """Read up to ``max_bytes`` of a blob: disk store, inline body, then network.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        sha: Blob SHA
+        max_bytes: Byte budget
+        inline_content: Base64 body from a contents response, if available
+
+    Returns:
+        BlobRead with at most ``max_bytes`` bytes
+
+    Raises:
+        MCPError: If the blob has to be fetched and cannot be
+    """
+    stored = await load_stored(sha)
+    if stored is not None:
+        return bounded(stored, max_bytes)
+    if inline_content:
+        read = decode_inline(inline_content, max_bytes)
+    else:
+        read = await stream_blob(owner, repo, sha, max_bytes)
+    if read.complete and not read.is_binary:
+        await persist(sha, read.data)
+    return read
+
+
+async def stream_blob(owner: str, repo: str, sha: str, max_bytes: int) -> BlobRead:
+    """Stream a blob's raw bytes up to a budget.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        sha: Blob SHA
+        max_bytes: Byte budget; the download stops once it is exceeded
+
+    Returns:
+        BlobRead with at most ``max_bytes`` bytes
+
+    Raises:
+        MCPError: If the blob cannot be fetched
+    """
+    try:
+        async with stream_github_request(
+            f"/repos/{owner}/{repo}/git/blobs/{sha}",
+            headers={"Accept": RAW_ACCEPT}
+        ) as response:
+            return await read_limited(response.aiter_bytes(), max_bytes)
+    except Exception as e:
+        raise to_mcp_error(e)
+
+
+class Blob(BlobRead):
+    """Content of one git blob with a lazily built line index.
+
+    ``complete`` is False when the blob exceeded ``blob_max_bytes`` and only
+    its beginning was read; such blobs are not cached.
+    """
+
+    __slots__ = ("sha", "_text", "_line_starts")
+
+    def __init__(self, sha: str, data: bytes, complete: bool, is_binary: bool = False):
+        super().__init__(data, complete, is_binary)
+        self.sha = sha
+        self._text: Optional[str] = None
+        self._line_starts: Optional[array] = None
+
+    def cache_size(self) -> int:
+        """Approximate memory footprint (bytes plus decoded text)."""
+        return 2 * len(self.data) + 64
+
+    def text(self) -> Optional[str]:
+        if self._text is None and not self.is_binary:
+            self._text = super().text()
+        return self._text
+
+    @property
+    def line_starts(self) -> array:
+        """Character offset at which each line starts."""
+        if self._line_starts is None:
+            text = self.text() or ""
+            starts = array("q", [0] if text else [])
+            find = text.find
+            position = find("\n")
+            while position != -1 and position + 1 < len(text):
+                starts.append(position + 1)
+                position = find("\n", position + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    @property
+    def total_lines(self) -> int:
+        return len(self.line_starts)
+
+    def lines(self, start: int, end: Optional[int], limit: int, measure: Measure = len) -> Tuple[str, int]:
+        """Return lines ``start``..``end`` (1-based, inclusive) within a budget.
+
+        The window is shortened to the whole lines whose text fits ``limit``
+        (in units of ``measure``). If not even line ``start`` fits, the
+        longest prefix of it that does is returned.
+
+        Returns:
+            (text, last line returned in full; ``start - 1`` if line
+            ``start`` was cut)
+        """
+        text = self.text() or ""
+        starts = self.line_starts
+        total = len(starts)
+        if start > total:
+            return "", start - 1
+        end = total if end is None else min(end, total)
+        begin = starts[start - 1]
+        # Line j (1-based) ends where line j + 1 starts
+        stop = starts[end] if end < total else len(text)
+        if measure is not len:
+            stop_measured = min(stop, begin + limit * MAX_CHARS_PER_TOKEN)
+        else:
+            stop_measured = stop
+        window = text[begin:stop_measured]
+        kept = fit_prefix(window, limit, measure)
+        if kept == len(window) and stop_measured == stop:
+            return window, end
+        fitting = bisect_right(starts, begin + kept) - 1
+        if fitting < start:
+            return window[:kept], start - 1
+        return text[begin:starts[fitting]], fitting
+
+    def byte_offset_of(self, char_offset: int) -> int:
+        """Byte offset of a character offset into ``text()``."""
+        return len((self.text() or "")[:char_offset].encode("utf-8"))
+
+    def byte_range(self, offset: int, length: int) -> bytes:
+        return self.data[offset:offset + length]
+
+    def char_boundary(self, offset: int, floor: int = 0) -> int:
+        """Move ``offset`` back to the start of the UTF-8 character it falls in.
+
+        Never moves below ``floor + 1`` (a window keeps at least one byte).
+        """
+        end = offset
+        while floor + 1 < end < len(self.data) and self.data[end] & 0xC0 == 0x80:
+            end -= 1
+        return end
+
+
+def fit_bytes(chunk: bytes, limit: int, measure: Measure = len) -> int:
+    """Length of the longest prefix of ``chunk`` whose decoded text fits ``limit``.
+
+    Undecodable bytes are measured as replacement characters.
+    """
+    chunk = chunk[:limit * MAX_CHARS_PER_TOKEN * 4] if measure is not len else chunk
+    if measure(chunk.decode("utf-8", errors="replace")) <= limit:
+        return len(chunk)
+    low, high = 0, len(chunk)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if measure(chunk[:middle].decode("utf-8", errors="replace")) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+async def load_blob(owner: str, repo: str, sha: str, inline_content: Optional[str] = None) -> Blob:
+    """Return a blob's content, from the content-addressed caches when possible.
+
+    The in-memory cache is checked first, then the disk store, then the
+    network (inline body or blobs API).
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        sha: Blob SHA
+        inline_content: Base64 body from a contents response, if available
+
+    Returns:
+        Blob (``complete`` is False if it exceeded ``blob_max_bytes``)
+
+    Raises:
+        MCPError: If the blob has to be fetched and cannot be
+    """
+    key = f"{BLOB_CACHE_PREFIX}{credential_scope()}:{sha}"
+    cached = await cache_aget(key)
+    if cached is not None:
+        return cached
+
+    read = await read_blob(owner, repo, sha, blob_max_bytes(), inline_content=inline_content)
+    blob = Blob(sha, read.data, read.complete, read.is_binary)
+    if blob.complete or blob.is_binary:
+        cache_set(key, blob, BLOB_CACHE_TTL)
+    return blob
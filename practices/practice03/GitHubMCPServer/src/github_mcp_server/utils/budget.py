@@ -0,0 +1,153 @@
+"""Token-based output budgets.
+
+Responses are limited in tokens, not characters: a fixed characters-per-token
+ratio overestimates the capacity for CJK text (roughly one token per
+character) and underestimates it for plain ASCII. ``count_tokens`` uses a
+real BPE tokenizer when ``tiktoken`` is installed and otherwise a fast
+estimate that splits text the way BPE pre-tokenizers do (words with their
+leading space or punctuation, digit groups, punctuation runs, whitespace
+runs) and counts each CJK character as one token. Counting is a single
+regular-expression pass; results are memoized per string, so the repeated
+measurements of the budgeted encoders cost a dictionary lookup.
+
+Configuration:
+    GITHUB_OUTPUT_TOKEN_LIMIT: Token budget of one response (default 25000)
+    GITHUB_TOKENIZER: "auto" (tiktoken if installed, else the estimate),
+        "estimate", or a tiktoken encoding name such as "o200k_base"
+"""
+
+import os
+import re
+import logging
+from functools import lru_cache
+from typing import Callable, Optional
+
+from .env import env_int
+
+
+logger = logging.getLogger("github-mcp-server")
+
+Measure = Callable[[str], int]
+
+# Default token budget of one response
+TOKEN_LIMIT = 25000
+
+# Encoding used by "auto" when tiktoken is installed
+DEFAULT_ENCODING = "cl100k_base"
+
+# Strings longer than this are counted without memoization
+MEMO_MAX_CHARS = 8192
+
+_CJK = (
+    "\u1100-\u11ff\u2e80-\u2fdf\u3000-\u30ff\u3100-\u31ff\u3400-\u4dbf"
+    "\u4e00-\u9fff\ua960-\ua97f\uac00-\ud7ff\uf900-\ufaff\ufe30-\ufe4f\uff00-\uffef"
+)
+_PUNCT = r"!-/:-@\[-`{-~"
+
+# One match per estimated token, in the order BPE pre-tokenizers split text
+_PIECE = re.compile(
+    f"[{_CJK}]"                          # CJK: one character per token
+    f"|[ {_PUNCT}]?[A-Za-z]{{1,12}}"     # word with its leading space or symbol
+    r"|[0-9]{1,3}"                       # digits, in groups of three
+    "|[\u00c0-\u1fff]{1,3}"              # other alphabets
+    f"| ?[{_PUNCT}]{{1,2}}"              # punctuation runs such as '":'
+    r"|\s+"
+    r"|.",                               # anything else (emoji, symbols)
+    re.S,
+)
+
+
+def _estimate(text: str) -> int:
+    return _PIECE.subn("", text)[1]
+
+
+_encoder: Optional[Measure] = None
+_name = "estimate"
+_configured = False
+
+
+def _load_tiktoken(encoding: str) -> Optional[Measure]:
+    try:
+        import tiktoken
+
+        encode = tiktoken.get_encoding(encoding).encode
+    except Exception as e:  # not installed, unknown encoding or download failure
+        logger.debug(f"tiktoken encoding {encoding!r} unavailable: {e}")
+        return None
+    return lambda text: len(encode(text, disallowed_special=()))
+
+
+def set_tokenizer(name: str) -> str:
+    """Select the token counter and return the one in use.
+
+    Args:
+        name: "auto", "estimate", or a tiktoken encoding name
+
+    Returns:
+        "estimate" or "tiktoken:<encoding>"
+    """
+    global _encoder, _name, _configured
+    _configured = True
+    name = (name or "auto").strip().lower()
+    encoder = None
+    if name != "estimate":
+        encoding = DEFAULT_ENCODING if name == "auto" else name
+        encoder = _load_tiktoken(encoding)
+        if encoder is None and name != "auto":
+            logger.warning(f"Tokenizer {name!r} unavailable; using the built-in estimate")
+    _encoder = encoder
+    _name = f"tiktoken:{DEFAULT_ENCODING if name == 'auto' else name}" if encoder else "estimate"
+    _memo.cache_clear()
+    return _name
+
+
+def tokenizer_name() -> str:
+    """Name of the token counter in use (configured from GITHUB_TOKENIZER)."""
+    if not _configured:
+        set_tokenizer(os.getenv("GITHUB_TOKENIZER", "auto"))
+    return _name
+
+
+def _count(text: str) -> int:
+    if not _configured:
+        tokenizer_name()
+    return _encoder(text) if _encoder is not None else _estimate(text)
+
+
+@lru_cache(maxsize=4096)
+def _memo(text: str) -> int:
+    return _count(text)
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in ``text`` (memoized for strings up to MEMO_MAX_CHARS)."""
+    if len(text) <= MEMO_MAX_CHARS:
+        return _memo(text)
+    return _count(text)
+
+
+def fit_prefix(text: str, limit: int, measure: Measure = count_tokens) -> int:
+    """Length of the longest prefix of ``text`` whose size is at most ``limit``."""
+    if limit <= 0:
+        return 0
+    if measure is len:
+        return min(len(text), limit)
+    if measure(text) <= limit:
+        return len(text)
+    # Prefixes are only measured once each, so skip the memo
+    if measure is count_tokens:
+        measure = _count
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if measure(text[:middle]) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def output_limit() -> int:
+    """Token budget of one response (GITHUB_OUTPUT_TOKEN_LIMIT)."""
+    limit = env_int("GITHUB_OUTPUT_TOKEN_LIMIT", TOKEN_LIMIT)
+    return limit if limit > 0 else TOKEN_LIMIT
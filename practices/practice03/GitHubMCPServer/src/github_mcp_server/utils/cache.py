@@ -1,44 +1,302 @@
-"""Simple optional in-memory cache utilities.
+"""Bounded in-memory cache for GitHub MCP Server.
 
-This module provides a lightweight, process-local cache with TTL support.
-It's optional: tools may choose to use it, but the server works fine without it.
+This module provides a process-local cache with TTL support, O(1) LRU
+eviction, a maximum entry count and an approximate memory budget. Expired
+entries are removed lazily on read and by a periodic sweeper task running on
+the server's event loop, so one-off results do not accumulate over time.
+
+Keys are grouped into namespaces by their prefix (``"etag:..."`` belongs to
+the ``etag`` namespace); hits, misses, evictions and bytes are tracked per
+namespace. The module-level ``cache_get`` / ``cache_set`` / ``cache_clear``
+helpers operate on the shared default cache.
+
+An engine may be backed by a ``SharedCache`` (see ``shared_state``) that
+other server processes use too: local misses fall back to it and writes go
+through to it. Async code reads with ``aget`` / ``cache_aget``, which query
+the shared tier in a worker thread instead of on the event loop.
 """
 
+import sys
 import time
-from typing import Any, Optional
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .shared_state import SharedCache
+
+from .env import env_int
+
+logger = logging.getLogger("github-mcp-server")
+
+DEFAULT_NAMESPACE = "default"
+
+
+def namespace_of(key: str) -> str:
+    """Return the namespace of a key (the part before the first ':')."""
+    head, sep, _ = key.partition(":")
+    return head if sep and head else DEFAULT_NAMESPACE
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate the memory footprint of a cached value in bytes.
+
+    Objects may define ``cache_size()`` to report their own size. Containers
+    are walked a few levels deep; anything deeper is counted shallowly.
+    """
+    size_hook = getattr(value, "cache_size", None)
+    if callable(size_hook):
+        return int(size_hook())
+    if isinstance(value, (str, bytes, bytearray)):
+        return sys.getsizeof(value)
+    size = sys.getsizeof(value)
+    if _depth >= 6:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
 
 
 class CacheEntry:
-    """Internal cache entry holding value and expiry timestamp."""
+    """Internal cache entry holding value, expiry timestamp and size."""
 
-    __slots__ = ("value", "expires_at")
+    __slots__ = ("value", "expires_at", "size", "namespace")
 
-    def __init__(self, value: Any, ttl_seconds: int):
+    def __init__(self, value: Any, ttl_seconds: int, size: int, namespace: str):
         self.value = value
         self.expires_at = time.time() + max(0, ttl_seconds)
+        self.size = size
+        self.namespace = namespace
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) >= self.expires_at
+
+
+class NamespaceStats:
+    """Counters for one cache namespace."""
+
+    __slots__ = ("hits", "shared_hits", "misses", "evictions", "expirations", "entries", "bytes")
+
+    def __init__(self):
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.entries = 0
+        self.bytes = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class CacheEngine:
+    """LRU cache bounded by entry count and approximate byte budget."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: int = 300,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._stats: Dict[str, NamespaceStats] = {}
+        self._lock = threading.RLock()
+        # Second tier shared with other processes (None: process-local only)
+        self.shared: Optional["SharedCache"] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def _ns(self, namespace: str) -> NamespaceStats:
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = NamespaceStats()
+        return stats
+
+    def _remove(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            stats = self._ns(entry.namespace)
+            stats.entries -= 1
+            stats.bytes -= entry.size
+        return entry
+
+    def _get_local(self, key: str) -> Tuple[bool, Any, NamespaceStats]:
+        """Look a key up in this process: (found, value, namespace stats)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            stats = self._ns(namespace_of(key) if entry is None else entry.namespace)
+            if entry is not None and entry.is_expired():
+                self._remove(key)
+                stats.expirations += 1
+                entry = None
+            if entry is None:
+                return False, None, stats
+            self._entries.move_to_end(key)
+            stats.hits += 1
+            return True, entry.value, stats
 
-    def is_expired(self) -> bool:
-        return time.time() >= self.expires_at
+    def _from_shared(self, key: str, found: Optional[Tuple[Any, float]], stats: NamespaceStats) -> Optional[Any]:
+        with self._lock:
+            if found is None:
+                stats.misses += 1
+                return None
+            value, expires_at = found
+            self._store(key, value, expires_at - time.time())
+            stats.hits += 1
+            stats.shared_hits += 1
+            return value
 
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value if present and not expired (marks it recently used).
 
-_CACHE: dict[str, CacheEntry] = {}
+        A local miss reads the shared tier in the calling thread; code running
+        on the event loop uses ``aget`` instead.
+        """
+        found, value, stats = self._get_local(key)
+        if found:
+            return value
+        shared = self.shared
+        return self._from_shared(key, shared.get(key) if shared is not None else None, stats)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """Like ``get``, but the shared tier is read in a worker thread."""
+        found, value, stats = self._get_local(key)
+        if found:
+            return value
+        shared = self.shared
+        return self._from_shared(key, await asyncio.to_thread(shared.get, key) if shared is not None else None, stats)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        """Store a value, evicting least recently used entries if over budget."""
+        ttl = self.default_ttl if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            stored = self._store(key, value, ttl)
+        if stored and self.shared is not None:
+            self.shared.set(key, value, ttl)
+
+    def _store(self, key: str, value: Any, ttl: float) -> bool:
+        size = estimate_size(value) + sys.getsizeof(key)
+        namespace = namespace_of(key)
+        self._remove(key)
+        if size > self.max_bytes:
+            # Larger than the whole budget: never cacheable
+            self._ns(namespace).evictions += 1
+            return False
+        entry = CacheEntry(value, ttl, size, namespace)
+        self._entries[key] = entry
+        self._bytes += size
+        stats = self._ns(namespace)
+        stats.entries += 1
+        stats.bytes += size
+        self._evict()
+        return True
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            stats = self._ns(entry.namespace)
+            stats.entries -= 1
+            stats.bytes -= entry.size
+            stats.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        """Remove a single key. Returns True if it was present."""
+        if self.shared is not None:
+            self.shared.delete(key)
+        with self._lock:
+            return self._remove(key) is not None
+
+    def clear(self, prefix: Optional[str] = None) -> int:
+        """Clear all entries, or only keys starting with ``prefix``."""
+        if self.shared is not None:
+            self.shared.clear(prefix)
+        with self._lock:
+            if prefix is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                for stats in self._stats.values():
+                    stats.entries = 0
+                    stats.bytes = 0
+                return removed
+            keys = [k for k in self._entries if k.startswith(prefix)]
+            for k in keys:
+                self._remove(k)
+            return len(keys)
+
+    def sweep(self) -> int:
+        """Remove all expired entries. Returns the number removed locally.
+
+        A shared tier is swept too, and trimmed to the same byte budget.
+        """
+        if self.shared is not None:
+            self.shared.sweep(self.max_bytes)
+        now = time.time()
+        with self._lock:
+            expired = [k for k, e in self._entries.items() if e.is_expired(now)]
+            for k in expired:
+                entry = self._remove(k)
+                if entry is not None:
+                    self._ns(entry.namespace).expirations += 1
+            return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return overall and per-namespace statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "namespaces": {name: s.as_dict() for name, s in self._stats.items()},
+            }
+
+
+_CACHE = CacheEngine(
+    max_entries=env_int("CACHE_MAX_ENTRIES", 10000),
+    max_bytes=env_int("CACHE_MAX_BYTES", 64 * 1024 * 1024),
+    default_ttl=env_int("CACHE_TTL", 300),
+)
+
+_sweeper_task: Optional[asyncio.Task] = None
+
+
+def get_cache() -> CacheEngine:
+    """Return the shared default cache engine."""
+    return _CACHE
 
 
 def cache_get(key: str) -> Optional[Any]:
     """Get a value from cache if present and not expired."""
-    entry = _CACHE.get(key)
-    if not entry:
-        return None
-    if entry.is_expired():
-        # Remove expired entry
-        _CACHE.pop(key, None)
-        return None
-    return entry.value
+    return _CACHE.get(key)
+
 
+async def cache_aget(key: str) -> Optional[Any]:
+    """Get a value from cache, reading the shared tier off the event loop."""
+    return await _CACHE.aget(key)
 
-def cache_set(key: str, value: Any, ttl_seconds: int = 300) -> None:
-    """Set a value in cache with TTL (default 5 minutes)."""
-    _CACHE[key] = CacheEntry(value, ttl_seconds)
+
+def cache_set(key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+    """Set a value in cache with TTL (default CACHE_TTL, 5 minutes)."""
+    _CACHE.set(key, value, ttl_seconds)
 
 
 def cache_clear(prefix: Optional[str] = None) -> int:
@@ -47,14 +305,56 @@ def cache_clear(prefix: Optional[str] = None) -> int:
     If prefix is provided, clears keys starting with the prefix.
     Returns the number of entries removed.
     """
-    if not _CACHE:
-        return 0
-    if prefix is None:
-        removed = len(_CACHE)
-        _CACHE.clear()
-        return removed
-
-    keys = [k for k in _CACHE.keys() if k.startswith(prefix)]
-    for k in keys:
-        _CACHE.pop(k, None)
-    return len(keys)
\ No newline at end of file
+    return _CACHE.clear(prefix)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Return statistics for the shared cache."""
+    return _CACHE.stats()
+
+
+async def _sweep_forever(cache: CacheEngine, interval: float, also: Sequence[Callable[[], Any]]) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        # A failing sweep must not stop the sweeper: expired entries would
+        # then pile up until the process restarts
+        try:
+            removed = cache.sweep()
+            if removed:
+                logger.debug(f"Cache sweeper removed {removed} expired entries")
+        except Exception:
+            logger.exception("Cache sweep failed")
+        for sweep in also:
+            try:
+                sweep()
+            except Exception:
+                logger.exception("Periodic sweep failed")
+
+
+def start_sweeper(interval: Optional[float] = None, also: Sequence[Callable[[], Any]] = ()) -> asyncio.Task:
+    """Start the periodic expiry sweeper on the running event loop.
+
+    Args:
+        interval: Seconds between sweeps (default CACHE_SWEEP_INTERVAL)
+        also: Further sweep functions to run on each tick (e.g. the result store's)
+    """
+    global _sweeper_task
+    if _sweeper_task is not None and not _sweeper_task.done():
+        return _sweeper_task
+    if interval is None:
+        interval = env_int("CACHE_SWEEP_INTERVAL", 60)
+    _sweeper_task = asyncio.get_running_loop().create_task(_sweep_forever(_CACHE, max(1, interval), tuple(also)))
+    return _sweeper_task
+
+
+async def stop_sweeper() -> None:
+    """Stop the expiry sweeper if it is running."""
+    global _sweeper_task
+    task, _sweeper_task = _sweeper_task, None
+    if task is None or task.done():
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
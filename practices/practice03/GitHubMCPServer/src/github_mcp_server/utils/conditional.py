@@ -0,0 +1,181 @@
+"""Conditional request (ETag / Last-Modified) support for GitHub GETs.
+
+GitHub does not count ``304 Not Modified`` responses against the rate limit.
+For every successful GET that carries validators we remember the ``ETag`` /
+``Last-Modified`` headers together with the response body, keyed by
+(endpoint, params, accept, credentials). Repeat calls send ``If-None-Match`` /
+``If-Modified-Since`` and, on 304, the stored body is served instead.
+
+Entries live in the shared cache (``utils/cache.py``) under the ``etag:``
+prefix. The body is kept as the raw response bytes, so every caller parses
+its own copy and cannot mutate what is cached.
+"""
+
+import json
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .cache import cache_aget, cache_set
+from .env import env_bool, env_int
+
+
+logger = logging.getLogger("github-mcp-server")
+
+CACHE_PREFIX = "etag:"
+
+# Response headers worth replaying when a stored body is served
+_REPLAYED_HEADERS = ("content-type", "link", "etag", "last-modified")
+
+
+def conditional_requests_enabled() -> bool:
+    """Whether conditional requests are enabled (GITHUB_CONDITIONAL_REQUESTS)."""
+    return env_bool("GITHUB_CONDITIONAL_REQUESTS", True)
+
+
+def _entry_ttl() -> int:
+    return env_int("GITHUB_ETAG_TTL", 3600)
+
+
+class ConditionalEntry:
+    """Stored validators and body for one request key."""
+
+    __slots__ = ("etag", "last_modified", "content", "headers")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], content: bytes, headers: Dict[str, str]):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content = content
+        self.headers = headers
+
+    def cache_size(self) -> int:
+        """Approximate size in bytes (used by the cache's memory budget)."""
+        return (
+            len(self.content)
+            + len(self.etag or "")
+            + len(self.last_modified or "")
+            + sum(len(k) + len(v) for k, v in self.headers.items())
+            + 200
+        )
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable state (the body stays bytes; see ``shared_state``)."""
+        return {
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "content": self.content,
+            "headers": self.headers,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "ConditionalEntry":
+        return cls(state["etag"], state["last_modified"], state["content"], state["headers"])
+
+    def validator_headers(self) -> Dict[str, str]:
+        """Headers that turn the next request into a conditional one."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self, not_modified: httpx.Response) -> httpx.Response:
+        """Build a 200 response from the stored body and the fresh 304 headers."""
+        headers = dict(self.headers)
+        # Rate limit headers etc. come from the live 304 response
+        for name, value in not_modified.headers.items():
+            if name.lower() not in ("content-length", "content-encoding", "transfer-encoding"):
+                headers[name] = value
+        return httpx.Response(
+            200,
+            headers=headers,
+            content=self.content,
+            request=not_modified.request,
+        )
+
+
+class ConditionalStats:
+    """Counters describing how often GETs were revalidated vs fully fetched."""
+
+    __slots__ = ("revalidated", "fetched", "stored")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.revalidated = 0
+        self.fetched = 0
+        self.stored = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.revalidated + self.fetched
+        return {
+            "requests": total,
+            "revalidated": self.revalidated,
+            "fetched": self.fetched,
+            "stored": self.stored,
+            "revalidation_ratio": round(self.revalidated / total, 4) if total else 0.0,
+        }
+
+
+_stats = ConditionalStats()
+
+
+def get_conditional_stats() -> Dict[str, Any]:
+    """Return revalidation statistics for conditional GETs."""
+    return _stats.as_dict()
+
+
+def request_key(
+    endpoint: str,
+    params: Optional[Dict[str, Any]],
+    accept: str,
+    credentials: Optional[str],
+) -> str:
+    """Build the cache key for a GET request.
+
+    Credentials (the token pool fingerprint) are hashed into the key so
+    responses are never shared between different credentials, and raw
+    tokens are never stored.
+    """
+    payload = json.dumps(
+        [endpoint, sorted((params or {}).items()), accept, credentials or ""],
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+    return CACHE_PREFIX + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def lookup(key: str) -> Optional[ConditionalEntry]:
+    """Return stored validators for a request key, if any."""
+    entry = await cache_aget(key)
+    return entry if isinstance(entry, ConditionalEntry) else None
+
+
+def store(key: str, response: httpx.Response) -> None:
+    """Remember validators and body of a successful response (if it has any)."""
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    if not etag and not last_modified:
+        return
+    headers = {name: response.headers[name] for name in _REPLAYED_HEADERS if name in response.headers}
+    cache_set(key, ConditionalEntry(etag, last_modified, response.content, headers), _entry_ttl())
+    _stats.stored += 1
+
+
+def record_fetch() -> None:
+    """Count a GET that returned a full body."""
+    _stats.fetched += 1
+
+
+def revalidated(key: str, entry: ConditionalEntry, not_modified: httpx.Response) -> httpx.Response:
+    """Serve the stored body for a 304 response."""
+    _stats.revalidated += 1
+    logger.debug(f"Revalidated {not_modified.request.url} (304 Not Modified)")
+    # Refresh the entry's lifetime since GitHub just confirmed it
+    cache_set(key, entry, _entry_ttl())
+    return entry.to_response(not_modified)
@@ -0,0 +1,412 @@
+"""Pull request diffs parsed into a per-file hunk index.
+
+The changes of a pull request are read either from ``/pulls/{n}/files``
+(paginated; GitHub omits the patch of very large files and lists at most
+3000 files) or as the unified diff of the ``.diff`` media type, streamed and
+parsed line by line without holding the raw response. Either way the result
+is a ``DiffIndex``: one record per file (path, status, line counts) with its
+hunks, each hunk an ``@@`` range plus offsets into a single shared patch
+text, so any file or hunk window can be sliced out without re-parsing.
+
+A streamed diff is read up to ``GITHUB_DIFF_MAX_BYTES``; the index is then
+marked ``truncated``. Parsed indexes are immutable for a given head and base
+SHA and are cached under that key (and the credentials that read them).
+"""
+
+import re
+import codecs
+from typing import Any, Dict, List, Optional
+
+from . import json_codec
+from .api_client import stream_github_request, to_mcp_error
+from .budget import Measure
+from .cache import cache_aget, cache_set
+from .env import env_int
+from .pagination import paginate
+from .token_pool import credential_scope
+
+
+# Accept header returning a pull request as a unified diff
+DIFF_ACCEPT = "application/vnd.github.diff"
+
+DIFF_CACHE_PREFIX = "diff:"
+
+# Keyed by SHAs, so entries never go stale; the TTL only bounds memory use
+DIFF_CACHE_TTL = 86400
+
+# GitHub lists at most this many files of a pull request
+MAX_FILES = 3000
+
+# Indentation and separators a hunk item gains inside a window payload
+HUNK_OVERHEAD = 8
+
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@ ?(.*)$")
+
+
+def diff_max_bytes() -> int:
+    """Largest streamed diff that is read in full (GITHUB_DIFF_MAX_BYTES)."""
+    return env_int("GITHUB_DIFF_MAX_BYTES", 20 * 1024 * 1024)
+
+
+class Hunk:
+    """One ``@@`` hunk; ``start``/``end`` delimit its lines in the patch text."""
+
+    __slots__ = ("old_start", "old_lines", "new_start", "new_lines", "section", "start", "end")
+
+    def __init__(self, old_start: int, old_lines: int, new_start: int, new_lines: int, section: str, start: int):
+        self.old_start = old_start
+        self.old_lines = old_lines
+        self.new_start = new_start
+        self.new_lines = new_lines
+        self.section = section
+        self.start = start
+        self.end = start
+
+
+class DiffFile:
+    """One changed file.
+
+    ``patch_missing`` is set when GitHub did not include the file's patch
+    (the file's diff is too large for the files API).
+    """
+
+    __slots__ = ("path", "previous_path", "status", "additions", "deletions", "binary", "patch_missing", "hunks")
+
+    def __init__(self, path: str, previous_path: Optional[str] = None, status: str = "modified"):
+        self.path = path
+        self.previous_path = previous_path
+        self.status = status
+        self.additions = 0
+        self.deletions = 0
+        self.binary = False
+        self.patch_missing = False
+        self.hunks: List[Hunk] = []
+
+
+class DiffIndex:
+    """Parsed pull request diff.
+
+    Attributes:
+        files: Changed files in diff order
+        text: Patch text of all hunks, concatenated
+        truncated: True if the diff was not read to the end
+    """
+
+    __slots__ = ("files", "text", "truncated", "_by_path")
+
+    def __init__(self, files: List[DiffFile], text: str, truncated: bool = False):
+        self.files = files
+        self.text = text
+        self.truncated = truncated
+        self._by_path: Dict[str, int] = {}
+        for position, diff_file in enumerate(files):
+            self._by_path.setdefault(diff_file.path, position)
+            if diff_file.previous_path:
+                self._by_path.setdefault(diff_file.previous_path, position)
+
+    def cache_size(self) -> int:
+        """Approximate memory footprint (used by the cache's byte budget)."""
+        return len(self.text) + sum(200 + 100 * len(f.hunks) + len(f.path) for f in self.files)
+
+    def find(self, path: str) -> Optional[DiffFile]:
+        """Look a file up by its path (or its path before a rename)."""
+        position = self._by_path.get(path.strip().strip("/"))
+        return self.files[position] if position is not None else None
+
+    def patch(self, hunk: Hunk) -> str:
+        return self.text[hunk.start:hunk.end]
+
+    def summary(self) -> Dict[str, Any]:
+        """The file index: counts per file and the ranges of their hunks."""
+        items = []
+        for diff_file in self.files:
+            entry: Dict[str, Any] = {"path": diff_file.path}
+            if diff_file.previous_path:
+                entry["previous_path"] = diff_file.previous_path
+            entry.update({
+                "status": diff_file.status,
+                "additions": diff_file.additions,
+                "deletions": diff_file.deletions,
+                "hunk_count": len(diff_file.hunks),
+            })
+            if diff_file.binary:
+                entry["binary"] = True
+            if diff_file.patch_missing:
+                entry["patch_missing"] = True
+            entry["hunks"] = [
+                {
+                    "hunk": number,
+                    "old": f"{h.old_start},{h.old_lines}",
+                    "new": f"{h.new_start},{h.new_lines}",
+                    "section": h.section,
+                }
+                for number, h in enumerate(diff_file.hunks, 1)
+            ]
+            items.append(entry)
+        summary: Dict[str, Any] = {
+            "changed_files": len(self.files),
+            "additions": sum(f.additions for f in self.files),
+            "deletions": sum(f.deletions for f in self.files),
+        }
+        if self.truncated:
+            summary["truncated_diff"] = True
+        summary["items"] = items
+        return summary
+
+    def window(
+        self,
+        diff_file: DiffFile,
+        first: int = 1,
+        count: Optional[int] = None,
+        limit: Optional[int] = None,
+        measure: Measure = len,
+    ) -> Dict[str, Any]:
+        """Hunks ``first`` (1-based) onwards of one file, with their patch text.
+
+        At most ``count`` hunks are returned and, with ``limit``, only as many
+        whole hunks as fit it as JSON (in units of ``measure``); the first
+        hunk is always returned. ``next_hunk`` is set whenever hunks are left.
+        """
+        hunks = diff_file.hunks[first - 1:] if count is None else diff_file.hunks[first - 1:first - 1 + count]
+        payload: Dict[str, Any] = {"path": diff_file.path}
+        if diff_file.previous_path:
+            payload["previous_path"] = diff_file.previous_path
+        payload.update({
+            "status": diff_file.status,
+            "additions": diff_file.additions,
+            "deletions": diff_file.deletions,
+            "hunk_count": len(diff_file.hunks),
+        })
+        items = []
+        used = measure(json_codec.dumps(payload)) if limit is not None else 0
+        for number, h in enumerate(hunks, first):
+            item = {
+                "hunk": number,
+                "old_start": h.old_start,
+                "old_lines": h.old_lines,
+                "new_start": h.new_start,
+                "new_lines": h.new_lines,
+                "patch": self.patch(h),
+            }
+            if limit is not None:
+                used += measure(json_codec.dumps(item)) + HUNK_OVERHEAD
+                if items and used > limit:
+                    break
+            items.append(item)
+        last = first - 1 + len(items)
+        if last < len(diff_file.hunks):
+            payload["next_hunk"] = last + 1
+        payload["items"] = items
+        return payload
+
+
+class DiffBuilder:
+    """Incrementally builds a ``DiffIndex`` from files and patch lines.
+
+    Args:
+        count_lines: Count added and deleted lines from the patch (when the
+            source does not report them per file)
+    """
+
+    def __init__(self, count_lines: bool = False):
+        self.files: List[DiffFile] = []
+        self._parts: List[str] = []
+        self._length = 0
+        self._file: Optional[DiffFile] = None
+        self._hunk: Optional[Hunk] = None
+        self._counting = count_lines
+
+    def start_file(self, path: str, previous_path: Optional[str] = None, status: str = "modified") -> DiffFile:
+        """Begin a file; ``add_line`` then adds its hunks."""
+        self._close_hunk()
+        self._file = DiffFile(path, previous_path, status)
+        self.files.append(self._file)
+        return self._file
+
+    def _close_hunk(self) -> None:
+        if self._hunk is not None:
+            self._hunk.end = self._length
+            self._hunk = None
+
+    def add_line(self, line: str) -> bool:
+        """Add a patch line of the current file.
+
+        Returns:
+            False if the line is neither a hunk header nor hunk content
+        """
+        if self._file is None:
+            return False
+        if line.startswith("@@"):
+            match = _HUNK_RE.match(line)
+            if match is None:
+                return False
+            self._close_hunk()
+            old_start, old_lines, new_start, new_lines, section = match.groups()
+            self._hunk = Hunk(
+                int(old_start), int(old_lines or 1), int(new_start), int(new_lines or 1), section, self._length
+            )
+            self._file.hunks.append(self._hunk)
+        elif self._hunk is None or line[:1] not in (" ", "+", "-", "\\", ""):
+            return False
+        elif self._counting:
+            if line.startswith("+"):
+                self._file.additions += 1
+            elif line.startswith("-"):
+                self._file.deletions += 1
+        self._parts.append(line)
+        self._parts.append("\n")
+        self._length += len(line) + 1
+        return True
+
+    def add_patch(self, patch: str) -> None:
+        """Add the patch of the current file (``patch`` of the files API)."""
+        for line in patch.split("\n"):
+            self.add_line(line)
+
+    def finish(self, truncated: bool = False) -> DiffIndex:
+        self._close_hunk()
+        return DiffIndex(self.files, "".join(self._parts), truncated)
+
+
+def _git_path(value: str) -> Optional[str]:
+    value = value.strip()
+    if value == "/dev/null":
+        return None
+    if value.startswith('"') and value.endswith('"'):
+        value = value[1:-1]
+    return value[2:] if value[:2] in ("a/", "b/") else value
+
+
+class UnifiedDiffParser:
+    """Feeds the lines of a ``git diff`` into a ``DiffBuilder``."""
+
+    def __init__(self, builder: DiffBuilder):
+        self.builder = builder
+        self._file: Optional[DiffFile] = None
+
+    def feed(self, line: str) -> None:
+        line = line.rstrip("\r")
+        if line.startswith("diff --git "):
+            # "diff --git a/<old> b/<new>"; refined by the headers that follow
+            old, _, new = line[len("diff --git "):].partition(" b/")
+            path = new or _git_path(old) or old
+            self._file = self.builder.start_file(path)
+            return
+        if self._file is None or self.builder.add_line(line):
+            return
+        diff_file = self._file
+        if line.startswith("new file mode"):
+            diff_file.status = "added"
+        elif line.startswith("deleted file mode"):
+            diff_file.status = "removed"
+        elif line.startswith("rename from "):
+            diff_file.previous_path, diff_file.status = line[len("rename from "):], "renamed"
+        elif line.startswith("rename to "):
+            diff_file.path = line[len("rename to "):]
+        elif line.startswith("copy from "):
+            diff_file.previous_path, diff_file.status = line[len("copy from "):], "copied"
+        elif line.startswith("copy to "):
+            diff_file.path = line[len("copy to "):]
+        elif line.startswith("Binary files ") or line == "GIT binary patch":
+            diff_file.binary = True
+        elif line.startswith("+++ "):
+            path = _git_path(line[4:])
+            if path is not None:
+                diff_file.path = path
+
+
+async def read_diff_stream(owner: str, repo: str, pull_number: int, max_bytes: Optional[int] = None) -> DiffIndex:
+    """Stream the ``.diff`` of a pull request into a ``DiffIndex``.
+
+    Raises:
+        MCPError: If the diff cannot be fetched
+    """
+    max_bytes = diff_max_bytes() if max_bytes is None else max_bytes
+    builder = DiffBuilder(count_lines=True)
+    parser = UnifiedDiffParser(builder)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    read = 0
+    truncated = False
+    try:
+        async with stream_github_request(
+            f"/repos/{owner}/{repo}/pulls/{pull_number}",
+            headers={"Accept": DIFF_ACCEPT},
+        ) as response:
+            async for chunk in response.aiter_bytes():
+                read += len(chunk)
+                if read > max_bytes:
+                    truncated = True
+                    break
+                lines = (pending + decoder.decode(chunk)).split("\n")
+                pending = lines.pop()
+                for line in lines:
+                    parser.feed(line)
+    except Exception as e:
+        raise to_mcp_error(e)
+    if not truncated:
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            parser.feed(pending)
+    return builder.finish(truncated)
+
+
+async def read_pull_files(owner: str, repo: str, pull_number: int) -> DiffIndex:
+    """Read ``/pulls/{n}/files`` (all pages) into a ``DiffIndex``.
+
+    Raises:
+        MCPError: If a page cannot be fetched
+    """
+    builder = DiffBuilder()
+    pages = paginate(f"/repos/{owner}/{repo}/pulls/{pull_number}/files", max_items=MAX_FILES)
+    try:
+        async for page in pages:
+            for entry in page.items:
+                diff_file = builder.start_file(
+                    entry.get("filename", ""), entry.get("previous_filename"), entry.get("status", "modified")
+                )
+                diff_file.additions = entry.get("additions") or 0
+                diff_file.deletions = entry.get("deletions") or 0
+                patch = entry.get("patch")
+                if patch:
+                    builder.add_patch(patch)
+                elif diff_file.additions or diff_file.deletions:
+                    # Binary files and oversized diffs come without a patch
+                    diff_file.patch_missing = True
+    finally:
+        await pages.aclose()
+    return builder.finish()
+
+
+async def get_diff_index(
+    owner: str,
+    repo: str,
+    pull_number: int,
+    head_sha: str,
+    base_sha: str,
+    source: str = "files",
+) -> DiffIndex:
+    """Return the parsed diff of a pull request at the given head and base.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        pull_number: Pull request number
+        head_sha: Head commit of the pull request
+        base_sha: Base commit of the pull request
+        source: "files" (files API) or "diff" (streamed unified diff)
+
+    Returns:
+        DiffIndex (cached per head and base SHA)
+    """
+    key = f"{DIFF_CACHE_PREFIX}{credential_scope()}:{owner}/{repo}#{pull_number}:{source}:{head_sha}:{base_sha}"
+    cached = await cache_aget(key)
+    if cached is not None:
+        return cached
+    if source == "diff":
+        index = await read_diff_stream(owner, repo, pull_number)
+    else:
+        index = await read_pull_files(owner, repo, pull_number)
+    if not index.truncated:
+        cache_set(key, index, DIFF_CACHE_TTL)
+    return index
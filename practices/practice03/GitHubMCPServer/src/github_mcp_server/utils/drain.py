@@ -0,0 +1,125 @@
+"""Graceful shutdown: drain in-flight tool calls before the server stops.
+
+``DrainMiddleware`` counts the tool calls in progress. Once draining starts,
+new calls are refused with a retryable tool error while the calls already
+running finish; shutdown then waits for them (up to ``GITHUB_DRAIN_TIMEOUT``
+seconds) before closing the HTTP client they use.
+
+Under the HTTP transport, draining starts on SIGTERM or SIGINT:
+``install_signal_handlers`` chains onto the handlers uvicorn installed, so
+uvicorn still stops accepting connections and waits for open requests,
+bounded by the same timeout.
+"""
+
+import signal
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+from .env import env_float
+
+
+logger = logging.getLogger("github-mcp-server")
+
+DEFAULT_DRAIN_TIMEOUT = 30.0
+DRAIN_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+
+def drain_timeout() -> float:
+    """Seconds shutdown waits for in-flight tool calls (GITHUB_DRAIN_TIMEOUT)."""
+    return env_float("GITHUB_DRAIN_TIMEOUT", DEFAULT_DRAIN_TIMEOUT, minimum=0.0)
+
+
+class DrainMiddleware(Middleware):
+    """Tracks in-flight tool calls and refuses new ones while draining."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.draining = False
+        self.completed = 0
+        self.refused = 0
+        self._idle: Optional[asyncio.Event] = None
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        if self.draining:
+            self.refused += 1
+            # A tool error (not a protocol error) so the client sees a retryable result
+            raise ToolError(
+                "Server is shutting down (503). "
+                "Retry the call; another server process or the restarted server will answer it."
+            )
+        self.in_flight += 1
+        if self._idle is not None:
+            self._idle.clear()
+        try:
+            return await call_next(context)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            if self.in_flight == 0 and self._idle is not None:
+                self._idle.set()
+
+    def begin(self) -> None:
+        """Start draining: refuse new tool calls from now on."""
+        if not self.draining:
+            self.draining = True
+            logger.info(f"Draining: {self.in_flight} tool call(s) in flight")
+
+    def reset(self) -> None:
+        """Accept tool calls again (a new server run in the same process)."""
+        self.draining = False
+        self._idle = None
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """Wait until no tool call is in flight. Returns False on timeout."""
+        if self.in_flight == 0:
+            return True
+        self._idle = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Drain timeout: {self.in_flight} tool call(s) still running after {timeout:.0f}s")
+            return False
+
+    def install_signal_handlers(self) -> Callable[[], None]:
+        """Start draining on SIGINT/SIGTERM, then run the previous handlers.
+
+        Returns:
+            A function restoring the previous handlers
+        """
+        if threading.current_thread() is not threading.main_thread():
+            # Signal handlers can only be installed from the main thread
+            return lambda: None
+        previous: Dict[int, Any] = {}
+
+        def handle(sig: int, frame: Any) -> None:
+            self.begin()
+            handler = previous.get(sig)
+            if callable(handler):
+                handler(sig, frame)
+            elif handler is not None:
+                # Default or ignored disposition: restore it and deliver the signal again
+                signal.signal(sig, handler)
+                signal.raise_signal(sig)
+
+        for sig in DRAIN_SIGNALS:
+            previous[sig] = signal.signal(sig, handle)
+
+        def restore() -> None:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+        return restore
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "refused": self.refused,
+            "draining": self.draining,
+        }
@@ -0,0 +1,71 @@
+"""Environment settings helpers for GitHub MCP Server.
+
+Every numeric, boolean and integer-list setting is parsed by the functions
+below so they all follow one rule: an unset or empty variable takes the
+default, and an invalid value logs a warning and takes the default as well.
+Booleans accept ``1/true/yes/on`` and ``0/false/no/off`` (case-insensitive);
+lists are comma-separated.
+"""
+
+import os
+import logging
+from typing import FrozenSet, Optional
+
+
+logger = logging.getLogger("github-mcp-server")
+
+TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+FALSE_VALUES = frozenset({"0", "false", "no", "off"})
+
+
+def _invalid(name: str, value: str, default) -> None:
+    logger.warning(f"Invalid value for {name}: {value!r}, using {default}")
+
+
+def env_int(name: str, default: int, minimum: Optional[int] = None) -> int:
+    """Integer setting, raised to ``minimum`` if given."""
+    value = os.getenv(name, "").strip()
+    result = default
+    if value:
+        try:
+            result = int(value)
+        except ValueError:
+            _invalid(name, value, default)
+    return max(minimum, result) if minimum is not None else result
+
+
+def env_float(name: str, default: float, minimum: Optional[float] = None) -> float:
+    """Float setting, raised to ``minimum`` if given."""
+    value = os.getenv(name, "").strip()
+    result = default
+    if value:
+        try:
+            result = float(value)
+        except ValueError:
+            _invalid(name, value, default)
+    return max(minimum, result) if minimum is not None else result
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """Boolean setting."""
+    value = os.getenv(name, "").strip().lower()
+    if not value:
+        return default
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    _invalid(name, value, default)
+    return default
+
+
+def env_int_set(name: str, default: FrozenSet[int]) -> FrozenSet[int]:
+    """Comma-separated set of integers (e.g. ``"500, 502,503"``)."""
+    value = os.getenv(name, "").strip()
+    if not value:
+        return default
+    try:
+        return frozenset(int(part) for part in value.split(",") if part.strip())
+    except ValueError:
+        _invalid(name, value, sorted(default))
+        return default
@@ -93,17 +93,19 @@ def handle_api_error(error: httpx.HTTPError) -> MCPError:
                 details={"status_code": 401},
                 suggestion=suggest_next_steps("authentication")
             )
-        elif response.status_code == 403:
-            # Check if it's a rate limit error
+        elif response.status_code in (403, 429):
+            # Check if it's a rate limit error (primary quota or secondary limit)
             rate_limit_remaining = response.headers.get("x-ratelimit-remaining")
-            if rate_limit_remaining == "0":
+            retry_after = response.headers.get("retry-after")
+            if rate_limit_remaining == "0" or retry_after is not None or response.status_code == 429:
                 return MCPError(
                     message="Rate limit exceeded. Please wait before making more requests.",
                     code=429,
                     details={
-                        "status_code": 403,
+                        "status_code": response.status_code,
                         "rate_limit_remaining": rate_limit_remaining,
-                        "rate_limit_reset": response.headers.get("x-ratelimit-reset")
+                        "rate_limit_reset": response.headers.get("x-ratelimit-reset"),
+                        "retry_after": retry_after
                     },
                     suggestion=suggest_next_steps("rate_limit")
                 )
@@ -0,0 +1,171 @@
+"""Fan-out search across many repositories.
+
+A search scoped to a list of repositories is split into as few queries as
+GitHub's query length limit allows: ``repo:`` qualifiers are packed into
+queries first-fit, longest first, next to the search terms. The queries run
+concurrently (at most ``GITHUB_SEARCH_CONCURRENCY`` at a time; the
+rate-limit scheduler paces them within the search quota), and their results
+are merged into one search body: duplicates are dropped and the items are
+re-ranked by the requested sort key. Each query fetches up to ``limit``
+items, so the merged top ``limit`` is the same as a single search would
+return. A failing query is reported under ``errors`` instead of failing the
+whole search, unless every query fails.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
+
+from .pagination import collect_search_results
+from .env import env_int
+from .errors import MCPError
+
+
+# Maximum length of a search query (``q``), qualifiers included
+MAX_QUERY_LENGTH = 256
+
+# Item field ranking the merged results, per sort key
+SORT_FIELDS = {
+    "best-match": "score",
+    "created": "created_at",
+    "updated": "updated_at",
+    "comments": "comments",
+}
+
+
+def pack_qualifiers(query: str, qualifiers: Sequence[str], max_length: int = MAX_QUERY_LENGTH) -> List[str]:
+    """Split qualifiers over the fewest queries that fit ``max_length``.
+
+    Args:
+        query: Search terms shared by every query
+        qualifiers: Qualifiers to distribute (e.g. ``repo:owner/name``)
+        max_length: Maximum length of one query
+
+    Returns:
+        Queries, each the search terms followed by a group of qualifiers
+
+    Raises:
+        MCPError: If the search terms and a single qualifier do not fit
+    """
+    base = query.strip()
+    # First fit decreasing: place long qualifiers first, each in the first
+    # query with room left
+    bins: List[List[str]] = []
+    lengths: List[int] = []
+    for qualifier in sorted(dict.fromkeys(qualifiers), key=len, reverse=True):
+        cost = len(qualifier) + 1
+        if len(base) + cost > max_length:
+            raise MCPError(
+                message=f"Search query too long to scope to '{qualifier}'",
+                code=400,
+                details={"query": query, "max_length": max_length},
+                suggestion="Shorten the search terms.",
+            )
+        for index, used in enumerate(lengths):
+            if used + cost <= max_length:
+                bins[index].append(qualifier)
+                lengths[index] += cost
+                break
+        else:
+            bins.append([qualifier])
+            lengths.append(len(base) + cost)
+    return [" ".join([base, *group]).strip() for group in bins]
+
+
+def _identity(item: Dict[str, Any]) -> Any:
+    return item.get("html_url") or item.get("url") or item.get("id")
+
+
+def merge_results(
+    results: Sequence[Dict[str, Any]],
+    sort: str = "best-match",
+    order: str = "desc",
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Merge search bodies, dropping duplicates and re-ranking the items.
+
+    Args:
+        results: Search bodies (``total_count``, ``incomplete_results``, ``items``)
+        sort: Sort key (see ``SORT_FIELDS``)
+        order: "asc" or "desc"
+        limit: Maximum number of merged items
+
+    Returns:
+        One search body with the merged items
+    """
+    field = SORT_FIELDS.get(sort, "score")
+    seen = set()
+    items: List[Dict[str, Any]] = []
+    for result in results:
+        for item in result.get("items", []):
+            identity = _identity(item)
+            if identity is not None and identity in seen:
+                continue
+            seen.add(identity)
+            items.append(item)
+    # Items without the sort field rank last in either order
+    present = [item for item in items if item.get(field) is not None]
+    missing = [item for item in items if item.get(field) is None]
+    present.sort(key=lambda item: item[field], reverse=order == "desc")
+    items = present + missing
+    return {
+        "total_count": sum(result.get("total_count") or 0 for result in results),
+        "incomplete_results": any(result.get("incomplete_results") for result in results),
+        "items": items if limit is None else items[:limit],
+    }
+
+
+async def fan_out_search(
+    endpoint: str,
+    queries: Sequence[str],
+    params: Dict[str, Any],
+    limit: int,
+    sort: str = "best-match",
+    order: str = "desc",
+) -> Dict[str, Any]:
+    """Run search queries concurrently and merge their results.
+
+    Args:
+        endpoint: Search endpoint (e.g., "/search/issues")
+        queries: Values of ``q``, one search per query
+        params: Other search parameters (``sort``, ``order``)
+        limit: Maximum number of items, per query and merged
+        sort: Sort key used to re-rank the merged items
+        order: "asc" or "desc"
+
+    Returns:
+        Merged search body with ``queries`` (the number of searches run) and,
+        if some failed, ``errors``
+
+    Raises:
+        MCPError: If every query failed
+    """
+    semaphore = asyncio.Semaphore(env_int("GITHUB_SEARCH_CONCURRENCY", 4, minimum=1))
+
+    async def search(query: str) -> Dict[str, Any]:
+        async with semaphore:
+            # Every item is needed to re-rank, so no budget applies here
+            body, _ = await collect_search_results(endpoint, {**params, "q": query}, limit)
+            return body
+
+    outcomes = await asyncio.gather(*(search(query) for query in queries), return_exceptions=True)
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+            raise outcome
+    results = [outcome for outcome in outcomes if not isinstance(outcome, BaseException)]
+    failures = [(query, outcome) for query, outcome in zip(queries, outcomes) if isinstance(outcome, BaseException)]
+    if failures and not results:
+        error = failures[0][1]
+        raise error if isinstance(error, MCPError) else MCPError(message=str(error), code=500)
+
+    merged = merge_results(results, sort, order, limit)
+    merged["queries"] = len(queries)
+    if failures:
+        merged["errors"] = [
+            {
+                "query": query,
+                "code": getattr(error, "code", 500),
+                "message": getattr(error, "message", str(error)),
+            }
+            for query, error in failures
+        ]
+    return merged
@@ -1,17 +1,47 @@
 """Response formatting utilities for GitHub MCP Server."""
 
-import json
-from typing import Any, Literal, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Literal, Dict, List, Optional, Sequence
 
+from .budget import Measure, count_tokens, fit_prefix, output_limit
+from .env import env_bool
+from .projection import IDENTITY, Projection, select_fields
+from .result_store import continuation
+from .serializer import TAIL_RESERVE, encode_json
+from .tables import TableSchema
 
-# Character limit for responses (~25k tokens)
+if TYPE_CHECKING:
+    from .pagination import Resume
+
+
+# Bound on raw content fetched for one response (file bytes, pages of
+# results); the formatted response itself is budgeted in tokens
 CHARACTER_LIMIT = 25000 * 4
 
 
+def json_compact() -> bool:
+    """Whether JSON responses omit indentation (GITHUB_JSON_COMPACT)."""
+    return env_bool("GITHUB_JSON_COMPACT", False)
+
+
+def response_projection(
+    detail: Literal["concise", "detailed"],
+    projection: Optional[Projection] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> Optional[Projection]:
+    """The projection ``format_response`` applies (None for whole items)."""
+    if fields:
+        return Projection(fields)
+    return projection if detail == "concise" else None
+
+
 def format_response(
     data: Any,
     format: Literal["json", "markdown"] = "json",
-    detail: Literal["concise", "detailed"] = "concise"
+    detail: Literal["concise", "detailed"] = "concise",
+    projection: Optional[Projection] = None,
+    fields: Optional[Sequence[str]] = None,
+    table: Optional[TableSchema] = None,
+    resume: Optional["Resume"] = None,
 ) -> str:
     """Format response data based on requested format and detail level.
     
@@ -19,42 +49,97 @@ def format_response(
         data: Raw data to format
         format: Output format ("json" or "markdown")
         detail: Detail level ("concise" for summary, "detailed" for full info)
+        projection: The tool's concise field set, applied in concise mode
+            (``IDENTITY`` if not given)
+        fields: Caller-selected fields; override ``detail`` when given
+        table: The tool's Markdown columns for lists of items
+        resume: Where the listing continues if it stopped at the output budget
         
     Returns:
         Formatted response string
     """
-    if format == "json":
-        formatted = format_json(data, detail)
-    else:  # markdown
-        formatted = format_markdown(data, detail)
+    # Projected data already holds only the selected fields: render it in full
+    if fields:
+        data = select_fields(data, fields)
+        table = TableSchema.from_keys(fields)
+    elif detail == "concise":
+        data = (projection or IDENTITY).apply(data)
     
-    # Apply character limit
-    return truncate_response(formatted, CHARACTER_LIMIT)
+    # Both encoders stop at the token budget instead of slicing the
+    # finished output; truncation is a last resort for oversized Markdown.
+    # Whatever is left out stays available to fetch_more via next_cursor.
+    limit = output_limit()
+    state = resume.to_state() if resume is not None else None
+    if format == "json":
+        return format_json(data, limit, resume=state)
+    formatted = format_markdown(
+        data,
+        "detailed",
+        limit,
+        cursor=continuation("items", data, "markdown", table, state),
+        table=table,
+        measure=count_tokens,
+        more=resume is not None,
+    )
+    return truncate_response(
+        formatted,
+        limit,
+        cursor=continuation("text", formatted, "markdown"),
+        measure=count_tokens,
+    )
 
 
-def format_json(data: Any, detail: str) -> str:
-    """Format data as JSON.
+def format_json(
+    data: Any,
+    max_size: Optional[int] = None,
+    measure: Measure = count_tokens,
+    resume: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Format data as JSON within a budget.
+    
+    Items that do not fit are left out and reported (``_truncation`` with
+    ``omitted_count`` and ``next_cursor``); the output is always valid JSON.
+    Output is indented unless ``GITHUB_JSON_COMPACT`` is set.
     
     Args:
-        data: Data to format
-        detail: Detail level
+        data: Data to format (already projected)
+        max_size: Budget, in units of ``measure`` (default: the output token limit)
+        measure: Size function (tokens by default)
+        resume: State of the ``Resume`` continuing the listing after ``data``
         
     Returns:
         JSON formatted string
     """
-    if detail == "concise":
-        concise_data = extract_concise_data(data)
-        return json.dumps(concise_data, indent=2, ensure_ascii=False)
-    else:
-        return json.dumps(data, indent=2, ensure_ascii=False)
+    return encode_json(
+        data,
+        output_limit() if max_size is None else max_size,
+        measure=measure,
+        cursor=continuation("items", data, "json", resume=resume),
+        clip_cursor=lambda original, kept: continuation("text", original, "json")(kept),
+        compact=json_compact(),
+        more=resume is not None,
+    ).text
 
 
-def format_markdown(data: Any, detail: str) -> str:
+def format_markdown(
+    data: Any,
+    detail: str,
+    max_size: Optional[int] = None,
+    cursor: Optional[Callable[[int], str]] = None,
+    table: Optional[TableSchema] = None,
+    measure: Measure = len,
+    more: bool = False,
+) -> str:
     """Format data as Markdown.
     
     Args:
         data: Data to format
         detail: Detail level
+        max_size: Budget for tables of items, in units of ``measure`` (None for no limit)
+        cursor: Maps the offset of the first omitted item to a cursor string
+        table: Columns for the top-level list or ``items``
+        measure: Size function (``len`` counts characters)
+        more: More items follow the top-level list or ``items``
         
     Returns:
         Markdown formatted string
@@ -62,7 +147,7 @@ def format_markdown(data: Any, detail: str) -> str:
     if detail == "concise":
         return format_markdown_concise(data)
     else:
-        return format_markdown_detailed(data)
+        return format_markdown_detailed(data, max_size, cursor, table, measure, more)
 
 
 def format_markdown_concise(data: Any) -> str:
@@ -82,19 +167,31 @@ def format_markdown_concise(data: Any) -> str:
         return str(data)
 
 
-def format_markdown_detailed(data: Any) -> str:
+def format_markdown_detailed(
+    data: Any,
+    max_size: Optional[int] = None,
+    cursor: Optional[Callable[[int], str]] = None,
+    table: Optional[TableSchema] = None,
+    measure: Measure = len,
+    more: bool = False,
+) -> str:
     """Format data as detailed Markdown.
     
     Args:
         data: Data to format
+        max_size: Budget for tables of items, in units of ``measure`` (None for no limit)
+        cursor: Cursor factory for the top-level list or ``items``
+        table: Columns for the top-level list or ``items``
+        measure: Size function (``len`` counts characters)
+        more: More items follow the top-level list or ``items``
         
     Returns:
         Detailed Markdown string
     """
     if isinstance(data, dict):
-        return format_dict_markdown_detailed(data)
+        return format_dict_markdown_detailed(data, max_size, cursor, table, measure, more)
     elif isinstance(data, list):
-        return format_list_markdown_detailed(data)
+        return format_list_markdown_detailed(data, max_size, cursor, table, measure, more)
     else:
         return f"```\n{str(data)}\n```"
 
@@ -121,11 +218,23 @@ def format_dict_markdown_concise(data: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def format_dict_markdown_detailed(data: Dict[str, Any]) -> str:
+def format_dict_markdown_detailed(
+    data: Dict[str, Any],
+    max_size: Optional[int] = None,
+    cursor: Optional[Callable[[int], str]] = None,
+    table: Optional[TableSchema] = None,
+    measure: Measure = len,
+    more: bool = False,
+) -> str:
     """Format dictionary as detailed Markdown.
     
     Args:
         data: Dictionary to format
+        max_size: Budget for tables of items, in units of ``measure`` (None for no limit)
+        cursor: Cursor factory for the ``items`` list
+        table: Columns for the ``items`` list
+        measure: Size function (``len`` counts characters)
+        more: More items follow the ``items`` list
         
     Returns:
         Detailed Markdown with nested structures
@@ -133,13 +242,17 @@ def format_dict_markdown_detailed(data: Dict[str, Any]) -> str:
     lines = []
     
     for key, value in data.items():
+        remaining = None if max_size is None else max_size - sum(measure(line) + 2 for line in lines)
         if isinstance(value, dict):
             lines.append(f"### {key}")
-            lines.append(format_dict_markdown_detailed(value))
+            lines.append(format_dict_markdown_detailed(value, remaining, measure=measure))
         elif isinstance(value, list):
             lines.append(f"### {key} ({len(value)} items)")
             if value and isinstance(value[0], dict):
-                lines.append(format_list_markdown_detailed(value))
+                if key == "items":
+                    lines.append(format_list_markdown_detailed(value, remaining, cursor, table, measure, more))
+                else:
+                    lines.append(format_list_markdown_detailed(value, remaining, measure=measure))
             else:
                 lines.append("\n".join([f"- {item}" for item in value[:10]]))
                 if len(value) > 10:
@@ -173,11 +286,27 @@ def format_list_markdown_concise(data: List[Any]) -> str:
         return result
 
 
-def format_list_markdown_detailed(data: List[Any]) -> str:
+def format_list_markdown_detailed(
+    data: List[Any],
+    max_size: Optional[int] = None,
+    cursor: Optional[Callable[[int], str]] = None,
+    table: Optional[TableSchema] = None,
+    measure: Measure = len,
+    more: bool = False,
+) -> str:
     """Format list as detailed Markdown.
     
+    Lists of objects become a table with the given columns (by default the
+    keys of the first item); rows are added until ``max_size`` is reached
+    and omitted rows are reported with a cursor to continue from.
+    
     Args:
         data: List to format
+        max_size: Budget, in units of ``measure`` (None for no limit)
+        cursor: Maps the offset of the first omitted row to a cursor string
+        table: Table columns
+        measure: Size function (``len`` counts characters)
+        more: More items follow ``data``
         
     Returns:
         Detailed Markdown with tables
@@ -186,95 +315,41 @@ def format_list_markdown_detailed(data: List[Any]) -> str:
         return "No items found"
     
     if isinstance(data[0], dict):
-        # Create table from list of objects
-        if data:
-            keys = list(data[0].keys())
-            header = "| " + " | ".join(keys) + " |"
-            separator = "|" + "|-".join(["---"] * len(keys)) + "|"
-            rows = []
-            
-            for item in data:
-                row = "| " + " | ".join([str(item.get(key, ""))[:50] for key in keys]) + " |"
-                rows.append(row)
-            
-            return f"{header}\n{separator}\n" + "\n".join(rows)
-        else:
-            return "No items found"
+        schema = table or TableSchema.from_keys(list(data[0].keys()))
+        return schema.render(data, max_size, cursor, reserve=TAIL_RESERVE, measure=measure, more=more)
     else:
         return "\n".join([f"- {item}" for item in data])
 
 
-def extract_concise_data(data: Any) -> Any:
-    """Extract concise information from data.
-    
-    Args:
-        data: Raw data to process
-        
-    Returns:
-        Concise version of the data
-    """
-    if isinstance(data, dict):
-        return extract_concise_dict(data)
-    elif isinstance(data, list):
-        return extract_concise_list(data)
-    else:
-        return data
-
-
-def extract_concise_dict(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Extract concise information from dictionary.
-    
-    Args:
-        data: Dictionary to process
-        
-    Returns:
-        Concise dictionary
-    """
-    concise_data = {}
-    
-    for key, value in data.items():
-        if key in ["total_count", "items", "name", "full_name", "description", "html_url"]:
-            concise_data[key] = value
-        elif isinstance(value, dict):
-            concise_data[key] = extract_concise_dict(value)
-        elif isinstance(value, list):
-            concise_data[key] = extract_concise_list(value)
-    
-    return concise_data
-
-
-def extract_concise_list(data: List[Any]) -> List[Any]:
-    """Extract concise information from list.
-    
-    Args:
-        data: List to process
-        
-    Returns:
-        Concise list (first 5 items)
-    """
-    if not data:
-        return []
-    
-    if isinstance(data[0], dict):
-        return [extract_concise_dict(item) for item in data[:5]]
-    else:
-        return data[:5]
-
-
-def truncate_response(text: str, max_chars: int) -> str:
-    """Truncate response text if it exceeds character limit.
+def truncate_response(
+    text: str,
+    max_size: int,
+    cursor: Optional[Callable[[int], str]] = None,
+    measure: Measure = len,
+) -> str:
+    """Truncate response text if it exceeds the budget.
     
     Args:
         text: Text to truncate
-        max_chars: Maximum allowed characters
+        max_size: Budget, in units of ``measure``
+        cursor: Maps the number of characters kept to a continuation cursor
+        measure: Size function (``len`` counts characters)
         
     Returns:
         Truncated text with warning message
     """
-    if len(text) <= max_chars:
+    kept = fit_prefix(text, max_size, measure)
+    if kept == len(text):
         return text
     
-    truncated = text[:max_chars]
+    truncated = text[:kept]
+    if cursor is not None:
+        return f"""{truncated}
+
+... [Response truncated due to length]
+
+Call fetch_more(cursor="{cursor(kept)}") to continue reading.
+"""
     return f"""{truncated}
 
 ... [Response truncated due to length]
@@ -0,0 +1,423 @@
+"""Local bare-mirror backend for repository browsing.
+
+Repositories listed in ``GITHUB_MIRROR_REPOS`` (comma-separated
+``owner/repo``) are kept as bare mirrors under ``GITHUB_MIRROR_DIR``. While
+the server runs, a background task clones missing mirrors and fetches every
+``GITHUB_MIRROR_FETCH_INTERVAL`` seconds. ``list_repository_contents`` and
+``get_file_content`` read trees and blobs from a mirror through long-lived
+``git cat-file --batch`` / ``--batch-check`` processes, with no API quota
+spent. Repositories without a (ready) mirror, and refs or paths a mirror does
+not know yet, fall back to the REST API.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .env import env_float
+from .trees import TreeIndex, may_contain
+
+
+logger = logging.getLogger("github-mcp-server")
+
+DEFAULT_URL_TEMPLATE = "https://github.com/{owner}/{repo}.git"
+
+# Tree entry modes
+_TREE_MODE = b"40000"
+_SUBMODULE_MODE = b"160000"
+
+# (sha, type, size, data) as reported by cat-file
+ObjectInfo = Tuple[str, str, int, Optional[bytes]]
+
+
+def _git_env() -> Dict[str, str]:
+    # Never block on credential prompts in a background process
+    return {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+
+
+async def run_git(*args: str, git_dir: Optional[Path] = None) -> str:
+    """Run a git command and return its stdout.
+
+    Raises:
+        RuntimeError: If git exits with a non-zero status
+    """
+    command = ["git"]
+    if git_dir is not None:
+        command += ["--git-dir", str(git_dir)]
+    process = await asyncio.create_subprocess_exec(
+        *command, *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=_git_env(),
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)} failed: {stderr.decode(errors='replace').strip()}")
+    return stdout.decode("utf-8", errors="replace")
+
+
+class CatFile:
+    """A long-lived ``git cat-file --batch`` (or ``--batch-check``) process.
+
+    Requests are pipelined: all object names of a query are written while
+    the answers are read, so listing thousands of entries costs one round
+    trip rather than thousands. The process is restarted when it exits or
+    when it is used from a different event loop.
+    """
+
+    def __init__(self, git_dir: Path, with_contents: bool = True):
+        self.git_dir = git_dir
+        self.with_contents = with_contents
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _ensure(self) -> asyncio.subprocess.Process:
+        loop = asyncio.get_running_loop()
+        if self._process is None or self._process.returncode is not None or self._loop is not loop:
+            self._discard()
+            self._process = await asyncio.create_subprocess_exec(
+                "git", "--git-dir", str(self.git_dir), "cat-file",
+                "--batch" if self.with_contents else "--batch-check",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                env=_git_env(),
+            )
+            self._loop = loop
+        return self._process
+
+    def _lock_for_loop(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def query(self, names: List[str]) -> List[Optional[ObjectInfo]]:
+        """Look up objects by name (``<sha>``, ``<ref>:<path>``, ...).
+
+        Returns:
+            One entry per name: (sha, type, size, data) or None if missing.
+            ``data`` is None for ``--batch-check`` processes.
+        """
+        if any("\n" in name for name in names):
+            raise ValueError("Object names cannot contain newlines")
+        async with self._lock_for_loop():
+            process = await self._ensure()
+
+            async def write_all():
+                for name in names:
+                    process.stdin.write(name.encode("utf-8") + b"\n")
+                    await process.stdin.drain()
+
+            writer = asyncio.ensure_future(write_all())
+            try:
+                results = [await self._read_one(process) for _ in names]
+                await writer
+            except BaseException:
+                writer.cancel()
+                # The protocol is out of sync; start over next time
+                self._discard()
+                raise
+            return results
+
+    async def _read_one(self, process: asyncio.subprocess.Process) -> Optional[ObjectInfo]:
+        header = await process.stdout.readline()
+        if not header:
+            raise RuntimeError("git cat-file exited unexpectedly")
+        parts = header.decode("utf-8", errors="replace").rstrip("\n").split(" ")
+        if len(parts) != 3 or parts[-1] in ("missing", "ambiguous"):
+            return None
+        sha, kind, size = parts[0], parts[1], int(parts[2])
+        data = None
+        if self.with_contents:
+            data = (await process.stdout.readexactly(size + 1))[:-1]
+        return sha, kind, size, data
+
+    def _discard(self) -> None:
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            try:
+                process.stdin.close()
+                process.kill()
+            except (ProcessLookupError, RuntimeError):
+                pass
+
+    async def close(self) -> None:
+        """Stop the process once the query in progress (if any) has finished."""
+        async with self._lock_for_loop():
+            process, self._process = self._process, None
+            if process is None or process.returncode is not None:
+                return
+            try:
+                process.stdin.close()
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except (asyncio.TimeoutError, RuntimeError):
+                process.kill()
+
+
+async def read_blob_prefix(git_dir: Path, sha: str, max_bytes: int) -> bytes:
+    """Read the first ``max_bytes`` bytes of a blob without loading all of it."""
+    process = await asyncio.create_subprocess_exec(
+        "git", "--git-dir", str(git_dir), "cat-file", "blob", sha,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        env=_git_env(),
+    )
+    try:
+        try:
+            return await process.stdout.readexactly(max_bytes)
+        except asyncio.IncompleteReadError as e:
+            return e.partial
+    finally:
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        await process.wait()
+
+
+def parse_tree(data: bytes, hash_size: int = 20) -> List[Tuple[bytes, str, str]]:
+    """Parse a raw tree object into (mode, name, sha) entries."""
+    entries = []
+    position = 0
+    while position < len(data):
+        space = data.index(b" ", position)
+        nul = data.index(b"\0", space)
+        mode = data[position:space]
+        name = data[space + 1:nul].decode("utf-8", errors="replace")
+        sha = data[nul + 1:nul + 1 + hash_size].hex()
+        entries.append((mode, name, sha))
+        position = nul + 1 + hash_size
+    return entries
+
+
+def _entry_type(mode: bytes) -> str:
+    if mode == _TREE_MODE:
+        return "tree"
+    if mode == _SUBMODULE_MODE:
+        return "commit"
+    return "blob"
+
+
+class GitMirror:
+    """A bare mirror of one repository.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        path: Directory of the bare mirror
+        url: Clone URL
+    """
+
+    def __init__(self, owner: str, repo: str, path: Path, url: str):
+        self.owner = owner
+        self.repo = repo
+        self.path = Path(path)
+        self.url = url
+        self._contents = CatFile(self.path, with_contents=True)
+        self._info = CatFile(self.path, with_contents=False)
+        self.last_fetch: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return (self.path / "HEAD").is_file()
+
+    async def sync(self) -> None:
+        """Clone the mirror if missing, otherwise fetch updates."""
+        if not self.ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            await run_git("clone", "--mirror", "--quiet", self.url, str(self.path))
+            logger.info(f"Created mirror of {self.owner}/{self.repo} at {self.path}")
+        else:
+            await run_git("fetch", "--prune", "--quiet", "origin", git_dir=self.path)
+            # Long-running cat-file processes may not see new packs
+            await self.close()
+        self.last_fetch = time.time()
+
+    def _name(self, ref: Optional[str], path: str) -> str:
+        ref = ref or "HEAD"
+        path = path.strip("/")
+        return f"{ref}:{path}" if path else f"{ref}^{{tree}}"
+
+    async def read_file(self, ref: Optional[str], path: str, max_bytes: int) -> Optional[Tuple[str, int, bytes]]:
+        """Return (blob sha, size, content) of a file, or None if unknown to the mirror.
+
+        The size is checked first: a blob over ``max_bytes`` is not loaded,
+        only its first ``max_bytes`` bytes are read.
+        """
+        (info,) = await self._info.query([self._name(ref, path)])
+        if info is None or info[1] != "blob":
+            return None
+        sha, _, size, _ = info
+        if size > max_bytes:
+            return sha, size, await read_blob_prefix(self.path, sha, max_bytes)
+        (blob,) = await self._contents.query([sha])
+        if blob is None:
+            return None
+        return sha, size, blob[3]
+
+    async def list_directory(self, ref: Optional[str], path: str) -> Optional[List[Dict[str, Any]]]:
+        """List one directory like the contents API, or None if unknown."""
+        (info,) = await self._contents.query([self._name(ref, path)])
+        if info is None or info[1] != "tree":
+            return None
+        base = path.strip("/")
+        entries = [
+            {"path": f"{base}/{name}" if base else name, "type": _entry_type(mode), "sha": sha}
+            for mode, name, sha in parse_tree(info[3], len(info[0]) // 2)
+        ]
+        await self._fill_sizes(entries)
+        kinds = {"blob": "file", "tree": "dir", "commit": "submodule"}
+        ref = ref or "HEAD"
+        return [
+            {
+                "name": e["path"].rsplit("/", 1)[-1],
+                "path": e["path"],
+                "sha": e["sha"],
+                "size": e.get("size", 0),
+                "type": kinds[e["type"]],
+                "html_url": f"https://github.com/{self.owner}/{self.repo}/"
+                            f"{'tree' if e['type'] == 'tree' else 'blob'}/{ref}/{e['path']}",
+            }
+            for e in entries
+        ]
+
+    async def tree_index(
+        self,
+        ref: Optional[str],
+        prefix: str = "",
+        max_depth: Optional[int] = None,
+    ) -> Optional[TreeIndex]:
+        """Build a ``TreeIndex`` of a ref, or None if the ref is unknown.
+
+        Only subtrees that can hold entries below ``prefix`` within
+        ``max_depth`` are read.
+        """
+        prefix = prefix.strip("/")
+        (root,) = await self._contents.query([self._name(ref, "")])
+        if root is None:
+            return None
+        entries: List[Dict[str, Any]] = []
+        level = [("", root)]
+        while level:
+            subtrees = []
+            for base, info in level:
+                for mode, name, sha in parse_tree(info[3], len(info[0]) // 2):
+                    path = f"{base}/{name}" if base else name
+                    kind = _entry_type(mode)
+                    entries.append({"path": path, "type": kind, "sha": sha})
+                    if kind == "tree" and may_contain(path, prefix, max_depth):
+                        subtrees.append((path, sha))
+            infos = await self._contents.query([sha for _, sha in subtrees]) if subtrees else []
+            level = [(path, info) for (path, _), info in zip(subtrees, infos) if info is not None]
+        await self._fill_sizes(entries)
+        return TreeIndex(entries, tree_sha=root[0])
+
+    async def _fill_sizes(self, entries: List[Dict[str, Any]]) -> None:
+        blobs = [e for e in entries if e["type"] == "blob"]
+        if not blobs:
+            return
+        infos = await self._info.query([e["sha"] for e in blobs])
+        for entry, info in zip(blobs, infos):
+            entry["size"] = info[2] if info is not None else 0
+
+    async def close(self) -> None:
+        await self._contents.close()
+        await self._info.close()
+
+
+class MirrorManager:
+    """Configured mirrors and their periodic background fetch."""
+
+    def __init__(self, mirrors: List[GitMirror], fetch_interval: float = 300.0):
+        self._mirrors = {f"{m.owner}/{m.repo}".lower(): m for m in mirrors}
+        self.fetch_interval = fetch_interval
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls) -> "MirrorManager":
+        repos = [r.strip() for r in os.getenv("GITHUB_MIRROR_REPOS", "").split(",") if r.strip()]
+        root = Path(
+            os.getenv("GITHUB_MIRROR_DIR")
+            or Path(os.getenv("GITHUB_CACHE_DIR") or Path.home() / ".cache" / "github-mcp-server") / "mirrors"
+        ).expanduser()
+        template = os.getenv("GITHUB_MIRROR_URL_TEMPLATE") or DEFAULT_URL_TEMPLATE
+        interval = env_float("GITHUB_MIRROR_FETCH_INTERVAL", 300.0)
+        mirrors = []
+        for full_name in repos:
+            if full_name.count("/") != 1:
+                logger.warning(f"Ignoring invalid GITHUB_MIRROR_REPOS entry '{full_name}'")
+                continue
+            owner, repo = full_name.split("/")
+            mirrors.append(GitMirror(
+                owner, repo, root / owner / f"{repo}.git", template.format(owner=owner, repo=repo)
+            ))
+        return cls(mirrors, fetch_interval=interval)
+
+    def __len__(self) -> int:
+        return len(self._mirrors)
+
+    def get(self, owner: str, repo: str) -> Optional[GitMirror]:
+        """Return the mirror of a repository if one is configured and cloned."""
+        mirror = self._mirrors.get(f"{owner}/{repo}".lower())
+        return mirror if mirror is not None and mirror.ready else None
+
+    async def sync_all(self) -> None:
+        """Clone or fetch every configured mirror (failures are logged)."""
+        for mirror in self._mirrors.values():
+            try:
+                await mirror.sync()
+            except Exception as e:
+                logger.warning(f"Mirror sync failed for {mirror.owner}/{mirror.repo}: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await self.sync_all()
+            await asyncio.sleep(self.fetch_interval)
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Start the background clone/fetch loop (no-op without mirrors)."""
+        if self._mirrors and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Stop the fetch loop and the cat-file processes."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        for mirror in self._mirrors.values():
+            await mirror.close()
+
+
+_manager: Optional[MirrorManager] = None
+
+
+def get_mirror_manager() -> MirrorManager:
+    """Return the process-wide mirror manager (configured from env)."""
+    global _manager
+    if _manager is None:
+        _manager = MirrorManager.from_env()
+    return _manager
+
+
+def set_mirror_manager(manager: Optional[MirrorManager]) -> None:
+    """Replace the mirror manager (None reconfigures it from env on next use)."""
+    global _manager
+    _manager = manager
+
+
+def get_mirror(owner: str, repo: str) -> Optional[GitMirror]:
+    """Return the ready mirror of a repository, if any."""
+    return get_mirror_manager().get(owner, repo)
@@ -0,0 +1,148 @@
+"""Shared HTTP client management for GitHub MCP Server.
+
+A single pooled ``httpx.AsyncClient`` is kept per process so that every tool
+invocation reuses warm TCP/TLS connections to api.github.com instead of paying
+a fresh handshake per request. The client is opened and closed by the server
+lifespan; it is also created lazily so tool functions keep working when they
+are called directly (e.g. from ``scripts/run_tool_tests.py``).
+"""
+
+import asyncio
+import logging
+import importlib.util
+from typing import Optional
+
+import httpx
+
+from .env import env_bool, env_float, env_int
+
+
+logger = logging.getLogger("github-mcp-server")
+
+
+class ClientSettings:
+    """Connection pool settings for the shared client."""
+
+    __slots__ = ("max_connections", "max_keepalive_connections", "keepalive_expiry", "http2", "timeout")
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeout: float = 30.0,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls) -> "ClientSettings":
+        """Build settings from environment variables."""
+        return cls(
+            max_connections=env_int("GITHUB_HTTP_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=env_int("GITHUB_HTTP_MAX_KEEPALIVE", 10),
+            keepalive_expiry=env_float("GITHUB_HTTP_KEEPALIVE_EXPIRY", 30.0),
+            http2=env_bool("GITHUB_HTTP2", False),
+            timeout=env_float("API_TIMEOUT", 30.0),
+        )
+
+
+class ClientManager:
+    """Owns the process-wide pooled ``httpx.AsyncClient``.
+
+    The client is bound to the event loop it was created on. If it is requested
+    from a different loop (for instance after a previous ``asyncio.run``), a new
+    client is created transparently.
+    """
+
+    def __init__(self, settings: Optional[ClientSettings] = None):
+        self._settings = settings
+        self._transport: Optional[httpx.AsyncBaseTransport] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http2 = False
+
+    @property
+    def settings(self) -> ClientSettings:
+        if self._settings is None:
+            self._settings = ClientSettings.from_env()
+        return self._settings
+
+    def configure(
+        self,
+        settings: Optional[ClientSettings] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """Override pool settings and/or the transport (used by tests).
+
+        Takes effect the next time a client is created.
+        """
+        if settings is not None:
+            self._settings = settings
+        self._transport = transport
+        self._client = None
+        self._loop = None
+
+    def _build_client(self) -> httpx.AsyncClient:
+        settings = self.settings
+        http2 = settings.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("GITHUB_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        self._http2 = http2
+
+        limits = httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        )
+        # trust_env=False prevents picking up system HTTP(S)_PROXY/SOCKS settings
+        return httpx.AsyncClient(
+            limits=limits,
+            http2=http2,
+            timeout=settings.timeout,
+            trust_env=False,
+            transport=self._transport,
+        )
+
+    def get_client(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = self._build_client()
+            self._loop = loop
+        return self._client
+
+    async def start(self) -> None:
+        """Open the shared client (called on server startup)."""
+        self.get_client()
+        settings = self.settings
+        logger.info(
+            "HTTP client pool ready "
+            f"(max_connections={settings.max_connections}, "
+            f"max_keepalive={settings.max_keepalive_connections}, "
+            f"http2={self._http2})"
+        )
+
+    async def aclose(self) -> None:
+        """Close the shared client (called on server shutdown)."""
+        client, self._client, self._loop = self._client, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+
+_manager = ClientManager()
+
+
+def get_client_manager() -> ClientManager:
+    """Return the process-wide client manager."""
+    return _manager
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared pooled client for the running event loop."""
+    return _manager.get_client()
@@ -0,0 +1,153 @@
+"""JSON encoding and decoding with an optional fast backend.
+
+``orjson`` (or ``msgspec``) is used when installed, the standard library
+otherwise; ``GITHUB_JSON_BACKEND`` (``auto``, ``orjson``, ``msgspec`` or
+``json``) forces a choice. Every backend produces exactly the output of
+``json.dumps(value, indent=2, ensure_ascii=False)`` (or, in compact mode,
+``separators=(",", ":")``): values a fast backend would write differently
+(non-string keys, NaN and infinities, floats that Python writes in exponent
+notation) are detected up front, values it rejects (integers beyond 64 bits,
+lone surrogates, non-JSON types) make it fail, and in both cases the value
+is encoded with the standard library instead. Decoding falls back the same
+way, so ``loads`` accepts exactly what ``json.loads`` accepts.
+"""
+
+import os
+import json
+import math
+import logging
+from typing import Any, Callable, Optional, Tuple, Union
+
+
+logger = logging.getLogger("github-mcp-server")
+
+Encoder = Callable[[Any, bool], bytes]
+Decoder = Callable[[Union[bytes, str]], Any]
+
+
+def _stdlib_dumps(value: Any, compact: bool = False) -> str:
+    if compact:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
+def _load_orjson() -> Optional[Tuple[str, Encoder, Decoder]]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+    # Anything stdlib would reject (or write differently) must fail here
+    strict = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_SUBCLASS
+    indented = strict | orjson.OPT_INDENT_2
+
+    def encode(value: Any, compact: bool) -> bytes:
+        return orjson.dumps(value, option=strict if compact else indented)
+
+    return "orjson", encode, orjson.loads
+
+
+def _load_msgspec() -> Optional[Tuple[str, Encoder, Decoder]]:
+    try:
+        import msgspec
+    except ImportError:
+        return None
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def encode(value: Any, compact: bool) -> bytes:
+        data = encoder.encode(value)
+        return data if compact else msgspec.json.format(data, indent=2)
+
+    return "msgspec", encode, decoder.decode
+
+
+def _select_backend(choice: Optional[str] = None) -> Optional[Tuple[str, Encoder, Decoder]]:
+    choice = (choice or os.getenv("GITHUB_JSON_BACKEND", "auto")).strip().lower()
+    if choice == "json":
+        return None
+    loaders = {"orjson": [_load_orjson], "msgspec": [_load_msgspec]}.get(choice, [_load_orjson, _load_msgspec])
+    for loader in loaders:
+        backend = loader()
+        if backend is not None:
+            return backend
+    if choice not in ("auto", ""):
+        logger.warning(f"JSON backend '{choice}' is not installed; using the standard library")
+    return None
+
+
+_backend = _select_backend()
+
+
+def backend_name() -> str:
+    """Name of the active backend ("orjson", "msgspec" or "json")."""
+    return _backend[0] if _backend else "json"
+
+
+def set_backend(name: str) -> str:
+    """Switch the backend (``auto``, ``orjson``, ``msgspec`` or ``json``); returns the active name."""
+    global _backend
+    _backend = _select_backend(name)
+    return backend_name()
+
+
+def _fast_path_safe(value: Any) -> bool:
+    """Whether a fast backend writes this value exactly like the stdlib.
+
+    Rejects non-str keys and floats that are not finite or that ``repr``
+    writes in exponent notation (below 1e-4 or from 1e16; a wider margin is
+    used), which fast backends format differently.
+    """
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        kind = type(item)
+        if kind is dict:
+            for key, child in item.items():
+                if type(key) is not str:
+                    return False
+                if type(child) in (dict, list, tuple, float):
+                    stack.append(child)
+        elif kind is list or kind is tuple:
+            stack.extend(child for child in item if type(child) in (dict, list, tuple, float))
+        elif kind is float:
+            if not math.isfinite(item) or (item and not 1e-3 <= abs(item) < 1e15):
+                return False
+    return True
+
+
+def dumps(value: Any, compact: bool = False) -> str:
+    """Encode a value as JSON text.
+
+    Args:
+        value: JSON-serializable value
+        compact: No indentation and no spaces after separators
+
+    Returns:
+        The same text as ``json.dumps`` with ``indent=2`` (or compact
+        separators) and ``ensure_ascii=False``
+    """
+    if _backend is not None and _fast_path_safe(value):
+        try:
+            return _backend[1](value, compact).decode("utf-8")
+        except (TypeError, ValueError, OverflowError):
+            # Non-JSON types, huge integers, lone surrogates
+            pass
+    return _stdlib_dumps(value, compact)
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Decode JSON text or UTF-8 bytes.
+
+    Raises:
+        ValueError: If the input is not valid JSON (``json.JSONDecodeError``)
+    """
+    if _backend is not None:
+        try:
+            return _backend[2](data)
+        except Exception:
+            # Invalid for the fast backend (e.g. NaN, 128-bit integers):
+            # let the standard library decide
+            pass
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
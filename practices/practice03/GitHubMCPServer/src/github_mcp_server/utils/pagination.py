@@ -0,0 +1,341 @@
+"""Auto-pagination for GitHub list and search endpoints.
+
+``paginate`` is an async generator yielding one ``Page`` at a time. It follows
+``Link: rel="next"`` headers; when the first response also advertises
+``rel="last"`` the remaining page numbers are known up front, so they are
+fetched concurrently (bounded by ``concurrency``) and still yielded in order.
+Consumers merge items incrementally and may stop iterating at any time (e.g.
+once they have enough items); pending page fetches are then cancelled.
+
+``collect_pages`` merges pages until ``limit`` items are collected or the
+collected items fill the output budget. In the latter case it returns a
+``Resume`` with the next page number; the response encoder keeps it with the
+stored result, and ``fetch_more`` continues the listing from that page once
+the stored items are used up, so a large ``limit`` never fetches more than
+the caller reads.
+"""
+
+import re
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from . import json_codec
+from .api_client import send_github_request, to_mcp_error
+from .budget import count_tokens
+from .env import env_int
+from .projection import Projection
+
+
+# GitHub returns at most 100 items per page
+MAX_PER_PAGE = 100
+
+_LINK_RE = re.compile(r'<([^>]+)>\s*;\s*rel="([^"]+)"')
+
+
+class Page:
+    """One page of results."""
+
+    __slots__ = ("number", "items", "body")
+
+    def __init__(self, number: int, items: List[Any], body: Any):
+        self.number = number
+        self.items = items
+        # Full decoded body (search endpoints carry total_count etc.)
+        self.body = body
+
+    @property
+    def total_count(self) -> Optional[int]:
+        return self.body.get("total_count") if isinstance(self.body, dict) else None
+
+    @property
+    def incomplete_results(self) -> Optional[bool]:
+        return self.body.get("incomplete_results") if isinstance(self.body, dict) else None
+
+
+class Resume:
+    """Where a listing stopped early, so it can be continued later.
+
+    Attributes:
+        endpoint: API endpoint path
+        params: Query parameters other than ``per_page``/``page``
+        items_key: Key holding the items in the body (None for a list body)
+        per_page: Page size the page numbers refer to
+        page: First page not fetched yet
+        limit: Items still wanted
+        fields: Projection applied to the items (None for whole items)
+    """
+
+    __slots__ = ("endpoint", "params", "items_key", "per_page", "page", "limit", "fields")
+
+    def __init__(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        items_key: Optional[str],
+        per_page: int,
+        page: int,
+        limit: int,
+        fields: Optional[Tuple[str, ...]] = None,
+    ):
+        self.endpoint = endpoint
+        self.params = params
+        self.items_key = items_key
+        self.per_page = per_page
+        self.page = page
+        self.limit = limit
+        self.fields = fields
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-serializable state (kept with a stored result)."""
+        return {
+            "endpoint": self.endpoint,
+            "params": self.params,
+            "items_key": self.items_key,
+            "per_page": self.per_page,
+            "page": self.page,
+            "limit": self.limit,
+            "fields": list(self.fields) if self.fields is not None else None,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Resume":
+        fields = state["fields"]
+        return cls(
+            state["endpoint"], state["params"], state["items_key"], state["per_page"],
+            state["page"], state["limit"], tuple(fields) if fields is not None else None,
+        )
+
+    async def collect(self, budget: Optional[int]) -> Tuple[List[Any], Optional["Resume"]]:
+        """Fetch the next pages, projected, until ``budget`` is full.
+
+        Returns:
+            (projected items, where to continue or None if the listing is done)
+        """
+        projection = Projection(self.fields) if self.fields is not None else None
+        items, _, resume = await collect_pages(
+            self.endpoint, self.params, self.limit, self.items_key, budget, projection,
+            first_page=self.page, per_page=self.per_page,
+        )
+        return (projection.apply(items) if projection is not None else items), resume
+
+
+def parse_link_header(value: Optional[str]) -> Dict[str, str]:
+    """Parse an RFC 8288 ``Link`` header into ``{rel: url}``."""
+    if not value:
+        return {}
+    return {rel: url for url, rel in _LINK_RE.findall(value)}
+
+
+def _split_url(url: str) -> Tuple[str, Dict[str, str]]:
+    """Split an absolute API URL into (endpoint path, query params)."""
+    parsed = httpx.URL(url)
+    return parsed.path, dict(parsed.params)
+
+
+def _page_of(url: str) -> Optional[int]:
+    page = httpx.URL(url).params.get("page")
+    return int(page) if page and page.isdigit() else None
+
+
+def _extract_items(body: Any, items_key: Optional[str]) -> List[Any]:
+    if items_key is None:
+        return body if isinstance(body, list) else []
+    return body.get(items_key, []) if isinstance(body, dict) else []
+
+
+async def _fetch(endpoint: str, params: Dict[str, Any]) -> Tuple[Any, Dict[str, str]]:
+    try:
+        response = await send_github_request(endpoint, params=params)
+        return json_codec.loads(response.content), parse_link_header(response.headers.get("link"))
+    except Exception as e:
+        raise to_mcp_error(e)
+
+
+async def paginate(
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    max_items: Optional[int] = None,
+    items_key: Optional[str] = None,
+    per_page: int = MAX_PER_PAGE,
+    concurrency: Optional[int] = None,
+    first_page: int = 1,
+) -> AsyncIterator[Page]:
+    """Iterate over the pages of a GitHub list/search endpoint.
+
+    Args:
+        endpoint: API endpoint path (e.g., "/repos/o/r/pulls")
+        params: Query parameters (``per_page``/``page`` are managed here)
+        max_items: Stop after this many items have been yielded
+        items_key: Key holding the items in the body ("items" for search);
+            None when the body itself is a list
+        per_page: Page size (capped at 100)
+        concurrency: Parallel page fetches when the last page is known
+            (defaults to GITHUB_PAGINATION_CONCURRENCY, 4)
+        first_page: Page to start from (``per_page`` is then used as given,
+            so the page numbers keep referring to the same items)
+
+    Yields:
+        Page objects in page order
+
+    Raises:
+        MCPError: If a page request fails
+    """
+    if concurrency is None:
+        concurrency = env_int("GITHUB_PAGINATION_CONCURRENCY", 4, minimum=1)
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    if max_items is not None and first_page == 1:
+        per_page = min(per_page, max_items)
+    base_params = {**(params or {}), "per_page": per_page}
+    pages_needed = -(-max_items // per_page) if max_items is not None else None
+
+    body, links = await _fetch(endpoint, {**base_params, "page": first_page})
+    yield Page(first_page, _extract_items(body, items_key), body)
+
+    last_page = _page_of(links["last"]) if "last" in links else None
+    if last_page is not None:
+        if pages_needed is not None:
+            last_page = min(last_page, first_page - 1 + pages_needed)
+        async for page in _fetch_pages_concurrently(
+            endpoint, base_params, first_page + 1, last_page, items_key, concurrency
+        ):
+            yield page
+        return
+
+    # Unknown page count: follow rel="next" sequentially
+    number = first_page
+    while "next" in links and (pages_needed is None or number - first_page + 1 < pages_needed):
+        number += 1
+        next_endpoint, next_params = _split_url(links["next"])
+        body, links = await _fetch(next_endpoint, next_params)
+        yield Page(number, _extract_items(body, items_key), body)
+
+
+async def _fetch_pages_concurrently(
+    endpoint: str,
+    base_params: Dict[str, Any],
+    first: int,
+    last: int,
+    items_key: Optional[str],
+    concurrency: int,
+) -> AsyncIterator[Page]:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(number: int) -> Page:
+        async with semaphore:
+            body, _ = await _fetch(endpoint, {**base_params, "page": number})
+            return Page(number, _extract_items(body, items_key), body)
+
+    tasks = [asyncio.ensure_future(fetch(number)) for number in range(first, last + 1)]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        # Consumer stopped early (budget reached) or a page failed
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def collect_items(
+    pages: AsyncIterator[Page],
+    limit: int,
+    budget: Optional[int] = None,
+    projection: Optional[Projection] = None,
+) -> Tuple[List[Any], Optional[Page], Optional[int]]:
+    """Merge page items until ``limit`` items are collected or ``budget`` is full.
+
+    No further page is requested once the collected items, projected the
+    way they will be returned, take more than ``budget`` tokens as compact
+    JSON: they can no longer fit one response, and the rest of the listing
+    is fetched later through ``fetch_more``.
+
+    Args:
+        pages: Iterator returned by ``paginate``
+        limit: Maximum number of items to collect
+        budget: Output budget in tokens (None to always collect ``limit`` items)
+        projection: Projection applied to the items before they are returned
+
+    Returns:
+        (items, first page, number of the next page if stopped by the budget)
+    """
+    items: List[Any] = []
+    first: Optional[Page] = None
+    next_page: Optional[int] = None
+    used = 0
+    try:
+        async for page in pages:
+            if first is None:
+                first = page
+            taken = page.items[:limit - len(items)]
+            items.extend(taken)
+            if len(items) >= limit or not page.items:
+                break
+            if budget is not None:
+                shown = projection.apply(taken) if projection is not None else taken
+                used += count_tokens(json_codec.dumps(shown, compact=True))
+                if used > budget:
+                    next_page = page.number + 1
+                    break
+    finally:
+        await pages.aclose()
+    return items, first, next_page
+
+
+async def collect_pages(
+    endpoint: str,
+    params: Optional[Dict[str, Any]],
+    limit: int,
+    items_key: Optional[str] = None,
+    budget: Optional[int] = None,
+    projection: Optional[Projection] = None,
+    first_page: int = 1,
+    per_page: int = MAX_PER_PAGE,
+) -> Tuple[List[Any], Optional[Page], Optional[Resume]]:
+    """Paginate an endpoint and merge its items (see ``collect_items``).
+
+    Returns:
+        (items, first page, where to continue if stopped by the budget)
+    """
+    if first_page == 1:
+        per_page = max(1, min(per_page, MAX_PER_PAGE, limit))
+    pages = paginate(
+        endpoint, params=params, max_items=limit, items_key=items_key, per_page=per_page, first_page=first_page
+    )
+    items, first, next_page = await collect_items(pages, limit, budget, projection)
+    resume = None
+    if next_page is not None:
+        fields = projection.fields if projection is not None else None
+        resume = Resume(endpoint, dict(params or {}), items_key, per_page, next_page, limit - len(items), fields)
+    return items, first, resume
+
+
+async def collect_search_results(
+    endpoint: str,
+    params: Dict[str, Any],
+    limit: int,
+    budget: Optional[int] = None,
+    projection: Optional[Projection] = None,
+) -> Tuple[Dict[str, Any], Optional[Resume]]:
+    """Paginate a search endpoint and merge the pages into one search body.
+
+    Args:
+        endpoint: Search endpoint (e.g., "/search/issues")
+        params: Search parameters (``q``, ``sort``, ...)
+        limit: Maximum number of items to return
+        budget: Output budget in tokens at which to stop fetching pages
+        projection: Projection the items will be returned with
+
+    Returns:
+        (``{"total_count", "incomplete_results", "items"}`` like a single
+        page, where to continue if stopped by the budget)
+    """
+    items, first, resume = await collect_pages(endpoint, params, limit, "items", budget, projection)
+    body = {
+        "total_count": first.total_count if first else 0,
+        "incomplete_results": bool(first.incomplete_results) if first else False,
+        "items": items,
+    }
+    return body, resume
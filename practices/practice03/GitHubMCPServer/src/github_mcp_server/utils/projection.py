@@ -0,0 +1,125 @@
+"""Field projections for tool responses.
+
+A projection is a list of dot paths such as ``"title"``, ``"user.login"`` or
+``"labels[].name"``. It is compiled once into a tree of the selected keys and
+applied in a single pass that only visits those keys, so large nested objects
+that are not selected (a pull request's ``head.repo``, for instance) are never
+walked. Lists are projected element-wise; the ``[]`` marker is optional and
+only documents that a field holds a list.
+
+Paths are relative to one result item. How a projection is applied depends on
+the shape of the payload: a list is projected item by item, a search-style
+``{"total_count": ..., "items": [...]}`` object keeps its scalar metadata (and
+an ``errors`` list) and projects each of its ``items``, and any other object is projected directly.
+
+Each tool declares its concise field set as ``PROJECTION`` next to its
+``TOOL_ANNOTATIONS``; callers can pass ``fields`` to select their own. An
+empty field list is the identity projection (``IDENTITY``), which returns
+payloads unchanged.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from .errors import MCPError
+
+
+# Compiled form: key -> subtree (None selects the whole value)
+Spec = Dict[str, Optional["Spec"]]
+
+# Longest accepted path, in segments
+MAX_DEPTH = 8
+
+
+@lru_cache(maxsize=256)
+def compile_fields(fields: Tuple[str, ...]) -> Spec:
+    """Compile dot paths into a selection tree (cached per field set).
+
+    Args:
+        fields: Paths such as ``("number", "user.login", "labels[].name")``
+
+    Returns:
+        Nested dict of selected keys; a ``None`` leaf selects the whole value
+
+    Raises:
+        MCPError: If a path is empty or malformed
+    """
+    spec: Spec = {}
+    for field in fields:
+        segments = [segment.strip() for segment in field.replace("[]", "").split(".")]
+        if not field.strip() or not all(segments) or len(segments) > MAX_DEPTH:
+            raise MCPError(
+                message=f"Invalid field path: {field!r}",
+                code=400,
+                details={"field": field},
+                suggestion="Use dot paths like 'title', 'user.login' or 'labels[].name'.",
+            )
+        node = spec
+        for segment in segments[:-1]:
+            child = node.get(segment, {})
+            if child is None:
+                # A shorter path already selects the whole value
+                break
+            node = node.setdefault(segment, child)
+        else:
+            node[segments[-1]] = None
+    return spec
+
+
+def project_value(value: Any, spec: Optional[Spec]) -> Any:
+    """Apply a compiled selection tree to one value."""
+    if spec is None:
+        return value
+    if isinstance(value, dict):
+        projected = {}
+        for key, child in spec.items():
+            if key in value:
+                projected[key] = project_value(value[key], child)
+        return projected
+    if isinstance(value, list):
+        return [project_value(item, spec) for item in value]
+    return value
+
+
+class Projection:
+    """A compiled, reusable field projection.
+
+    Args:
+        fields: Dot paths relative to one result item (none: select everything)
+    """
+
+    __slots__ = ("fields", "spec")
+
+    def __init__(self, fields: Iterable[str]):
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self.spec: Optional[Spec] = compile_fields(self.fields) if self.fields else None
+
+    def apply(self, data: Any) -> Any:
+        """Project a payload according to its shape (list, search result or object)."""
+        if self.spec is None:
+            return data
+        if isinstance(data, list):
+            return [project_value(item, self.spec) for item in data]
+        if isinstance(data, dict) and isinstance(data.get("items"), list):
+            # Search-style envelope: keep counters, flags and errors, project the items
+            projected = {
+                key: value for key, value in data.items()
+                if key != "items" and (key == "errors" or not isinstance(value, (dict, list)))
+            }
+            projected["items"] = [project_value(item, self.spec) for item in data["items"]]
+            return projected
+        return project_value(data, self.spec)
+
+
+# Selects whole payloads (concise output of callers without a field set)
+IDENTITY = Projection(())
+
+
+@lru_cache(maxsize=256)
+def _selector(fields: Tuple[str, ...]) -> Projection:
+    return Projection(fields)
+
+
+def select_fields(data: Any, fields: Sequence[str]) -> Any:
+    """Project a payload onto caller-selected fields."""
+    return _selector(tuple(fields)).apply(data)
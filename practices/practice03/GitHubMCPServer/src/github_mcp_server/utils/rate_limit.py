@@ -0,0 +1,326 @@
+"""Rate-limit-aware request scheduling for the GitHub API.
+
+GitHub enforces separate quotas per resource bucket (``core``, ``search``,
+``code_search``, ``graphql``) and per credential. The scheduler keeps one
+token bucket per (credential, resource) pair, paces outgoing requests so a
+bucket never overdraws, and keeps the bucket in sync with the
+``x-ratelimit-*`` headers of every response. When a quota is exhausted (or a
+secondary limit answers with ``Retry-After``) callers are queued until the
+reset time instead of failing, as long as the wait stays below
+``GITHUB_RATE_LIMIT_MAX_WAIT`` seconds.
+
+Reset times from GitHub are epoch seconds, so they are compared against
+``time.time()``; bucket refill uses ``time.monotonic()``.
+
+With ``GITHUB_SHARED_STATE`` the buckets are shared by all server processes
+using the same credentials: each reservation and header update loads the
+bucket, changes it and stores it back in one transaction (see
+``shared_state``). Those transactions run off the event loop on a copy of
+the bucket: a reservation waits for its transaction in a worker thread and
+then swaps the copy in; a header update is applied to the local bucket at
+once and written to the shared state by its writer thread. Only the event
+loop ever touches the buckets the scheduler holds.
+"""
+
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+import httpx
+
+from .env import env_float
+from .errors import MCPError, suggest_next_steps
+
+
+logger = logging.getLogger("github-mcp-server")
+
+# (limit, window seconds) per resource for authenticated and anonymous callers
+AUTHENTICATED_LIMITS = {
+    "core": (5000, 3600),
+    "search": (30, 60),
+    "code_search": (10, 60),
+    "graphql": (5000, 3600),
+}
+ANONYMOUS_LIMITS = {
+    "core": (60, 3600),
+    "search": (10, 60),
+    "code_search": (10, 60),
+    "graphql": (0, 3600),
+}
+
+ANONYMOUS = "anonymous"
+
+T = TypeVar("T")
+
+
+def resource_for(endpoint: str) -> str:
+    """Map an API endpoint to its GitHub rate-limit resource bucket."""
+    if endpoint.startswith("/search/code"):
+        return "code_search"
+    if endpoint.startswith("/search/"):
+        return "search"
+    if endpoint.startswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+def credential_id(authorization: Optional[str]) -> str:
+    """Return a stable, non-secret identifier for an Authorization header."""
+    if not authorization:
+        return ANONYMOUS
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:12]
+
+
+def _int_header(response: httpx.Response, name: str) -> Optional[int]:
+    value = response.headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Seconds to wait before retrying a rate-limited response, if limited.
+
+    Honors ``Retry-After`` (secondary limits) and falls back to
+    ``x-ratelimit-reset`` when the primary quota is exhausted.
+    """
+    if response.status_code not in (403, 429):
+        return None
+    retry_after = response.headers.get("retry-after")
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            return None
+    if response.headers.get("x-ratelimit-remaining") == "0":
+        reset = _int_header(response, "x-ratelimit-reset")
+        if reset is not None:
+            return max(0.0, reset - time.time())
+    return None
+
+
+class ResourceBucket:
+    """Token bucket for one (credential, resource) pair.
+
+    Tokens refill continuously at ``limit / window`` per second. ``reserve``
+    may drive the balance negative: the deficit is the caller's place in the
+    queue, so waiters are served in arrival order.
+    """
+
+    __slots__ = ("limit", "window", "tokens", "updated", "remaining", "reset_at", "blocked_until")
+
+    def __init__(self, limit: int, window: float):
+        self.limit = max(1, limit)
+        self.window = window
+        self.tokens = float(self.limit)
+        self.updated = time.monotonic()
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[int] = None
+        self.blocked_until = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.limit / self.window
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(float(self.limit), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        self._refill()
+        self.tokens -= 1
+        wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+        return max(wait, self.blocked_until - time.time())
+
+    def headroom(self) -> float:
+        """Tokens currently available (never more than GitHub reported)."""
+        self._refill()
+        return self.tokens
+
+    def refund(self) -> None:
+        """Give back a reserved token (caller gave up)."""
+        self.tokens = min(float(self.limit), self.tokens + 1)
+
+    def update(self, limit: Optional[int], remaining: Optional[int], reset: Optional[int]) -> None:
+        """Synchronize with GitHub's view of the quota."""
+        self._refill()
+        if limit:
+            self.limit = limit
+        if remaining is not None:
+            self.remaining = remaining
+            # The server is authoritative: never assume more than it reports
+            self.tokens = min(self.tokens, float(remaining))
+        if reset is not None:
+            self.reset_at = reset
+            if remaining == 0:
+                self.blocked_until = max(self.blocked_until, float(reset))
+
+    def copy(self) -> "ResourceBucket":
+        """An independent copy, to be changed in another thread."""
+        clone = ResourceBucket.__new__(ResourceBucket)
+        clone.replace(self)
+        return clone
+
+    def replace(self, other: "ResourceBucket") -> None:
+        """Take over the state of another bucket."""
+        for name in self.__slots__:
+            setattr(self, name, getattr(other, name))
+
+    def block_for(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable state; the monotonic refill time is stored as epoch seconds."""
+        return {
+            "limit": self.limit,
+            "window": self.window,
+            "tokens": self.tokens,
+            "updated": time.time() - (time.monotonic() - self.updated),
+            "remaining": self.remaining,
+            "reset_at": self.reset_at,
+            "blocked_until": self.blocked_until,
+        }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """Replace this bucket's state with one saved by ``to_state``."""
+        self.limit = state["limit"]
+        self.window = state["window"]
+        self.tokens = state["tokens"]
+        self.updated = time.monotonic() - max(0.0, time.time() - state["updated"])
+        self.remaining = state["remaining"]
+        self.reset_at = state["reset_at"]
+        self.blocked_until = state["blocked_until"]
+
+    def snapshot(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset": self.reset_at,
+            "available_tokens": round(self.tokens, 2),
+            "blocked_for": round(max(0.0, self.blocked_until - time.time()), 2),
+        }
+
+
+class RateLimitScheduler:
+    """Paces requests per credential and resource based on GitHub quotas."""
+
+    def __init__(self, max_wait: float = 60.0):
+        self.max_wait = max_wait
+        self._buckets: Dict[Tuple[str, str], ResourceBucket] = {}
+        self.queued = 0
+        self.rejected = 0
+        # Quota state shared with other processes (a SharedState, or None)
+        self.shared: Any = None
+
+    def bucket(self, credential: str, resource: str) -> ResourceBucket:
+        key = (credential, resource)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            limits = ANONYMOUS_LIMITS if credential == ANONYMOUS else AUTHENTICATED_LIMITS
+            limit, window = limits.get(resource, limits["core"])
+            bucket = self._buckets[key] = ResourceBucket(limit, window)
+        return bucket
+
+    async def _change(self, credential: str, resource: str, change: Callable[[ResourceBucket], T]) -> T:
+        """Apply a change to a bucket, through the shared state if configured.
+
+        The shared transaction runs in a worker thread on a copy of the
+        bucket, which replaces the bucket once it is done.
+        """
+        bucket = self.bucket(credential, resource)
+        shared = self.shared
+        if shared is None:
+            return change(bucket)
+        copy = bucket.copy()
+        result = await asyncio.to_thread(shared.update_quota, credential, resource, copy, change)
+        bucket.replace(copy)
+        return result
+
+    async def acquire(self, credential: str, resource: str) -> None:
+        """Wait until a request may be sent for this credential/resource.
+
+        Raises:
+            MCPError: If the wait would exceed ``max_wait`` seconds
+        """
+        bucket = self.bucket(credential, resource)
+        wait = await self._change(credential, resource, ResourceBucket.reserve)
+        if wait <= 0:
+            return
+        if wait > self.max_wait:
+            await self._change(credential, resource, ResourceBucket.refund)
+            self.rejected += 1
+            raise MCPError(
+                message="Rate limit exceeded. Please wait before making more requests.",
+                code=429,
+                details={
+                    "resource": resource,
+                    "rate_limit_remaining": bucket.remaining,
+                    "rate_limit_reset": bucket.reset_at,
+                    "wait_seconds": round(wait, 1),
+                },
+                suggestion=suggest_next_steps("rate_limit"),
+            )
+        self.queued += 1
+        logger.info(f"Rate limit pacing: waiting {wait:.1f}s for '{resource}' quota")
+        await asyncio.sleep(wait)
+
+    def observe(self, response: httpx.Response, resource: Optional[str] = None) -> None:
+        """Update quota state from a response's rate-limit headers."""
+        credential = credential_id(response.request.headers.get("Authorization"))
+        resource = response.headers.get("x-ratelimit-resource") or resource or "core"
+        limit = _int_header(response, "x-ratelimit-limit")
+        remaining = _int_header(response, "x-ratelimit-remaining")
+        reset = _int_header(response, "x-ratelimit-reset")
+        wait = retry_after_seconds(response)
+
+        def change(bucket: ResourceBucket) -> None:
+            bucket.update(limit, remaining, reset)
+            if wait is not None:
+                bucket.block_for(wait)
+
+        bucket = self.bucket(credential, resource)
+        change(bucket)
+        shared = self.shared
+        if shared is not None:
+            # Other processes learn of it in the background, through a copy
+            copy = bucket.copy()
+            shared.submit(lambda: shared.update_quota(credential, resource, copy, change))
+
+    def reset(self) -> None:
+        """Forget all quota state."""
+        self._buckets.clear()
+        self.queued = 0
+        self.rejected = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "buckets": {
+                f"{credential}:{resource}": bucket.snapshot()
+                for (credential, resource), bucket in self._buckets.items()
+            },
+        }
+
+
+def _max_wait_from_env() -> float:
+    return env_float("GITHUB_RATE_LIMIT_MAX_WAIT", 60.0)
+
+
+_scheduler = RateLimitScheduler(max_wait=_max_wait_from_env())
+
+
+def get_scheduler() -> RateLimitScheduler:
+    """Return the process-wide rate-limit scheduler."""
+    return _scheduler
+
+
+def get_rate_limit_stats() -> Dict[str, Any]:
+    """Return the scheduler's current view of all quotas."""
+    return _scheduler.stats()
@@ -0,0 +1,250 @@
+"""Server-side store of truncated results behind continuation cursors.
+
+When a response does not fit the output budget, the full (already projected)
+payload is kept here for ``GITHUB_RESULT_STORE_TTL`` seconds under an opaque
+id, and the response carries a cursor ``"<id>:<offset>"``. The
+``fetch_more`` tool pages through the stored payload without calling GitHub
+again. Item payloads (lists and search-style ``items``) are paged by item
+offset; oversized text is paged by character offset. A listing that stopped
+fetching pages at the output budget also keeps where it stopped (the state
+of a ``pagination.Resume``), so ``fetch_more`` can continue it from GitHub
+once the stored items are used up.
+
+Memory use is bounded by ``GITHUB_RESULT_STORE_MAX_BYTES`` with LRU eviction
+(a dedicated ``CacheEngine``, so stored results never evict API cache
+entries). Setting the budget to 0 disables the store; cursors then degrade
+to plain offsets. With ``GITHUB_SHARED_STATE`` the store is shared by all
+server processes, so a cursor can be continued on any of them.
+
+Cached tool results must not outlive the cursors they contain: cursors
+issued while ``track_cursors`` is active are recorded so ``cached_tool`` can
+cap its TTL accordingly.
+"""
+
+import time
+import secrets
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Literal, Optional, Tuple
+
+from . import json_codec
+from .cache import CacheEngine
+from .env import env_int
+from .errors import MCPError
+
+
+Kind = Literal["items", "text"]
+
+DEFAULT_TTL = 600
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class StoredResult:
+    """A stored payload and how to page through it."""
+
+    __slots__ = ("kind", "payload", "format", "size", "table", "resume")
+
+    def __init__(
+        self,
+        kind: Kind,
+        payload: Any,
+        format: str,
+        size: int,
+        table: Any = None,
+        resume: Optional[Dict[str, Any]] = None,
+    ):
+        self.kind = kind
+        self.payload = payload
+        self.format = format
+        self.size = size
+        self.table = table
+        self.resume = resume
+
+    def cache_size(self) -> int:
+        return self.size
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable state (the table stays a ``TableSchema``; see ``shared_state``)."""
+        return {
+            "kind": self.kind,
+            "payload": self.payload,
+            "format": self.format,
+            "size": self.size,
+            "table": self.table,
+            "resume": self.resume,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "StoredResult":
+        return cls(state["kind"], state["payload"], state["format"], state["size"], state["table"], state.get("resume"))
+
+
+class CursorTracker:
+    """Earliest expiry of the cursors issued within one tool call."""
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self):
+        self.expires_at: Optional[float] = None
+
+    def note(self, expires_at: float) -> None:
+        if self.expires_at is None or expires_at < self.expires_at:
+            self.expires_at = expires_at
+
+
+_tracker: contextvars.ContextVar[Optional[CursorTracker]] = contextvars.ContextVar(
+    "github_mcp_cursor_tracker", default=None
+)
+
+
+@contextmanager
+def track_cursors() -> Iterator[CursorTracker]:
+    """Record the cursors issued in this context (see ``cached_tool``)."""
+    tracker = CursorTracker()
+    token = _tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _tracker.reset(token)
+
+
+class ResultStore:
+    """TTL- and byte-bounded LRU store of truncated results.
+
+    Args:
+        max_bytes: Budget for all stored payloads
+        ttl: Seconds a stored result stays available
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl: int = DEFAULT_TTL):
+        self.ttl = ttl
+        self._engine = CacheEngine(max_entries=10000, max_bytes=max_bytes, default_ttl=ttl)
+
+    def save(
+        self,
+        kind: Kind,
+        payload: Any,
+        format: str,
+        table: Any = None,
+        resume: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """Store a payload and return its id (None if it exceeds the budget).
+
+        ``table`` is the Markdown column schema used to render later pages;
+        ``resume`` is where the listing continues after the payload.
+        """
+        if kind == "text":
+            size = len(payload.encode("utf-8"))
+        else:
+            size = len(json_codec.dumps(payload, compact=True).encode("utf-8"))
+        if size > self._engine.max_bytes:
+            return None
+        result_id = secrets.token_urlsafe(12)
+        self._engine.set(f"result:{result_id}", StoredResult(kind, payload, format, size, table, resume), self.ttl)
+        tracker = _tracker.get()
+        if tracker is not None:
+            tracker.note(time.time() + self.ttl)
+        return result_id
+
+    def load(self, result_id: str) -> Optional[StoredResult]:
+        """Return a stored result (marks it recently used), or None if gone."""
+        return self._engine.get(f"result:{result_id}")
+
+    async def aload(self, result_id: str) -> Optional[StoredResult]:
+        """Like ``load``, but a shared store is read off the event loop."""
+        return await self._engine.aget(f"result:{result_id}")
+
+    def share(self, shared: Any) -> None:
+        """Back the store with a ``SharedCache`` (None: process-local only)."""
+        self._engine.shared = shared
+
+    def sweep(self) -> int:
+        """Remove expired results (run by the cache sweeper)."""
+        return self._engine.sweep()
+
+    def clear(self) -> None:
+        self._engine.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._engine.stats()
+        namespace = stats["namespaces"].get("result", {})
+        return {
+            "entries": stats["entries"],
+            "bytes": stats["bytes"],
+            "max_bytes": stats["max_bytes"],
+            "ttl": self.ttl,
+            "hits": namespace.get("hits", 0),
+            "misses": namespace.get("misses", 0),
+            "evictions": namespace.get("evictions", 0),
+        }
+
+
+_store: Optional[ResultStore] = None
+_configured = False
+
+
+def get_result_store() -> Optional[ResultStore]:
+    """Return the process-wide result store, or None if it is disabled."""
+    global _store, _configured
+    if not _configured:
+        _configured = True
+        max_bytes = env_int("GITHUB_RESULT_STORE_MAX_BYTES", DEFAULT_MAX_BYTES)
+        if max_bytes > 0:
+            _store = ResultStore(max_bytes, env_int("GITHUB_RESULT_STORE_TTL", DEFAULT_TTL, minimum=1))
+    return _store
+
+
+def reset_result_store() -> None:
+    """Forget the store so it is reconfigured from the environment on next use."""
+    global _store, _configured
+    _store = None
+    _configured = False
+
+
+def get_result_store_stats() -> Optional[Dict[str, Any]]:
+    """Return result store statistics (None if disabled)."""
+    store = get_result_store()
+    return store.stats() if store is not None else None
+
+
+def continuation(
+    kind: Kind,
+    payload: Any,
+    format: str,
+    table: Any = None,
+    resume: Optional[Dict[str, Any]] = None,
+) -> Callable[[int], str]:
+    """Build a cursor factory that stores ``payload`` on first use.
+
+    The payload is only stored if a cursor is actually needed. Without a
+    store (or if the payload exceeds its budget) cursors are plain offsets.
+    """
+    result_id: Optional[str] = None
+    saved = False
+
+    def cursor(offset: int) -> str:
+        nonlocal result_id, saved
+        if not saved:
+            saved = True
+            store = get_result_store()
+            result_id = store.save(kind, payload, format, table, resume) if store is not None else None
+        return f"{result_id}:{offset}" if result_id else str(offset)
+
+    return cursor
+
+
+def parse_cursor(cursor: str) -> Tuple[str, int]:
+    """Split a cursor into (result id, offset).
+
+    Raises:
+        MCPError: If the cursor is malformed
+    """
+    result_id, sep, offset = cursor.strip().rpartition(":")
+    if not sep or not result_id or not offset.isdigit():
+        raise MCPError(
+            message=f"Invalid cursor: {cursor!r}",
+            code=400,
+            details={"cursor": cursor},
+            suggestion="Pass the 'next_cursor' value from a truncated response unchanged.",
+        )
+    return result_id, int(offset)
@@ -0,0 +1,161 @@
+"""Retry policy for transient GitHub API failures.
+
+Timeouts, connection errors and 5xx gateway errors are usually transient
+(the statuses retried are configurable through ``GITHUB_RETRY_STATUSES``).
+Idempotent requests that hit them are retried inside the client with
+exponential backoff and full jitter, bounded by a maximum number of attempts
+and a total deadline. Every retry is recorded so tail latency can be
+attributed to upstream flakiness rather than to the tools themselves.
+"""
+
+import time
+import random
+import logging
+from collections import Counter, deque
+from typing import Any, Dict, FrozenSet, Optional
+
+import httpx
+
+from .env import env_float, env_int, env_int_set
+
+
+logger = logging.getLogger("github-mcp-server")
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+DEFAULT_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """Retry settings for idempotent requests.
+
+    Args:
+        max_attempts: Total attempts including the first one
+        deadline: Total time budget in seconds for all attempts and backoff
+        base_delay: Backoff base in seconds (doubled per attempt)
+        max_delay: Upper bound for a single backoff
+        retry_statuses: HTTP status codes treated as transient
+    """
+
+    __slots__ = ("max_attempts", "deadline", "base_delay", "max_delay", "retry_statuses")
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        deadline: float = 30.0,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        retry_statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.deadline = deadline
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a policy from GITHUB_RETRY_* environment variables."""
+        return cls(
+            max_attempts=env_int("GITHUB_RETRY_MAX_ATTEMPTS", 3),
+            deadline=env_float("GITHUB_RETRY_DEADLINE", 30.0),
+            base_delay=env_float("GITHUB_RETRY_BASE_DELAY", 0.5),
+            max_delay=env_float("GITHUB_RETRY_MAX_DELAY", 8.0),
+            retry_statuses=env_int_set("GITHUB_RETRY_STATUSES", DEFAULT_RETRY_STATUSES),
+        )
+
+    def is_retryable_error(self, error: Exception) -> bool:
+        """Timeouts and connection-level failures are transient."""
+        return isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (1-based) attempt."""
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+    def next_delay(self, attempt: int, started: float) -> Optional[float]:
+        """Delay before the next attempt, or None if the budget is spent.
+
+        Args:
+            attempt: Number of attempts made so far
+            started: ``time.monotonic()`` when the first attempt started
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.backoff(attempt)
+        if time.monotonic() - started + delay > self.deadline:
+            return None
+        return delay
+
+
+class RetryStats:
+    """Counters and a short history of retries for latency attribution."""
+
+    def __init__(self, history: int = 100):
+        self.retried_requests = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.backoff_seconds = 0.0
+        self.reasons: Counter = Counter()
+        self.recent: deque = deque(maxlen=history)
+
+    def record_retry(self, method: str, endpoint: str, attempt: int, reason: str, delay: float) -> None:
+        self.retries += 1
+        if attempt == 1:
+            self.retried_requests += 1
+        self.backoff_seconds += delay
+        self.reasons[reason] += 1
+        self.recent.append({
+            "method": method,
+            "endpoint": endpoint,
+            "attempt": attempt,
+            "reason": reason,
+            "delay": round(delay, 3),
+            "at": time.time(),
+        })
+        logger.info(f"Retrying {method} {endpoint} after {reason} (attempt {attempt}, backoff {delay:.2f}s)")
+
+    def record_exhausted(self, method: str, endpoint: str, attempts: int, reason: str) -> None:
+        self.exhausted += 1
+        logger.warning(f"Giving up on {method} {endpoint} after {attempts} attempts ({reason})")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "retried_requests": self.retried_requests,
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+            "backoff_seconds": round(self.backoff_seconds, 3),
+            "reasons": dict(self.reasons),
+            "recent": list(self.recent),
+        }
+
+
+_policy: Optional[RetryPolicy] = None
+_stats = RetryStats()
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Return the process-wide retry policy (built from env on first use)."""
+    global _policy
+    if _policy is None:
+        _policy = RetryPolicy.from_env()
+    return _policy
+
+
+def set_retry_policy(policy: Optional[RetryPolicy]) -> None:
+    """Replace the retry policy (None rebuilds it from env on next use)."""
+    global _policy
+    _policy = policy
+
+
+def get_retry_stats() -> Dict[str, Any]:
+    """Return retry statistics."""
+    return _stats.as_dict()
+
+
+def retry_stats() -> RetryStats:
+    """Return the mutable stats recorder (used by the API client)."""
+    return _stats
@@ -0,0 +1,322 @@
+"""Budget-aware incremental JSON encoding.
+
+Instead of serializing a whole payload and slicing the text afterwards (which
+can cut JSON mid-token), results are written item by item until the budget
+is reached and the enclosing structure is then closed, so the output is
+always valid JSON. A truncated result is described by a single ``_truncation``
+object owned by the encoder: ``omitted_count`` items that did not fit and a
+``next_cursor`` (the offset of the first omitted item, or the rest of a
+shortened string), plus ``clipped`` when strings were shortened. When more
+items follow the payload (a listing that is continued from GitHub), the
+cursor is given even if every item fits. Payload keys
+are never refused; one that happens to be named ``_truncation`` is written
+as ``__truncation`` instead.
+
+The output is byte-for-byte what ``json.dumps(data, indent=2)`` (or, with
+``compact``, ``separators=(",", ":")``) produces whenever the whole payload
+fits; values are encoded with ``json_codec``. Budgets are measured with a
+pluggable ``measure`` function (characters by default), so a token estimate
+can be used instead.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import json_codec
+
+
+Measure = Callable[[str], int]
+
+# Room kept free for closing brackets and the truncation metadata
+TAIL_RESERVE = 160
+
+# Key of the truncation metadata added to a truncated object
+TRUNCATION_KEY = "_truncation"
+
+# Marker appended to strings cut to fit the budget
+CLIP_MARKER = "... [truncated]"
+
+# Strings shorter than this are never cut
+MIN_CLIP_LENGTH = 64
+
+
+class EncodedResponse:
+    """Result of a budgeted encoding.
+
+    Attributes:
+        text: Encoded output (always complete, valid JSON)
+        emitted: Number of items written
+        omitted: Number of items left out
+        next_offset: Offset of the first omitted item, or None if complete
+        clipped: True if long strings were shortened to fit
+    """
+
+    __slots__ = ("text", "emitted", "omitted", "next_offset", "clipped")
+
+    def __init__(self, text: str, emitted: int, omitted: int, next_offset: Optional[int], clipped: bool = False):
+        self.text = text
+        self.emitted = emitted
+        self.omitted = omitted
+        self.next_offset = next_offset
+        self.clipped = clipped
+
+    @property
+    def truncated(self) -> bool:
+        return self.omitted > 0 or self.clipped or self.next_offset is not None
+
+
+class _Layout:
+    """Whitespace of the output: indented by two spaces, or compact."""
+
+    __slots__ = ("compact", "newline", "separator", "colon")
+
+    def __init__(self, compact: bool):
+        self.compact = compact
+        self.newline = "" if compact else "\n"
+        self.separator = "," + self.newline
+        self.colon = ":" if compact else ": "
+
+    def indent(self, depth: int) -> str:
+        return "" if self.compact else "  " * depth
+
+    def dumps(self, value: Any, depth: int) -> str:
+        """Encode a value as it appears at the given nesting depth."""
+        text = json_codec.dumps(value, compact=self.compact)
+        if depth and not self.compact and "\n" in text:
+            text = text.replace("\n", "\n" + "  " * depth)
+        return text
+
+    def member(self, key: str, value: Any, depth: int = 1) -> str:
+        return f"{self.indent(depth)}{json_codec.dumps(key)}{self.colon}{self.dumps(value, depth)}"
+
+
+_INDENTED = _Layout(compact=False)
+_COMPACT = _Layout(compact=True)
+
+
+def _longest_string(value: Any, path: Tuple = ()) -> Tuple[Optional[Tuple], int]:
+    best: Tuple[Optional[Tuple], int] = (None, 0)
+    if isinstance(value, str):
+        return path, len(value)
+    children = value.items() if isinstance(value, dict) else enumerate(value) if isinstance(value, list) else ()
+    for key, child in children:
+        candidate = _longest_string(child, path + (key,))
+        if candidate[1] > best[1]:
+            best = candidate
+    return best
+
+
+def _replace(value: Any, path: Tuple, new: Any) -> Any:
+    if not path:
+        return new
+    head, rest = path[0], path[1:]
+    if isinstance(value, dict):
+        return {**value, head: _replace(value[head], rest, new)}
+    copy = list(value)
+    copy[head] = _replace(copy[head], rest, new)
+    return copy
+
+
+Clip = Tuple[Tuple, str, int]
+
+
+def clip_to_fit(
+    value: Any,
+    limit: int,
+    depth: int = 0,
+    measure: Measure = len,
+    layout: _Layout = _INDENTED,
+) -> Tuple[Any, str, List[Clip]]:
+    """Shorten the longest strings of a value until its encoding fits ``limit``.
+
+    Returns:
+        (value, encoded text, clips) where each clip is (path, original
+        string, characters kept); the text may still exceed ``limit`` if no
+        string long enough to cut remains
+    """
+    text = layout.dumps(value, depth)
+    clips: Dict[Tuple, Clip] = {}
+    for _ in range(16):
+        overflow = measure(text) - limit
+        if overflow <= 0:
+            break
+        path, length = _longest_string(value)
+        if path is None or length < MIN_CLIP_LENGTH:
+            break
+        current = value
+        for key in path:
+            current = current[key]
+        # Convert the overflow into characters of this string
+        cut = overflow if measure is len else -(-overflow * length // max(1, measure(current)))
+        keep = max(0, length - cut - len(CLIP_MARKER))
+        original = clips[path][1] if path in clips else current
+        clips[path] = (path, original, keep)
+        value = _replace(value, path, current[:keep] + CLIP_MARKER)
+        text = layout.dumps(value, depth)
+    return value, text, list(clips.values())
+
+
+def _encode_items(
+    items: List[Any],
+    depth: int,
+    budget: int,
+    reserve: int,
+    measure: Measure,
+    layout: _Layout,
+    more: bool = False,
+) -> Tuple[str, int, List[Clip]]:
+    """Encode list items while they fit ``budget``.
+
+    Items are encoded one at a time and encoding stops at the first item
+    that does not fit. If anything was left out (or ``more`` items follow),
+    trailing items are dropped until ``reserve`` is free again for the
+    truncation metadata. The first
+    item is always written, its strings shortened if it does not fit alone.
+
+    Returns:
+        (encoded list, number of items written, clips of the first item)
+    """
+    if not items:
+        return "[]", 0, []
+    indent = layout.indent(depth + 1)
+    opening = "[" + layout.newline
+    closing = layout.newline + layout.indent(depth) + "]"
+    parts: List[str] = []
+    costs: List[int] = []
+    used = measure(opening) + measure(closing)
+    clips: List[Clip] = []
+    for item in items:
+        text = layout.dumps(item, depth + 1)
+        cost = measure(indent) + measure(text) + (measure(layout.separator) if parts else 0)
+        if used + cost > budget:
+            if parts:
+                break
+            # A single oversized item: shorten its strings rather than drop it
+            limit = max(0, budget - reserve - used - measure(indent))
+            item, text, clips = clip_to_fit(item, limit, depth + 1, measure, layout)
+            cost = measure(indent) + measure(text)
+        parts.append(indent + text)
+        costs.append(cost)
+        used += cost
+    if len(parts) < len(items) or more:
+        while len(parts) > 1 and used + reserve > budget:
+            parts.pop()
+            used -= costs.pop()
+    return opening + layout.separator.join(parts) + closing, len(parts), clips
+
+
+def _metadata(
+    omitted: int,
+    next_offset: Optional[int],
+    clips: List[Clip],
+    cursor: Optional[Callable[[int], str]],
+    clip_cursor: Optional[Callable[[str, int], str]],
+) -> Optional[Dict[str, Any]]:
+    """The ``_truncation`` object, or None if nothing was left out."""
+    metadata: Dict[str, Any] = {}
+    if omitted:
+        metadata["omitted_count"] = omitted
+    if next_offset is not None:
+        metadata["next_cursor"] = cursor(next_offset) if cursor else str(next_offset)
+    if clips:
+        metadata["clipped"] = True
+        if next_offset is None and clip_cursor is not None:
+            _, original, kept = clips[0]
+            metadata["next_cursor"] = clip_cursor(original, kept)
+    return metadata or None
+
+
+def _own_key(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Move a payload member named like the metadata key out of its way."""
+    if TRUNCATION_KEY not in data:
+        return data
+    renamed = "_" + TRUNCATION_KEY
+    while renamed in data:
+        renamed = "_" + renamed
+    return {(renamed if key == TRUNCATION_KEY else key): value for key, value in data.items()}
+
+
+def encode_json(
+    data: Any,
+    max_size: int,
+    measure: Measure = len,
+    cursor: Optional[Callable[[int], str]] = None,
+    clip_cursor: Optional[Callable[[str, int], str]] = None,
+    compact: bool = False,
+    more: bool = False,
+) -> EncodedResponse:
+    """Encode data as JSON within a size budget.
+
+    A list, or the ``items`` list of an object, is written item by item and
+    closed once the budget is reached; a ``_truncation`` object with
+    ``omitted_count`` and ``next_cursor`` is then added (a truncated
+    top-level list is wrapped as ``{"items": [...], "_truncation": ...}``).
+    Members of an object beside ``items`` get at most half of the budget and
+    have their longest strings shortened beyond that. Any other value that
+    does not fit has its longest strings shortened, and an object then gets
+    ``_truncation`` with ``clipped`` and a ``next_cursor`` pointing into the
+    first shortened string.
+
+    Args:
+        data: JSON-serializable payload
+        max_size: Budget, in units of ``measure``
+        measure: Size function (``len`` counts characters)
+        cursor: Maps the offset of the first omitted item to a cursor string
+        clip_cursor: Maps a shortened string and the number of characters
+            kept to a cursor string
+        compact: No indentation and no spaces after separators
+        more: More items follow the list (``next_cursor`` is then always
+            given, pointing past the last item written)
+
+    Returns:
+        EncodedResponse
+    """
+    layout = _COMPACT if compact else _INDENTED
+    if isinstance(data, list):
+        encoded, emitted, clips = _encode_items(data, 0, max_size, TAIL_RESERVE, measure, layout, more)
+        if emitted == len(data) and not clips and not more:
+            return EncodedResponse(encoded, emitted, 0, None)
+        # Truncated: wrap the items so the metadata has somewhere to go
+        return encode_json({"items": data}, max_size, measure, cursor, clip_cursor, compact, more)
+    if isinstance(data, dict):
+        data = _own_key(data)
+
+    opening, closing = "{" + layout.newline, layout.newline + "}"
+    if not (isinstance(data, dict) and isinstance(data.get("items"), list)):
+        _, text, clips = clip_to_fit(data, max_size, 0, measure, layout)
+        if clips and isinstance(data, dict):
+            # Clip again with room for the metadata, then append it
+            _, text, clips = clip_to_fit(data, max_size - TAIL_RESERVE, 0, measure, layout)
+            metadata = _metadata(0, None, clips, cursor, clip_cursor)
+            text = text[:-len(closing)] + layout.separator + layout.member(TRUNCATION_KEY, metadata) + closing
+        return EncodedResponse(text, 0, 0, None, bool(clips))
+
+    # Object with an "items" list: the other members are written first
+    items = data["items"]
+    envelope = {key: value for key, value in data.items() if key != "items"}
+    envelope_clips: List[Clip] = []
+    if measure(layout.dumps(envelope, 0)) > max_size // 2:
+        envelope, _, envelope_clips = clip_to_fit(envelope, max_size // 2, 0, measure, layout)
+    lines: List[Optional[str]] = []
+    used = measure(opening) + measure(closing)
+    for key in data:
+        if key == "items":
+            lines.append(None)
+            continue
+        line = layout.member(key, envelope[key])
+        used += measure(line) + measure(layout.separator)
+        lines.append(line)
+
+    prefix = layout.indent(1) + '"items"' + layout.colon
+    budget = max(0, max_size - used - measure(prefix) - measure(layout.separator))
+    encoded, emitted, clips = _encode_items(items, 1, budget, TAIL_RESERVE, measure, layout, more)
+    lines[lines.index(None)] = prefix + encoded
+
+    omitted = len(items) - emitted
+    next_offset = emitted if omitted or more else None
+    metadata = _metadata(omitted, next_offset, clips or envelope_clips, cursor, clip_cursor)
+    if metadata is not None:
+        lines.append(layout.member(TRUNCATION_KEY, metadata))
+    return EncodedResponse(
+        opening + layout.separator.join(lines) + closing, emitted, omitted, next_offset,
+        bool(clips or envelope_clips),
+    )
@@ -0,0 +1,466 @@
+"""State shared by several server processes through a local SQLite file.
+
+One server process keeps its caches and rate-limit view in memory. When
+several processes serve clients side by side (the HTTP workers started with
+``GITHUB_WORKERS``, or separate servers pointed at the same file), they share
+through ``GITHUB_SHARED_STATE``:
+
+- the API cache (conditional-request validators, tool results, parsed diffs,
+  blobs) and the store of truncated results behind ``fetch_more`` cursors,
+  as a second tier behind each process's ``CacheEngine``: a local miss falls
+  back to the shared tier and every write goes through to it, so a cursor
+  issued by one worker can be continued on another;
+- the rate-limit buckets: every reservation and every ``x-ratelimit-*``
+  update runs in one SQLite transaction, so the workers pace requests
+  against a single quota per credential and resource instead of one each.
+
+The file is opened in WAL mode and each operation is a short transaction.
+None of it runs on the event loop: cache writes, sweeps and quota updates
+from response headers are queued to one writer thread per process (in
+order), and reads and reservations that a request waits for run in a worker
+thread. Values larger than ``GITHUB_SHARED_STATE_MAX_VALUE_BYTES`` (blobs,
+large diffs) stay process-local.
+
+The shared tier is best effort: when the database is busy for longer than
+``BUSY_TIMEOUT`` or a value cannot be encoded, the process carries on with
+its local state. Values are stored as JSON: plain data, bytes, and the few
+classes of ``shared_types`` (each with ``to_state`` / ``from_state``), so
+reading the file never runs code from it. Other objects (parsed diffs,
+blobs) stay process-local. The file lives in the user's cache directory and
+is created with owner-only permissions.
+"""
+
+import os
+import json
+import time
+import queue
+import base64
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from .cache import estimate_size
+from .env import env_int
+
+
+logger = logging.getLogger("github-mcp-server")
+
+T = TypeVar("T")
+
+# Seconds a process waits for another one's transaction before giving up
+BUSY_TIMEOUT = 0.5
+STATE_FILE = "shared-state.sqlite3"
+
+# Largest value (estimated bytes) written to the shared tier
+DEFAULT_MAX_VALUE_BYTES = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (scope, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_expiry ON entries (scope, expires_at);
+CREATE TABLE IF NOT EXISTS quotas (
+    credential TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (credential, resource)
+) WITHOUT ROWID;
+"""
+
+
+# Keys tagging encoded bytes and objects; a NUL never appears in API keys
+_BYTES_KEY = "\0bytes"
+_TYPE_KEY = "\0type"
+
+
+def shared_types() -> Dict[str, type]:
+    """Classes whose instances are stored in the shared tier, by tag."""
+    from .conditional import ConditionalEntry
+    from .result_store import StoredResult
+    from .tables import TableSchema
+
+    return {"conditional": ConditionalEntry, "result": StoredResult, "table": TableSchema}
+
+
+def encode_value(value: Any) -> bytes:
+    """Encode a cache value as JSON.
+
+    Raises:
+        TypeError: If the value holds an object of an unregistered class
+    """
+    tags = {cls: tag for tag, cls in shared_types().items()}
+
+    def default(obj: Any) -> Any:
+        if isinstance(obj, (bytes, bytearray)):
+            return {_BYTES_KEY: base64.b64encode(obj).decode("ascii")}
+        tag = tags.get(type(obj))
+        if tag is None:
+            raise TypeError(f"{type(obj).__name__} values are not shared")
+        return {_TYPE_KEY: tag, "state": obj.to_state()}
+
+    return json.dumps(value, default=default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_value(data: bytes) -> Any:
+    """Decode a value written by ``encode_value``.
+
+    Raises:
+        ValueError: If the data is not such a value
+    """
+    types = shared_types()
+
+    def hook(obj: Dict[str, Any]) -> Any:
+        if _BYTES_KEY in obj:
+            return base64.b64decode(obj[_BYTES_KEY])
+        if _TYPE_KEY in obj:
+            cls = types.get(obj[_TYPE_KEY])
+            if cls is None:
+                raise ValueError(f"Unknown shared type {obj[_TYPE_KEY]!r}")
+            return cls.from_state(obj["state"])
+        return obj
+
+    return json.loads(data, object_hook=hook)
+
+
+def default_state_path() -> Path:
+    """Shared state file under GITHUB_CACHE_DIR."""
+    from .blob_store import DEFAULT_CACHE_DIR
+
+    return Path(os.getenv("GITHUB_CACHE_DIR") or DEFAULT_CACHE_DIR).expanduser() / STATE_FILE
+
+
+class SharedStats:
+    """Counters of one process's use of the shared state."""
+
+    __slots__ = ("hits", "misses", "writes", "busy", "unencodable", "oversized")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.busy = 0
+        self.unencodable = 0
+        self.oversized = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SharedState:
+    """SQLite-backed cache entries and rate-limit buckets.
+
+    Args:
+        path: Database file (created if missing)
+        max_value_bytes: Larger values are not shared
+    """
+
+    def __init__(self, path: Path, max_value_bytes: int = DEFAULT_MAX_VALUE_BYTES):
+        self.path = Path(path)
+        self.max_value_bytes = max_value_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists():
+            self.path.touch(mode=0o600)
+        # Autocommit mode: transactions are opened explicitly where needed
+        self._db = sqlite3.connect(
+            str(self.path), timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._writes: "queue.Queue[Optional[Callable[[], Any]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self.stats = SharedStats()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Finish the queued writes, then close the database."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._writes.put(None)
+            writer.join()
+        with self._lock:
+            self._db.close()
+
+    def submit(self, write: Callable[[], Any]) -> None:
+        """Run ``write`` on this process's writer thread, after earlier writes."""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_forever, name="shared-state-writer", daemon=True)
+                self._writer.start()
+        self._writes.put(write)
+
+    def flush(self) -> None:
+        """Wait until every submitted write is done."""
+        self._writes.join()
+
+    def _write_forever(self) -> None:
+        while True:
+            write = self._writes.get()
+            try:
+                if write is None:
+                    return
+                write()
+            except Exception as e:
+                logger.debug(f"Shared state write failed: {e}")
+            finally:
+                self._writes.task_done()
+
+    def cache(self, scope: str) -> "SharedCache":
+        """View of the entries of one scope (one per ``CacheEngine``)."""
+        return SharedCache(self, scope)
+
+    def _busy(self, error: sqlite3.Error) -> None:
+        self.stats.busy += 1
+        logger.debug(f"Shared state unavailable: {error}")
+
+    # Cache entries
+
+    def load(self, scope: str, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, expires_at) of a live entry, or None."""
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM entries WHERE scope = ? AND key = ? AND expires_at > ?",
+                    (scope, key, time.time()),
+                ).fetchone()
+        except sqlite3.Error as e:
+            self._busy(e)
+            return None
+        if row is None:
+            self.stats.misses += 1
+            return None
+        try:
+            value = decode_value(row[0])
+        except Exception:
+            # Written by an incompatible version of the server
+            self.stats.unencodable += 1
+            return None
+        self.stats.hits += 1
+        return value, row[1]
+
+    def store(self, scope: str, key: str, value: Any, ttl_seconds: float) -> None:
+        """Queue a write of an entry (values over ``max_value_bytes`` are skipped)."""
+        if estimate_size(value) > self.max_value_bytes:
+            self.stats.oversized += 1
+            return
+        expires_at = time.time() + max(0.0, ttl_seconds)
+        self.submit(lambda: self._write_entry(scope, key, value, expires_at))
+
+    def _write_entry(self, scope: str, key: str, value: Any, expires_at: float) -> None:
+        try:
+            data = encode_value(value)
+        except (TypeError, ValueError):
+            self.stats.unencodable += 1
+            return
+        if len(data) > self.max_value_bytes:
+            self.stats.oversized += 1
+            return
+        try:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (scope, key, value, expires_at, size) VALUES (?, ?, ?, ?, ?)",
+                    (scope, key, data, expires_at, len(data)),
+                )
+            self.stats.writes += 1
+        except sqlite3.Error as e:
+            self._busy(e)
+
+    def delete(self, scope: str, key: str) -> None:
+        """Queue the removal of an entry."""
+        self.submit(lambda: self._delete_entry(scope, key))
+
+    def _delete_entry(self, scope: str, key: str) -> None:
+        try:
+            with self._lock:
+                self._db.execute("DELETE FROM entries WHERE scope = ? AND key = ?", (scope, key))
+        except sqlite3.Error as e:
+            self._busy(e)
+
+    def clear(self, scope: str, prefix: Optional[str] = None) -> None:
+        """Queue the removal of a scope's entries (or those starting with ``prefix``)."""
+        self.submit(lambda: self._clear_entries(scope, prefix))
+
+    def _clear_entries(self, scope: str, prefix: Optional[str]) -> None:
+        try:
+            with self._lock:
+                if prefix is None:
+                    self._db.execute("DELETE FROM entries WHERE scope = ?", (scope,))
+                else:
+                    # Range scan instead of LIKE, which would treat '_' and '%' as wildcards
+                    self._db.execute(
+                        "DELETE FROM entries WHERE scope = ? AND key >= ? AND key < ?",
+                        (scope, prefix, prefix + "\U0010ffff"),
+                    )
+        except sqlite3.Error as e:
+            self._busy(e)
+
+    def sweep(self, scope: str, max_bytes: int) -> None:
+        """Queue a sweep of a scope (see ``_sweep_entries``)."""
+        self.submit(lambda: self._sweep_entries(scope, max_bytes))
+
+    def _sweep_entries(self, scope: str, max_bytes: int) -> int:
+        """Remove expired entries, then the soonest-expiring ones over budget."""
+        try:
+            with self._lock:
+                removed = self._db.execute(
+                    "DELETE FROM entries WHERE scope = ? AND expires_at <= ?", (scope, time.time())
+                ).rowcount
+                total = self._db.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM entries WHERE scope = ?", (scope,)
+                ).fetchone()[0]
+                if total > max_bytes:
+                    victims = []
+                    rows = self._db.execute(
+                        "SELECT key, size FROM entries WHERE scope = ? ORDER BY expires_at", (scope,)
+                    ).fetchall()
+                    for key, size in rows:
+                        if total <= max_bytes:
+                            break
+                        victims.append((scope, key))
+                        total -= size
+                    self._db.executemany("DELETE FROM entries WHERE scope = ? AND key = ?", victims)
+                    removed += len(victims)
+                return removed
+        except sqlite3.Error as e:
+            self._busy(e)
+            return 0
+
+    # Rate-limit buckets
+
+    def update_quota(self, credential: str, resource: str, bucket: Any, change: Callable[[Any], T]) -> T:
+        """Apply ``change`` to a bucket synchronized with the shared quota.
+
+        The bucket is loaded from the database, changed and written back in
+        one transaction, so concurrent processes see each other's
+        reservations. If the database is unavailable the change applies to
+        the bucket only. This blocks: async callers run it in a worker thread
+        or ``submit`` it, on a copy of the bucket the event loop uses.
+        """
+        with self._lock:
+            try:
+                self._db.execute("BEGIN IMMEDIATE")
+            except sqlite3.Error as e:
+                self._busy(e)
+                return change(bucket)
+            result: Any = None
+            applied = False
+            try:
+                row = self._db.execute(
+                    "SELECT state FROM quotas WHERE credential = ? AND resource = ?", (credential, resource)
+                ).fetchone()
+                if row is not None:
+                    bucket.load_state(json.loads(row[0]))
+                result = change(bucket)
+                applied = True
+                self._db.execute(
+                    "INSERT OR REPLACE INTO quotas (credential, resource, state) VALUES (?, ?, ?)",
+                    (credential, resource, json.dumps(bucket.to_state())),
+                )
+                self._db.execute("COMMIT")
+                return result
+            except sqlite3.Error as e:
+                self._busy(e)
+                try:
+                    self._db.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+                return result if applied else change(bucket)
+
+
+class SharedCache:
+    """The entries of one scope of a ``SharedState``."""
+
+    __slots__ = ("state", "scope")
+
+    def __init__(self, state: SharedState, scope: str):
+        self.state = state
+        self.scope = scope
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        return self.state.load(self.scope, key)
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self.state.store(self.scope, key, value, ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        self.state.delete(self.scope, key)
+
+    def clear(self, prefix: Optional[str] = None) -> None:
+        self.state.clear(self.scope, prefix)
+
+    def sweep(self, max_bytes: int) -> None:
+        self.state.sweep(self.scope, max_bytes)
+
+
+_state: Optional[SharedState] = None
+_configured = False
+
+
+def get_shared_state() -> Optional[SharedState]:
+    """Return the process's shared state, or None if GITHUB_SHARED_STATE is unset."""
+    global _state, _configured
+    if not _configured:
+        _configured = True
+        path = os.getenv("GITHUB_SHARED_STATE", "").strip()
+        if path:
+            try:
+                _state = SharedState(
+                    Path(path).expanduser(),
+                    max_value_bytes=env_int("GITHUB_SHARED_STATE_MAX_VALUE_BYTES", DEFAULT_MAX_VALUE_BYTES),
+                )
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Cannot open shared state {path}: {e}; using process-local state")
+    return _state
+
+
+def attach_shared_state() -> Optional[SharedState]:
+    """Back the API cache, the result store and the rate-limit scheduler with the shared state."""
+    from .cache import get_cache
+    from .rate_limit import get_scheduler
+    from .result_store import get_result_store
+
+    state = get_shared_state()
+    if state is None:
+        return None
+    get_cache().shared = state.cache("cache")
+    store = get_result_store()
+    if store is not None:
+        store.share(state.cache("results"))
+    get_scheduler().shared = state
+    logger.info(f"Sharing cache and rate-limit state through {state.path}")
+    return state
+
+
+def detach_shared_state() -> None:
+    """Return to process-local state and close the database."""
+    global _state, _configured
+    from .cache import get_cache
+    from .rate_limit import get_scheduler
+    from .result_store import get_result_store
+
+    get_cache().shared = None
+    store = get_result_store()
+    if store is not None:
+        store.share(None)
+    get_scheduler().shared = None
+    state, _state, _configured = _state, None, False
+    if state is not None:
+        state.close()
+
+
+def get_shared_state_stats() -> Optional[Dict[str, Any]]:
+    """Return this process's shared state counters (None if not configured)."""
+    state = _state
+    if state is None:
+        return None
+    return {"path": str(state.path), **state.stats.as_dict()}
@@ -0,0 +1,185 @@
+"""Markdown tables rendered from a column schema.
+
+Each list tool declares a ``TABLE`` next to its ``PROJECTION``: the columns
+to show, as dot paths into one item (``"user.login"``, ``"labels[].name"``).
+Nested values are flattened (values reached through lists are joined with
+", "), cells are escaped so pipes and newlines cannot break the table, and
+long cells are shortened. Rows are built column by column in blocks: every
+column's cells for a block are computed into a preallocated list, and rows
+are then assembled by zipping the columns, so per-cell work is a single
+lookup and no row is rendered past the character budget.
+"""
+
+from functools import lru_cache
+from itertools import accumulate
+from bisect import bisect_right
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from . import json_codec
+
+
+# Default maximum characters per cell
+CELL_WIDTH = 50
+
+# Rows rendered per block before the budget is checked again
+BLOCK_ROWS = 256
+
+_ESCAPES = str.maketrans({"|": "\\|", "\n": " ", "\r": " ", "\t": " "})
+
+
+def escape_cell(text: str, width: int = CELL_WIDTH) -> str:
+    """Escape a cell for a Markdown table and shorten it to ``width``."""
+    if len(text) > width:
+        text = text[:width - 1] + "…"
+    return text.translate(_ESCAPES)
+
+
+def _scalar(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json_codec.dumps(value, compact=True)
+    return str(value)
+
+
+def _getter(segments: Tuple[str, ...]) -> Callable[[Any], str]:
+    """Compile a path into a function returning the flattened cell text."""
+    if len(segments) == 1:
+        key = segments[0]
+
+        def get_one(item: Any) -> str:
+            value = item.get(key) if isinstance(item, dict) else None
+            if isinstance(value, list) and all(not isinstance(v, (dict, list)) for v in value):
+                return ", ".join(_scalar(v) for v in value)
+            return _scalar(value)
+
+        return get_one
+
+    def collect(value: Any, depth: int, out: List[str]) -> None:
+        if isinstance(value, list):
+            for element in value:
+                collect(element, depth, out)
+        elif depth == len(segments):
+            if value is not None:
+                out.append(_scalar(value))
+        elif isinstance(value, dict):
+            collect(value.get(segments[depth]), depth + 1, out)
+
+    def get_many(item: Any) -> str:
+        out: List[str] = []
+        collect(item, 0, out)
+        return ", ".join(out)
+
+    return get_many
+
+
+class Column:
+    """One table column.
+
+    Args:
+        path: Dot path into an item (``[]`` marks lists and is optional)
+        header: Column header (defaults to the path)
+        width: Maximum characters per cell
+    """
+
+    __slots__ = ("path", "header", "width", "get")
+
+    def __init__(self, path: str, header: Optional[str] = None, width: int = CELL_WIDTH):
+        self.path = path
+        self.header = header or path
+        self.width = width
+        self.get = _getter(tuple(part for part in path.replace("[]", "").split(".") if part))
+
+
+class TableSchema:
+    """Columns of a Markdown table of items.
+
+    Args:
+        columns: Column objects, or plain paths
+    """
+
+    __slots__ = ("columns", "header")
+
+    def __init__(self, columns: Iterable[Union[Column, str]]):
+        self.columns = [c if isinstance(c, Column) else Column(c) for c in columns]
+        headers = [escape_cell(c.header, 200) for c in self.columns]
+        self.header = "| " + " | ".join(headers) + " |\n|" + "|".join(["---"] * len(headers)) + "|"
+
+    def to_state(self) -> List[List[Any]]:
+        """Serializable state: (path, header, width) of each column."""
+        return [[c.path, c.header, c.width] for c in self.columns]
+
+    @classmethod
+    def from_state(cls, state: List[List[Any]]) -> "TableSchema":
+        return cls(Column(path, header, width) for path, header, width in state)
+
+    @classmethod
+    def from_keys(cls, keys: Sequence[str]) -> "TableSchema":
+        """Schema showing the given top-level keys (cached per key set)."""
+        return _schema_for(tuple(keys))
+
+    def _rows(self, items: Sequence[Any]) -> List[str]:
+        count = len(items)
+        columns = []
+        for column in self.columns:
+            cells = [""] * count
+            get, width = column.get, column.width
+            for i in range(count):
+                cells[i] = escape_cell(get(items[i]), width)
+            columns.append(cells)
+        return ["| " + " | ".join(cells) + " |" for cells in zip(*columns)]
+
+    def render(
+        self,
+        items: Sequence[Any],
+        max_size: Optional[int] = None,
+        cursor: Optional[Callable[[int], str]] = None,
+        reserve: int = 0,
+        measure: Callable[[str], int] = len,
+        more: bool = False,
+    ) -> str:
+        """Render items as a table within ``max_size``.
+
+        Args:
+            items: Items to render
+            max_size: Budget, in units of ``measure`` (None for no limit)
+            cursor: Maps the offset of the first omitted row to a cursor string
+            reserve: Room kept free for the omission note
+            measure: Size function (``len`` counts characters)
+            more: More items follow ``items`` (the note is then always added)
+
+        Returns:
+            Markdown table, followed by a note if rows were omitted
+        """
+        if not items:
+            return "No items found"
+        rows: List[str] = []
+        budget = None if max_size is None else max_size - reserve - measure(self.header) - 1
+        for start in range(0, len(items), BLOCK_ROWS):
+            block = self._rows(items[start:start + BLOCK_ROWS])
+            if budget is not None:
+                # Each row costs its size plus one for the newline
+                used = list(accumulate(measure(row) + 1 for row in block))
+                fitting = bisect_right(used, budget)
+                if fitting < len(block):
+                    # Always show at least one row
+                    rows.extend(block[:max(fitting, 0 if rows else 1)])
+                    break
+                budget -= used[-1]
+            rows.extend(block)
+        table = self.header + "\n" + "\n".join(rows)
+        if len(rows) < len(items) or more:
+            next_cursor = cursor(len(rows)) if cursor else str(len(rows))
+            omitted = len(items) - len(rows)
+            note = f"{omitted}{'+' if more else ''} more items omitted" if omitted else "more items available"
+            table += f"\n\n... {note} (next_cursor: \"{next_cursor}\")"
+        return table
+
+
+@lru_cache(maxsize=128)
+def _schema_for(keys: Tuple[str, ...]) -> TableSchema:
+    return TableSchema(keys)
@@ -0,0 +1,215 @@
+"""Pool of GitHub tokens with quota-aware selection.
+
+A single token caps the server at 5000 core requests per hour. Tokens can be
+supplied as a comma-separated ``GITHUB_TOKENS`` variable and/or a
+``GITHUB_TOKENS_FILE`` (one token per line, ``#`` comments allowed), in
+addition to ``GITHUB_TOKEN``. Each request is routed to the token with the
+most headroom for the request's rate-limit resource, using the quota state the
+scheduler keeps per credential. Tokens rejected with 401 are quarantined
+until the ``Retry-After`` or ``x-ratelimit-reset`` time the response gives,
+or, without either, for ``GITHUB_TOKEN_QUARANTINE`` seconds (the token is
+treated as revoked until then). Tokens with an exhausted quota are skipped
+for that resource until its reset time.
+"""
+
+import os
+import time
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .env import env_float
+from .rate_limit import RateLimitScheduler, credential_id, get_scheduler
+
+
+logger = logging.getLogger("github-mcp-server")
+
+PLACEHOLDER_TOKEN = "your_github_personal_access_token_here"
+ANONYMOUS = "anonymous"
+
+
+def quarantine_hint(response: httpx.Response) -> Optional[float]:
+    """Seconds a 401 response asks the client to back off, if it says so."""
+    retry_after = response.headers.get("retry-after")
+    try:
+        if retry_after is not None:
+            return max(0.0, float(retry_after))
+        reset = response.headers.get("x-ratelimit-reset")
+        if reset is not None:
+            return max(0.0, int(reset) - time.time())
+    except ValueError:
+        pass
+    return None
+
+
+def authorization_for(token: str) -> str:
+    """Return the Authorization header value for a token."""
+    return f"Bearer {token}"
+
+
+def load_tokens_from_env() -> List[str]:
+    """Collect tokens from GITHUB_TOKEN, GITHUB_TOKENS and GITHUB_TOKENS_FILE."""
+    candidates: List[str] = []
+    candidates.append(os.getenv("GITHUB_TOKEN", ""))
+    candidates.extend(os.getenv("GITHUB_TOKENS", "").split(","))
+
+    tokens_file = os.getenv("GITHUB_TOKENS_FILE")
+    if tokens_file:
+        try:
+            with open(tokens_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.split("#", 1)[0]
+                    candidates.append(line)
+        except OSError as e:
+            logger.error(f"Could not read GITHUB_TOKENS_FILE '{tokens_file}': {e}")
+
+    tokens: List[str] = []
+    for token in candidates:
+        token = token.strip()
+        if token and token != PLACEHOLDER_TOKEN and token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+class PooledToken:
+    """A token and its health state."""
+
+    __slots__ = ("token", "credential", "quarantined_until", "requests")
+
+    def __init__(self, token: str):
+        self.token = token
+        self.credential = credential_id(authorization_for(token))
+        self.quarantined_until = 0.0
+        self.requests = 0
+
+
+class TokenPool:
+    """Routes requests to the token with the most remaining quota."""
+
+    def __init__(
+        self,
+        tokens: List[str],
+        scheduler: Optional[RateLimitScheduler] = None,
+        quarantine_seconds: float = 3600.0,
+    ):
+        self._tokens = [PooledToken(t) for t in tokens]
+        self._scheduler = scheduler
+        self.quarantine_seconds = quarantine_seconds
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    @property
+    def scheduler(self) -> RateLimitScheduler:
+        return self._scheduler or get_scheduler()
+
+    def fingerprint(self) -> str:
+        """Stable identifier of the pool's credentials (for cache keys)."""
+        if not self._tokens:
+            return ""
+        digest = hashlib.sha256()
+        for pooled in sorted(self._tokens, key=lambda p: p.credential):
+            digest.update(pooled.token.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _availability(self, pooled: PooledToken, resource: str, now: float) -> float:
+        """Epoch time at which the token can serve this resource again."""
+        bucket = self.scheduler.bucket(pooled.credential, resource)
+        return max(pooled.quarantined_until, bucket.blocked_until, now)
+
+    def select(self, resource: str = "core") -> Optional[str]:
+        """Pick the token with the most headroom for a resource.
+
+        Returns None when no tokens are configured (anonymous access). If every
+        token is quarantined or exhausted, the one that recovers first is used;
+        the scheduler then queues or rejects the request.
+        """
+        if not self._tokens:
+            return None
+        now = time.time()
+        best = None
+        best_rank = None
+        for pooled in self._tokens:
+            available_at = self._availability(pooled, resource, now)
+            headroom = self.scheduler.bucket(pooled.credential, resource).headroom()
+            # Usable tokens first (sorted by headroom), then earliest recovery
+            rank = (available_at > now, available_at, -headroom)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = pooled, rank
+        best.requests += 1
+        return best.token
+
+    def has_alternative(self, token: Optional[str], resource: str = "core") -> bool:
+        """Whether another token is currently usable for the resource."""
+        now = time.time()
+        return any(
+            pooled.token != token and self._availability(pooled, resource, now) <= now
+            for pooled in self._tokens
+        )
+
+    def quarantine(self, token: Optional[str], seconds: Optional[float] = None) -> None:
+        """Take a token out of rotation (e.g. after a 401).
+
+        Args:
+            token: Token to bench
+            seconds: Duration from the response (see ``quarantine_hint``);
+                None uses the fixed ``quarantine_seconds``
+        """
+        for pooled in self._tokens:
+            if pooled.token == token:
+                duration = self.quarantine_seconds if seconds is None else seconds
+                pooled.quarantined_until = time.time() + duration
+                logger.warning(
+                    f"Token {pooled.credential} quarantined for {duration:.0f}s "
+                    f"({len(self._tokens) - 1} other token(s) in pool)"
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "tokens": len(self._tokens),
+            "members": [
+                {
+                    "credential": pooled.credential,
+                    "requests": pooled.requests,
+                    "quarantined_for": round(max(0.0, pooled.quarantined_until - now), 1),
+                }
+                for pooled in self._tokens
+            ],
+        }
+
+
+_pool: Optional[TokenPool] = None
+
+
+def get_token_pool() -> TokenPool:
+    """Return the process-wide token pool (loaded from env on first use)."""
+    global _pool
+    if _pool is None:
+        quarantine = env_float("GITHUB_TOKEN_QUARANTINE", 3600.0)
+        _pool = TokenPool(load_tokens_from_env(), quarantine_seconds=quarantine)
+    return _pool
+
+
+def reset_token_pool() -> None:
+    """Forget the pool so it is reloaded from the environment on next use."""
+    global _pool
+    _pool = None
+
+
+def credential_scope() -> str:
+    """Short, non-secret id of the pool's credentials.
+
+    Caches of repository content that a later caller reads without asking
+    GitHub (file metadata, blobs, stored objects) are partitioned by it, so
+    one set of credentials never sees what only another could read.
+    """
+    return get_token_pool().fingerprint()[:16] or ANONYMOUS
+
+
+def get_token_pool_stats() -> Dict[str, Any]:
+    """Return per-token usage and quarantine state."""
+    return get_token_pool().stats()
@@ -0,0 +1,103 @@
+"""Declarative result caching for read-only tools.
+
+Tool modules declare a ``CACHE_POLICY`` next to their ``TOOL_ANNOTATIONS``;
+``tool_registry.build_tool`` wraps the tool function with ``cached_tool`` so that
+identical calls (same validated input model, same credentials) are answered
+from the shared cache until the policy's TTL expires.
+"""
+
+import time
+import hashlib
+import functools
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from pydantic import BaseModel
+
+from .cache import cache_aget, cache_set
+from .env import env_bool
+from .result_store import track_cursors
+from .token_pool import get_token_pool
+
+
+TtlSpec = Union[int, Callable[[BaseModel], int]]
+
+
+class CachePolicy:
+    """Caching policy for one tool.
+
+    Args:
+        ttl: Time-to-live in seconds, or a callable computing it from the
+            validated input model (e.g. longer TTLs for immutable commit SHAs)
+    """
+
+    __slots__ = ("ttl",)
+
+    def __init__(self, ttl: TtlSpec):
+        self.ttl = ttl
+
+    def ttl_for(self, input: BaseModel) -> int:
+        return int(self.ttl(input)) if callable(self.ttl) else int(self.ttl)
+
+
+def tool_cache_enabled() -> bool:
+    """Whether tool result caching is enabled (GITHUB_TOOL_CACHE)."""
+    return env_bool("GITHUB_TOOL_CACHE", True)
+
+
+def tool_cache_key(tool_name: str, input: BaseModel) -> str:
+    """Build the cache key for a tool call from its validated input model."""
+    credentials = get_token_pool().fingerprint()
+    digest = hashlib.sha256()
+    digest.update(type(input).__name__.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(input.model_dump_json().encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(credentials.encode("utf-8"))
+    return f"tool.{tool_name}:{digest.hexdigest()}"
+
+
+def _find_input(args: tuple, kwargs: dict) -> Optional[BaseModel]:
+    for value in (*args, *kwargs.values()):
+        if isinstance(value, BaseModel):
+            return value
+    return None
+
+
+def cached_tool(
+    func: Callable[..., Awaitable[Any]],
+    policy: CachePolicy,
+    name: Optional[str] = None,
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap an async tool function so its results are cached per policy.
+
+    Only successful results are cached; errors always propagate. A result
+    carrying continuation cursors is cached no longer than the cursors stay
+    valid. The wrapper keeps the original signature so FastMCP builds the
+    same input schema.
+    """
+    tool_name = name or func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        input = _find_input(args, kwargs)
+        if input is None or not tool_cache_enabled():
+            return await func(*args, **kwargs)
+
+        ttl = policy.ttl_for(input)
+        if ttl <= 0:
+            return await func(*args, **kwargs)
+
+        key = tool_cache_key(tool_name, input)
+        cached = await cache_aget(key)
+        if cached is not None:
+            return cached
+
+        with track_cursors() as cursors:
+            result = await func(*args, **kwargs)
+        if cursors.expires_at is not None:
+            ttl = min(ttl, int(cursors.expires_at - time.time()))
+        if ttl > 0:
+            cache_set(key, result, ttl)
+        return result
+
+    return wrapper
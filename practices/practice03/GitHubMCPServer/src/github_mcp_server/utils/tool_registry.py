@@ -0,0 +1,200 @@
+"""Tool registration, eager or lazy.
+
+Every tool lives in ``github_mcp_server.tools.<name>`` as an async function of
+the same name, next to its ``TOOL_ANNOTATIONS`` (and optional
+``CACHE_POLICY``). ``build_tool`` turns such a module into a FastMCP tool;
+importing it builds the tool's pydantic models, and FastMCP then derives the
+JSON schemas from them, which is most of the server's own startup work.
+
+In lazy mode (the default) the server instead registers ``LazyTool`` stubs
+from ``tools/manifest.json``, a generated file holding each tool's name,
+description, schemas and annotations as ``tools/list`` reports them. A stub
+imports its module and builds the real tool on its first call, then
+delegates to it. The manifest records a digest of the tool modules; when a
+module changed since the manifest was generated, the server logs a warning
+and registers the tools eagerly. Regenerate the manifest with::
+
+    python scripts/build_tool_manifest.py
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastmcp.tools import Tool
+from mcp.types import ToolAnnotations
+from pydantic import PrivateAttr
+
+from .env import env_bool
+
+
+logger = logging.getLogger("github-mcp-server")
+
+# Registered tools, in tools/list order; each is github_mcp_server.tools.<name>.<name>
+TOOL_NAMES = (
+    "search_issues",
+    "list_pull_requests",
+    "get_file_content",
+    "list_repository_contents",
+    "get_issue_details",
+    "get_pull_request_details",
+    "get_pull_request_diff",
+    "search_code",
+    "search_across_repositories",
+    "get_issue_details_batch",
+    "get_pull_request_details_batch",
+    "fetch_more",
+)
+
+TOOLS_PACKAGE = "github_mcp_server.tools"
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "tools"
+MANIFEST_PATH = TOOLS_DIR / "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def lazy_tools_enabled() -> bool:
+    """Whether tools are registered from the manifest (GITHUB_LAZY_TOOLS)."""
+    return env_bool("GITHUB_LAZY_TOOLS", True)
+
+
+def source_digest(names=TOOL_NAMES) -> str:
+    """Digest of the tool modules' source, used to detect a stale manifest."""
+    digest = hashlib.sha256()
+    for name in names:
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update((TOOLS_DIR / f"{name}.py").read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def build_tool(name: str) -> Tool:
+    """Import a tool module and build its FastMCP tool.
+
+    Args:
+        name: Tool name, which is also its module name under ``tools``
+
+    Returns:
+        FunctionTool wrapping the tool function (cached if it has a CACHE_POLICY)
+    """
+    module = importlib.import_module(f"{TOOLS_PACKAGE}.{name}")
+    func = getattr(module, name)
+    annotations = getattr(module, "TOOL_ANNOTATIONS", {})
+    # Read-only tools may declare a CACHE_POLICY to cache their results
+    cache_policy = getattr(module, "CACHE_POLICY", None)
+    if cache_policy is not None:
+        from .tool_cache import cached_tool
+
+        func = cached_tool(func, cache_policy, name=name)
+    return Tool.from_function(func, annotations=ToolAnnotations(**annotations) if annotations else None)
+
+
+def describe_tool(tool: Tool) -> Dict[str, Any]:
+    """Manifest entry of a tool: what tools/list reports for it."""
+    return tool.to_mcp_tool().model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+def build_manifest() -> Dict[str, Any]:
+    """Build the manifest by importing every tool module."""
+    return {
+        "version": MANIFEST_VERSION,
+        "source_digest": source_digest(),
+        "tools": [describe_tool(build_tool(name)) for name in TOOL_NAMES],
+    }
+
+
+def write_manifest(path: Path = MANIFEST_PATH) -> Dict[str, Any]:
+    """Regenerate the manifest file and return its content."""
+    manifest = build_manifest()
+    path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return manifest
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> Optional[Dict[str, Any]]:
+    """Load the manifest if it exists and matches the tool modules.
+
+    Returns:
+        The manifest, or None if it is missing, unreadable or stale
+    """
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Tool manifest unavailable ({e}); registering tools eagerly")
+        return None
+    names = tuple(entry.get("name") for entry in manifest.get("tools", []))
+    if manifest.get("version") != MANIFEST_VERSION or names != TOOL_NAMES:
+        logger.warning("Tool manifest does not list the registered tools; registering tools eagerly")
+        return None
+    if manifest.get("source_digest") != source_digest():
+        logger.warning(
+            "Tool manifest is older than the tool modules; registering tools eagerly. "
+            "Run scripts/build_tool_manifest.py to regenerate it."
+        )
+        return None
+    return manifest
+
+
+class LazyTool(Tool):
+    """A tool registered from its manifest entry, built on first call.
+
+    The stub reports the manifest's schemas in tools/list; ``run`` imports the
+    tool module, builds the real tool once and delegates to it, so argument
+    validation, caching and result conversion are exactly those of eager mode.
+    """
+
+    _tool: Optional[Tool] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_manifest(cls, entry: Dict[str, Any]) -> "LazyTool":
+        annotations = entry.get("annotations")
+        return cls(
+            name=entry["name"],
+            title=entry.get("title"),
+            description=entry.get("description"),
+            parameters=entry["inputSchema"],
+            output_schema=entry.get("outputSchema"),
+            annotations=ToolAnnotations(**annotations) if annotations else None,
+        )
+
+    @property
+    def loaded(self) -> bool:
+        return self._tool is not None
+
+    def load(self) -> Tool:
+        """Import the tool module and build the real tool (once)."""
+        if self._tool is None:
+            self._tool = build_tool(self.name)
+            logger.info(f"Loaded tool: {self.name}")
+        return self._tool
+
+    async def run(self, arguments: Dict[str, Any]):
+        return await self.load().run(arguments)
+
+
+def registered_tools(lazy: Optional[bool] = None) -> List[Tool]:
+    """Tools to register, as lazy stubs when possible.
+
+    Args:
+        lazy: Force lazy (True) or eager (False) registration; defaults to
+            GITHUB_LAZY_TOOLS
+
+    Returns:
+        One tool per entry of TOOL_NAMES; in eager mode tools that fail to
+        build are logged and skipped
+    """
+    if lazy is None:
+        lazy = lazy_tools_enabled()
+    manifest = load_manifest() if lazy else None
+    if manifest is not None:
+        return [LazyTool.from_manifest(entry) for entry in manifest["tools"]]
+
+    tools = []
+    for name in TOOL_NAMES:
+        try:
+            tools.append(build_tool(name))
+        except Exception as e:
+            logger.error(f"Failed to register tool '{name}': {e}")
+    return tools
@@ -0,0 +1,219 @@
+"""Recursive repository listings via the Git Trees API.
+
+``/repos/{owner}/{repo}/git/trees/{ref}?recursive=1`` returns the whole tree of
+a commit in one request, where the contents API needs one request per
+directory. Entries are kept in a compact ``TreeIndex`` (parallel arrays sorted
+by path) that answers prefix, glob and depth queries without rebuilding dicts
+for every entry.
+
+GitHub truncates recursive responses for very large trees. In that case the
+tree is walked level by level instead: each subtree is requested recursively
+on its own, concurrently (``GITHUB_TREE_CONCURRENCY``), and only subtrees that
+can contain matches for the requested prefix and depth are visited.
+
+Listings requested by SHA (commits, subtrees) are immutable and are kept in
+the disk-backed ``blob_store``, which is checked before the network.
+"""
+
+import asyncio
+import fnmatch
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import json_codec
+from .api_client import make_github_request, is_commit_sha
+from .blob_store import get_blob_store
+from .env import env_int
+from .token_pool import credential_scope
+
+
+# Compact type codes stored in the index
+_TYPE_CODES = {"blob": "f", "tree": "d", "commit": "s"}
+_TYPE_NAMES = {"f": "file", "d": "dir", "s": "submodule"}
+
+
+def _tree_concurrency() -> int:
+    return env_int("GITHUB_TREE_CONCURRENCY", 8, minimum=1)
+
+
+def path_depth(path: str, prefix: str = "") -> int:
+    """Depth of ``path`` below ``prefix`` (direct children have depth 1)."""
+    if prefix:
+        path = path[len(prefix) + 1:]
+    return path.count("/") + 1
+
+
+class TreeIndex:
+    """Sorted, array-backed index of tree entries.
+
+    Args:
+        entries: Raw entries from the trees API (``path``, ``type``, ``sha``,
+            optional ``size``)
+        tree_sha: SHA of the root tree
+    """
+
+    __slots__ = ("tree_sha", "paths", "types", "sizes", "shas")
+
+    def __init__(self, entries: List[Dict[str, Any]], tree_sha: str = ""):
+        entries = sorted(entries, key=lambda e: e["path"])
+        self.tree_sha = tree_sha
+        self.paths: List[str] = [e["path"] for e in entries]
+        self.types = "".join(_TYPE_CODES.get(e.get("type"), "f") for e in entries)
+        self.sizes = array("q", (int(e.get("size") or 0) for e in entries))
+        self.shas: List[str] = [e.get("sha", "") for e in entries]
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def cache_size(self) -> int:
+        """Approximate memory footprint (used by the cache's byte budget)."""
+        return sum(len(p) + 48 for p in self.paths) + len(self.types) + self.sizes.itemsize * len(self.sizes)
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        if not prefix:
+            return 0, len(self.paths)
+        start = bisect_left(self.paths, prefix + "/")
+        end = bisect_left(self.paths, prefix + "0")  # "0" sorts right after "/"
+        return start, end
+
+    def select(
+        self,
+        prefix: str = "",
+        pattern: Optional[str] = None,
+        max_depth: Optional[int] = None,
+    ) -> Iterator[int]:
+        """Yield positions of entries matching a path prefix, glob and depth.
+
+        Args:
+            prefix: Directory path; only entries below it are returned
+            pattern: Glob matched against the full path, or against the file
+                name when the pattern contains no "/"
+            max_depth: Maximum depth below ``prefix`` (1 = direct children)
+        """
+        prefix = prefix.strip("/")
+        match_name = pattern is not None and "/" not in pattern
+        start, end = self._range(prefix)
+        for i in range(start, end):
+            path = self.paths[i]
+            if max_depth is not None and path_depth(path, prefix) > max_depth:
+                continue
+            if pattern is not None:
+                target = path.rsplit("/", 1)[-1] if match_name else path
+                if not fnmatch.fnmatchcase(target, pattern):
+                    continue
+            yield i
+
+    def entry(self, i: int) -> Dict[str, Any]:
+        """Materialize one entry as a dict."""
+        kind = _TYPE_NAMES[self.types[i]]
+        entry: Dict[str, Any] = {"path": self.paths[i], "type": kind, "sha": self.shas[i]}
+        if kind == "file":
+            entry["size"] = self.sizes[i]
+        return entry
+
+
+async def _get_tree(owner: str, repo: str, tree: str, recursive: bool) -> Dict[str, Any]:
+    store = get_blob_store() if is_commit_sha(tree) else None
+    kind = "tree-r" if recursive else "tree"
+    scope = credential_scope()
+    if store is not None:
+        stored = await asyncio.to_thread(store.get, tree, kind, scope)
+        if stored is not None:
+            return json_codec.loads(stored)
+
+    params = {"recursive": "1"} if recursive else None
+    body = await make_github_request(f"/repos/{owner}/{repo}/git/trees/{tree}", params=params)
+    if store is not None:
+        await asyncio.to_thread(store.put, tree, json_codec.dumps(body, compact=True).encode("utf-8"), kind, scope)
+    return body
+
+
+def _rebase(entries: List[Dict[str, Any]], base: str) -> List[Dict[str, Any]]:
+    if not base:
+        return entries
+    return [{**e, "path": f"{base}/{e['path']}"} for e in entries]
+
+
+def may_contain(path: str, prefix: str, max_depth: Optional[int]) -> bool:
+    """Whether the subtree at ``path`` can hold entries we are asked for."""
+    if prefix and path != prefix and not path.startswith(prefix + "/"):
+        # Outside the prefix: only ancestors of the prefix are worth visiting
+        return prefix.startswith(path + "/")
+    if max_depth is not None and path != prefix:
+        return path_depth(path, prefix) < max_depth
+    return True
+
+
+async def _walk(
+    owner: str,
+    repo: str,
+    sha: str,
+    base: str,
+    prefix: str,
+    max_depth: Optional[int],
+    semaphore: asyncio.Semaphore,
+) -> List[Dict[str, Any]]:
+    """Collect a subtree with one recursive request, descending if truncated."""
+    async with semaphore:
+        body = await _get_tree(owner, repo, sha, recursive=True)
+    if body.get("truncated"):
+        return await _descend(owner, repo, sha, base, prefix, max_depth, semaphore)
+    return _rebase(body.get("tree", []), base)
+
+
+async def _descend(
+    owner: str,
+    repo: str,
+    sha: str,
+    base: str,
+    prefix: str,
+    max_depth: Optional[int],
+    semaphore: asyncio.Semaphore,
+) -> List[Dict[str, Any]]:
+    """List one tree level and walk its relevant subtrees concurrently."""
+    async with semaphore:
+        body = await _get_tree(owner, repo, sha, recursive=False)
+    entries = _rebase(body.get("tree", []), base)
+    subtrees = [e for e in entries if e.get("type") == "tree" and may_contain(e["path"], prefix, max_depth)]
+    nested = await asyncio.gather(*(
+        _walk(owner, repo, e["sha"], e["path"], prefix, max_depth, semaphore)
+        for e in subtrees
+    ))
+    for children in nested:
+        entries.extend(children)
+    return entries
+
+
+async def fetch_tree_index(
+    owner: str,
+    repo: str,
+    ref: Optional[str] = None,
+    prefix: str = "",
+    max_depth: Optional[int] = None,
+) -> TreeIndex:
+    """Fetch the full tree of a ref as a ``TreeIndex``.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        ref: Branch, tag or commit SHA (default branch when omitted)
+        prefix: Directory of interest; bounds the fallback walk
+        max_depth: Depth of interest below ``prefix``; bounds the fallback walk
+
+    Returns:
+        Index over every entry of the tree (or of the visited part of it)
+
+    Raises:
+        MCPError: If the tree cannot be fetched
+    """
+    prefix = prefix.strip("/")
+    body = await _get_tree(owner, repo, ref or "HEAD", recursive=True)
+    root_sha = body.get("sha", "")
+    if not body.get("truncated"):
+        return TreeIndex(body.get("tree", []), tree_sha=root_sha)
+
+    # Too large for one response: walk subtrees concurrently from the root tree
+    semaphore = asyncio.Semaphore(_tree_concurrency())
+    entries = await _descend(owner, repo, root_sha or ref or "HEAD", "", prefix, max_depth, semaphore)
+    return TreeIndex(entries, tree_sha=root_sha)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Ensure 'src' is on sys.path so imports like 'github_mcp_server.*' work without installing the package
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from github_mcp_server.utils.blob_store import reset_blob_store  # noqa: E402
+from github_mcp_server.utils.http_client import ClientSettings, get_client_manager  # noqa: E402
+from github_mcp_server.utils.rate_limit import get_scheduler  # noqa: E402
+from github_mcp_server.utils.result_store import reset_result_store  # noqa: E402
+from github_mcp_server.utils.token_pool import reset_token_pool  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def blob_store_dir(tmp_path, monkeypatch):
+    """Keep the disk blob store of every test in its own temporary directory."""
+    monkeypatch.setenv("GITHUB_CACHE_DIR", str(tmp_path / "cache"))
+    reset_blob_store()
+    yield tmp_path / "cache"
+    reset_blob_store()
+
+
+@pytest.fixture(autouse=True)
+def result_store():
+    """Give every test a fresh store of truncated results."""
+    reset_result_store()
+    yield
+    reset_result_store()
+
+
+@pytest.fixture
+def mock_github():
+    """Route the shared HTTP client through an ``httpx.MockTransport``.
+
+    Usage: ``mock_github(handler)`` where ``handler(request) -> httpx.Response``.
+    """
+    manager = get_client_manager()
+
+    def install(handler, settings: ClientSettings | None = None):
+        manager.configure(settings, transport=httpx.MockTransport(handler))
+        return manager
+
+    yield install
+    manager.configure(ClientSettings.from_env(), transport=None)
+    get_scheduler().reset()
+    reset_token_pool()
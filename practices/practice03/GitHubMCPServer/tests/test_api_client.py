@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from github_mcp_server.utils import conditional
+from github_mcp_server.utils.api_client import make_github_request
+from github_mcp_server.utils.cache import cache_clear
+from github_mcp_server.utils.errors import MCPError
+from github_mcp_server.utils.http_client import ClientSettings
+
+
+def test_requests_share_one_pooled_client(mock_github) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"path": request.url.path})
+
+    manager = mock_github(handler, ClientSettings(max_connections=5))
+    seen_clients = []
+
+    async def run():
+        for endpoint in ("/a", "/b"):
+            data = await make_github_request(endpoint)
+            assert data == {"path": endpoint}
+            seen_clients.append(manager.get_client())
+        await manager.aclose()
+
+    asyncio.run(run())
+
+    assert seen_clients[0] is seen_clients[1]
+    assert seen_clients[0].is_closed
+
+
+def test_conditional_get_serves_stored_body_on_304(mock_github) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"', "x-ratelimit-remaining": "4999"})
+        return httpx.Response(200, json={"number": 1}, headers={"etag": '"v1"'})
+
+    mock_github(handler)
+    cache_clear(conditional.CACHE_PREFIX)
+    before = conditional.get_conditional_stats()
+
+    async def run():
+        first = await make_github_request("/repos/o/r/issues/1")
+        first["mutated"] = True
+        second = await make_github_request("/repos/o/r/issues/1")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert calls == [None, '"v1"']
+    assert second == {"number": 1}
+    after = conditional.get_conditional_stats()
+    assert after["revalidated"] == before["revalidated"] + 1
+    assert after["fetched"] == before["fetched"] + 1
+
+
+def test_concurrent_identical_gets_are_coalesced(mock_github) -> None:
+    hits = {"ok": 0, "missing": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        if request.url.path.endswith("/missing"):
+            hits["missing"] += 1
+            return httpx.Response(404, json={"message": "Not Found"})
+        hits["ok"] += 1
+        return httpx.Response(200, json={"type": "dir"})
+
+    mock_github(handler)
+
+    async def run():
+        ok = await asyncio.gather(*[make_github_request("/repos/o/r/contents") for _ in range(5)])
+        missing = await asyncio.gather(
+            *[make_github_request("/repos/o/r/contents/missing") for _ in range(3)],
+            return_exceptions=True,
+        )
+        return ok, missing
+
+    ok, missing = asyncio.run(run())
+
+    assert ok == [{"type": "dir"}] * 5
+    assert hits == {"ok": 1, "missing": 1}
+    assert all(isinstance(e, MCPError) and e.code == 404 for e in missing)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from github_mcp_server.utils.batch_details import fetch_details, parse_items
+from github_mcp_server.utils.token_pool import reset_token_pool
+
+
+@pytest.fixture
+def authenticated(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "tok")
+    monkeypatch.delenv("GITHUB_TOKENS", raising=False)
+    monkeypatch.delenv("GITHUB_TOKENS_FILE", raising=False)
+    reset_token_pool()
+
+
+@pytest.fixture
+def anonymous(monkeypatch):
+    for name in ("GITHUB_TOKEN", "GITHUB_TOKENS", "GITHUB_TOKENS_FILE"):
+        monkeypatch.delenv(name, raising=False)
+    reset_token_pool()
+
+
+def _issue_node(number: int) -> dict:
+    return {
+        "number": number, "title": f"Issue {number}", "state": "OPEN", "url": f"https://x/{number}",
+        "author": {"login": "octocat"}, "labels": {"nodes": [{"name": "bug"}]}, "comments": {"totalCount": 2},
+    }
+
+
+def test_parse_items_accepts_references_and_numbers() -> None:
+    items = parse_items(["a/b#1", "2", "#3", "bogus"], repository="c/d")
+    assert [(i.repository, i.number) for i in items[:3]] == [("a/b", 1), ("c/d", 2), ("c/d", 3)]
+    assert items[3]["error"]["code"] == 400
+
+
+def test_graphql_chunks_preserve_order_and_item_errors(mock_github, authenticated, monkeypatch) -> None:
+    monkeypatch.setenv("GITHUB_GRAPHQL_BATCH_SIZE", "2")
+    queries = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/graphql"
+        payload = json.loads(request.content)
+        variables = payload["variables"]
+        queries.append(variables)
+        data, errors = {}, []
+        for i in range(len(variables) // 3):
+            number = variables[f"n{i}"]
+            if number == 404:
+                data[f"i{i}"] = {"issue": None}
+                errors.append({"type": "NOT_FOUND", "path": [f"i{i}", "issue"], "message": "Could not resolve"})
+            else:
+                data[f"i{i}"] = {"issue": _issue_node(number)}
+        return httpx.Response(200, json={"data": data, "errors": errors})
+
+    mock_github(handler)
+    results = asyncio.run(fetch_details("issue", ["o/r#1", "x/y#404", "o/r#3", "nope"]))
+
+    assert len(queries) == 2  # 3 valid items in chunks of 2
+    assert [r.get("number") for r in results[:3]] == [1, 404, 3]
+    assert results[0]["repository"] == "o/r"
+    assert results[0]["labels"] == ["bug"]
+    assert results[0]["state"] == "open"
+    assert results[1]["error"]["code"] == 404
+    assert "error" in results[3]
+
+
+def test_rest_fallback_without_token(mock_github, anonymous) -> None:
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        number = int(request.url.path.rsplit("/", 1)[-1])
+        if number == 2:
+            return httpx.Response(404, json={"message": "Not Found"})
+        return httpx.Response(200, json={
+            "number": number, "title": "PR", "state": "closed", "html_url": "u", "user": {"login": "a"},
+            "labels": [], "merged_at": "2024-01-01T00:00:00Z", "base": {"ref": "main"}, "head": {"ref": "f", "sha": "abc"},
+        })
+
+    mock_github(handler)
+    results = asyncio.run(fetch_details("pull_request", ["1", "2", "3"], repository="o/r"))
+
+    assert sorted(requested) == ["/repos/o/r/pulls/1", "/repos/o/r/pulls/2", "/repos/o/r/pulls/3"]
+    assert [r["number"] for r in results] == [1, 2, 3]
+    assert results[0]["base"] == "main"
+    assert results[1]["error"]["code"] == 404
+
+
+def test_failed_graphql_chunk_falls_back_to_rest(mock_github, authenticated) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/graphql":
+            return httpx.Response(200, json={"errors": [{"message": "Something went wrong"}]})
+        number = int(request.url.path.rsplit("/", 1)[-1])
+        return httpx.Response(200, json={"number": number, "title": "t", "state": "open"})
+
+    mock_github(handler)
+    results = asyncio.run(fetch_details("issue", ["o/r#5", "o/r#6"]))
+    assert [r["number"] for r in results] == [5, 6]
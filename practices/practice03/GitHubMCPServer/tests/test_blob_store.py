@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+import httpx
+
+from github_mcp_server.utils.blob_store import BlobStore, get_blob_store
+from github_mcp_server.utils.blobs import load_blob
+from github_mcp_server.utils.cache import cache_clear
+from github_mcp_server.utils.token_pool import reset_token_pool
+
+SHA_A = "a" * 40
+SHA_B = "b" * 40
+SHA_C = "c" * 40
+
+
+def test_objects_are_sharded_compressed_and_persistent(tmp_path) -> None:
+    store = BlobStore(tmp_path)
+    data = b"print('hello')\n" * 1000
+    store.put(SHA_A, data)
+
+    path = tmp_path / "objects" / "anonymous" / "aa" / ("a" * 38)
+    assert path.is_file()
+    assert path.stat().st_size < len(data)
+
+    # A new instance (e.g. after a restart) sees the same objects
+    assert BlobStore(tmp_path).get(SHA_A) == data
+    assert BlobStore(tmp_path).get(SHA_B) is None
+
+
+def test_least_recently_used_objects_are_evicted(tmp_path) -> None:
+    store = BlobStore(tmp_path, max_bytes=2500, level=0)
+    store.put(SHA_A, os.urandom(1000))
+    store.put(SHA_B, os.urandom(1000))
+    # Make A older than B, then read A so B becomes least recently used
+    os.utime(store.path_for(SHA_A), (1, 1))
+    os.utime(store.path_for(SHA_B), (2, 2))
+    store.get(SHA_A)
+
+    store.put(SHA_C, os.urandom(1000))
+
+    assert store.get(SHA_B) is None
+    assert store.get(SHA_A) is not None
+    assert store.get(SHA_C) is not None
+    assert store.stats()["bytes"] <= 2500
+
+
+def test_blobs_are_read_from_disk_before_the_network(mock_github) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, content=b"line 1\nline 2\n")
+
+    mock_github(handler)
+    cache_clear("blob:")
+    first = asyncio.run(load_blob("o", "r", SHA_A))
+
+    # Simulate a restart: in-memory cache gone, disk store still there
+    cache_clear("blob:")
+    second = asyncio.run(load_blob("o", "r", SHA_A))
+
+    assert calls == [f"/repos/o/r/git/blobs/{SHA_A}"]
+    assert first.data == second.data == b"line 1\nline 2\n"
+    assert get_blob_store().stats()["hits"] == 1
+
+
+def test_blobs_are_not_shared_between_credentials(mock_github, monkeypatch) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.headers.get("authorization"))
+        return httpx.Response(200, content=b"private\n")
+
+    mock_github(handler)
+    monkeypatch.delenv("GITHUB_TOKENS", raising=False)
+    monkeypatch.delenv("GITHUB_TOKENS_FILE", raising=False)
+    cache_clear("blob:")
+    for token in ("tok-a", "tok-b", "tok-a"):
+        monkeypatch.setenv("GITHUB_TOKEN", token)
+        reset_token_pool()
+        assert asyncio.run(load_blob("o", "r", SHA_A)).data == b"private\n"
+
+    # The second token fetched the blob itself; the first is served from cache
+    assert calls == ["Bearer tok-a", "Bearer tok-b"]
+
+    # After a restart each token reads its own part of the disk store
+    cache_clear("blob:")
+    for token in ("tok-a", "tok-c"):
+        monkeypatch.setenv("GITHUB_TOKEN", token)
+        reset_token_pool()
+        asyncio.run(load_blob("o", "r", SHA_A))
+    assert calls == ["Bearer tok-a", "Bearer tok-b", "Bearer tok-c"]
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import importlib
+import json
+
+import httpx
+
+from github_mcp_server.utils.blobs import decode_inline, read_limited, stream_blob
+from github_mcp_server.utils.cache import cache_clear
+from github_mcp_server.utils.errors import MCPError
+
+get_file_content = importlib.import_module("github_mcp_server.tools.get_file_content")
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def test_read_limited_stops_at_budget_and_sniffs_binary() -> None:
+    read = asyncio.run(read_limited(_chunks(b"abc", b"defgh", b"never"), 6))
+    assert read.data == b"abcdef"
+    assert not read.complete
+
+    read = asyncio.run(read_limited(_chunks(b"\x89PNG\x00\x01", b"rest"), 100))
+    assert read.is_binary
+    assert read.data == b""
+
+
+def test_decode_inline_decodes_only_the_budget() -> None:
+    body = "héllo wörld\n" * 1000
+    encoded = base64.encodebytes(body.encode("utf-8")).decode("ascii")
+
+    read = decode_inline(encoded, 20)
+    assert not read.complete
+    assert body.startswith(read.text())
+
+    read = decode_inline(encoded, 10**6)
+    assert read.complete
+    assert read.text() == body
+
+
+def test_text_drops_character_cut_by_budget() -> None:
+    read = decode_inline(base64.b64encode("aé".encode("utf-8")).decode(), 2)
+    assert read.text() == "a"
+
+
+def test_large_file_is_streamed_from_blobs_api(mock_github, monkeypatch) -> None:
+    requested = []
+    big = b"x" * 300_000
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append((request.url.path, request.headers["accept"]))
+        if "/contents/" in request.url.path:
+            return httpx.Response(200, json={
+                "type": "file", "name": "big.txt", "path": "big.txt", "sha": "b1",
+                "size": len(big), "encoding": "none", "content": "",
+            })
+        return httpx.Response(200, content=big)
+
+    mock_github(handler)
+    monkeypatch.setattr(get_file_content, "CHARACTER_LIMIT", 1000)
+    params = get_file_content.GetFileContentInput(repository="o/r", path="big.txt", detail="detailed")
+    result = json.loads(asyncio.run(get_file_content.get_file_content(params)))
+
+    assert requested[-1] == ("/repos/o/r/git/blobs/b1", "application/vnd.github.raw+json")
+    assert result["decoded_content"] == "x" * 1000
+    assert result["content_truncated"] is True
+    assert "content" not in result
+
+
+def test_binary_file_is_detected_from_first_chunk(mock_github) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"\x89PNG\r\n\x1a\n\x00\x00" + b"\xff" * 5000)
+
+    mock_github(handler)
+    read = asyncio.run(stream_blob("o", "r", "b2", 10**6))
+    assert read.is_binary
+    assert read.data == b""
+
+
+def test_line_windows_are_served_from_the_blob_cache(mock_github) -> None:
+    source = "".join(f"line {n}\n" for n in range(1, 501)).encode("utf-8")
+    blob_requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "/git/blobs/" in request.url.path:
+            blob_requests.append(request.url.path)
+            return httpx.Response(200, content=source)
+        return httpx.Response(200, json={
+            "type": "file", "name": "big.py", "path": "big.py", "sha": "w1",
+            "size": len(source), "encoding": "none", "content": "",
+        })
+
+    mock_github(handler)
+    cache_clear("blob:")
+
+    def window(**kwargs):
+        params = get_file_content.GetFileContentInput(repository="o/r", path="big.py", **kwargs)
+        return json.loads(asyncio.run(get_file_content.get_file_content(params)))
+
+    first = window(start_line=200, end_line=201)
+    assert first["content"] == "line 200\nline 201\n"
+    assert first["total_lines"] == 500
+    assert first["next_window"] == {"start_line": 202, "end_line": 203}
+
+    last = window(start_line=499)
+    assert last["content"] == "line 499\nline 500\n"
+    assert last["next_window"] is None
+
+    piece = window(byte_offset=0, byte_length=7)
+    assert piece["content"] == "line 1\n"
+    assert piece["next_window"] == {"byte_offset": 7, "byte_length": 7}
+
+    assert blob_requests == ["/repos/o/r/git/blobs/w1"]
+
+
+def test_line_and_byte_windows_cannot_be_combined() -> None:
+    params = get_file_content.GetFileContentInput(repository="o/r", path="a.py", start_line=1, byte_offset=0)
+    try:
+        asyncio.run(get_file_content.get_file_content(params))
+    except MCPError as e:
+        assert e.code == 400
+    else:
+        raise AssertionError("expected MCPError")
+
+
+def _serve_file(mock_github, source: bytes, contents_requests: list) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "/git/blobs/" in request.url.path:
+            return httpx.Response(200, content=source)
+        contents_requests.append(request.url.path)
+        return httpx.Response(200, json={
+            "type": "file", "name": "doc.md", "path": "doc.md", "sha": "c1",
+            "size": len(source), "encoding": "none", "content": "",
+        })
+
+    mock_github(handler)
+    cache_clear("blob:")
+    cache_clear("file-meta:")
+
+
+def _window(**kwargs) -> dict:
+    params = get_file_content.GetFileContentInput(repository="o/r", path="doc.md", **kwargs)
+    return json.loads(asyncio.run(get_file_content.get_file_content(params)))
+
+
+def test_line_windows_fit_the_token_budget_without_gaps(mock_github, monkeypatch) -> None:
+    monkeypatch.setenv("GITHUB_OUTPUT_TOKEN_LIMIT", "2000")
+    lines = [f"第{n}行：这是一个用于测试窗口的中文句子。\n" for n in range(1, 1000)]
+    contents_requests = []
+    _serve_file(mock_github, "".join(lines).encode("utf-8"), contents_requests)
+
+    read, window, windows = [], {"start_line": 1}, 0
+    while window is not None:
+        page = _window(**window)
+        assert "... [truncated]" not in page["content"]
+        assert page["content"] == "".join(lines[page["start_line"] - 1:page["end_line"]])
+        read.append(page["content"])
+        window, windows = page["next_window"], windows + 1
+    assert "".join(read) == "".join(lines)
+    assert windows > 3
+    # The path's blob SHA is remembered: only the first window asked the contents API
+    assert len(contents_requests) == 1
+
+
+def test_byte_windows_fit_the_token_budget_without_gaps(mock_github, monkeypatch) -> None:
+    monkeypatch.setenv("GITHUB_OUTPUT_TOKEN_LIMIT", "1000")
+    source = "".join(f"第{n}行：中文内容\n" for n in range(1, 800)).encode("utf-8")
+    _serve_file(mock_github, source, [])
+
+    read, window = b"", {"byte_offset": 0}
+    while window is not None:
+        page = _window(**window)
+        assert page["byte_offset"] == len(read)
+        read += page["content"].encode("utf-8")
+        window = page["next_window"]
+    assert read == source
+
+
+def test_line_over_the_budget_continues_as_a_byte_window(mock_github, monkeypatch) -> None:
+    monkeypatch.setenv("GITHUB_OUTPUT_TOKEN_LIMIT", "500")
+    source = ("短" * 5000 + "\nnext\n").encode("utf-8")
+    _serve_file(mock_github, source, [])
+
+    page = _window(start_line=1)
+    assert page["line_truncated"] is True
+    assert page["end_line"] == 0
+    rest = _window(**page["next_window"])
+    assert rest["byte_offset"] == len(page["content"].encode("utf-8"))
+    assert source.decode("utf-8").startswith(page["content"] + rest["content"])
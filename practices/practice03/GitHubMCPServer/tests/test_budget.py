@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+
+import pytest
+
+from github_mcp_server.utils import budget
+from github_mcp_server.utils.budget import count_tokens, fit_prefix, set_tokenizer, tokenizer_name
+from github_mcp_server.utils.formatters import format_response
+
+
+@pytest.fixture
+def estimate():
+    active = tokenizer_name()
+    yield set_tokenizer("estimate")
+    set_tokenizer(active.split(":")[-1])
+
+
+def _items(body: str, count: int = 200) -> dict:
+    return {"total_count": count, "items": [{"number": i, "body": body} for i in range(count)]}
+
+
+def test_estimate_by_character_class(estimate) -> None:
+    english = "The quick brown fox jumps over the lazy dog."
+    assert count_tokens(english) == 10
+    chinese = "微信公众号文章的中文正文内容"
+    assert count_tokens(chinese) == len(chinese)
+    pull = json.dumps({"number": 42, "title": "Fix bug", "user": {"login": "octocat"}}, indent=2)
+    assert len(pull) / 4 < count_tokens(pull) < len(pull) / 2
+
+
+def test_counts_are_memoized(estimate) -> None:
+    text = "memoized " * 10
+    count_tokens(text)
+    hits = budget._memo.cache_info().hits
+    assert count_tokens(text) == count_tokens(text)
+    assert budget._memo.cache_info().hits == hits + 2
+
+
+def test_fit_prefix_is_the_longest_fitting_prefix(estimate) -> None:
+    text = "中文 mixed with English words, 1234567 and symbols {}[]. " * 50
+    kept = fit_prefix(text, 300)
+    assert count_tokens(text[:kept]) <= 300 < count_tokens(text[:kept + 1])
+    assert fit_prefix(text, 10**6) == len(text)
+    assert fit_prefix(text, 300, len) == 300
+
+
+def test_unavailable_tokenizer_falls_back_to_estimate(estimate) -> None:
+    assert set_tokenizer("no-such-encoding") == "estimate"
+
+
+@pytest.mark.skipif(importlib.util.find_spec("tiktoken") is None, reason="tiktoken not installed")
+def test_tiktoken_is_used_when_installed(estimate) -> None:
+    name = set_tokenizer("auto")
+    if name == "estimate":
+        pytest.skip("tiktoken encoding could not be loaded")
+    assert name == "tiktoken:cl100k_base"
+    assert count_tokens("hello world") == 2
+
+
+def test_response_budget_is_in_tokens(estimate, monkeypatch) -> None:
+    monkeypatch.setenv("GITHUB_OUTPUT_TOKEN_LIMIT", "4000")
+    chinese = json.loads(format_response(_items("这是一个关于认证失败的问题描述" * 4), detail="detailed"))
+    english = json.loads(format_response(_items("Login fails after the token expires " * 2), detail="detailed"))
+    for parsed in (chinese, english):
+        assert parsed["_truncation"]["omitted_count"] > 0
+        assert count_tokens(json.dumps(parsed, indent=2, ensure_ascii=False)) <= 4000
+    # The same budget holds fewer CJK characters than ASCII ones
+    chinese_chars = len(json.dumps(chinese, ensure_ascii=False))
+    english_chars = len(json.dumps(english))
+    assert chinese_chars < 4000 * 2 < english_chars
+
+
+def test_markdown_text_is_cut_at_the_token_budget(estimate, monkeypatch) -> None:
+    monkeypatch.setenv("GITHUB_OUTPUT_TOKEN_LIMIT", "500")
+    text = format_response("中文内容" * 1000, format="markdown", detail="detailed")
+    body = text.split("\n\n... [Response truncated")[0]
+    assert count_tokens(body) <= 500
+    assert 'fetch_more(cursor="' in text
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from github_mcp_server.utils.cache import CacheEngine, _sweep_forever
+
+
+def test_lru_eviction_by_entry_count() -> None:
+    cache = CacheEngine(max_entries=2, max_bytes=10**6)
+    cache.set("a:1", "one")
+    cache.set("a:2", "two")
+    assert cache.get("a:1") == "one"  # 'a:1' is now most recently used
+    cache.set("b:3", "three")
+
+    assert cache.get("a:2") is None
+    assert cache.get("a:1") == "one"
+    stats = cache.stats()["namespaces"]
+    assert stats["a"]["evictions"] == 1
+    assert stats["a"]["hits"] == 2
+    assert stats["a"]["misses"] == 1
+    assert stats["b"]["entries"] == 1
+
+
+def test_byte_budget_and_sweep() -> None:
+    cache = CacheEngine(max_entries=100, max_bytes=4000)
+    for i in range(10):
+        cache.set(f"search:{i}", "x" * 1000)
+    assert cache.total_bytes <= 4000
+    assert len(cache) < 10
+
+    cache.set("search:short", "y", ttl_seconds=0)
+    time.sleep(0.01)
+    assert cache.sweep() == 1
+    assert cache.stats()["namespaces"]["search"]["expirations"] == 1
+
+
+def test_oversized_value_is_not_cached() -> None:
+    cache = CacheEngine(max_entries=10, max_bytes=100)
+    cache.set("big:1", "z" * 1000)
+    assert cache.get("big:1") is None
+    assert cache.total_bytes == 0
+
+
+def test_sweeper_survives_failing_sweeps(caplog) -> None:
+    cache = CacheEngine(max_entries=10, max_bytes=10**6)
+    calls = []
+
+    def broken() -> None:
+        calls.append("broken")
+        raise RuntimeError("disk gone")
+
+    async def run() -> None:
+        task = asyncio.create_task(_sweep_forever(cache, 0.01, (broken, lambda: calls.append("ok"))))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(run())
+    assert calls.count("broken") >= 2 and calls.count("ok") >= 2
+    assert "Periodic sweep failed" in caplog.text
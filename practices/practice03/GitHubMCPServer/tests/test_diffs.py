@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from github_mcp_server.tools.get_pull_request_diff import GetPullRequestDiffInput, get_pull_request_diff
+from github_mcp_server.utils.cache import cache_clear
+from github_mcp_server.utils.diffs import DIFF_ACCEPT, DiffBuilder, UnifiedDiffParser
+from github_mcp_server.utils.errors import MCPError
+
+
+DIFF = """diff --git a/src/app.py b/src/app.py
+index 1111111..2222222 100644
+--- a/src/app.py
++++ b/src/app.py
+@@ -1,3 +1,4 @@ import os
+ import os
++import sys
+
+ def main():
+@@ -10,2 +11,2 @@ def main():
+-    return 0
++    return 1
+ # end
+diff --git a/old.txt b/new.txt
+similarity index 90%
+rename from old.txt
+rename to new.txt
+index 3333333..4444444 100644
+--- a/old.txt
++++ b/new.txt
+@@ -1 +1 @@
+-hello
++hello world
+diff --git a/added.md b/added.md
+new file mode 100644
+index 0000000..5555555
+--- /dev/null
++++ b/added.md
+@@ -0,0 +1,2 @@
++# Title
+++++ not a header
+diff --git a/gone.txt b/gone.txt
+deleted file mode 100644
+index 6666666..0000000
+--- a/gone.txt
++++ /dev/null
+@@ -1 +0,0 @@
+-bye
+diff --git a/logo.png b/logo.png
+index 7777777..8888888 100644
+Binary files a/logo.png and b/logo.png differ
+"""
+
+PULL = {"number": 7, "head": {"sha": "a" * 40}, "base": {"sha": "b" * 40}}
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache_clear()
+    yield
+    cache_clear()
+
+
+def _parse(text: str):
+    builder = DiffBuilder(count_lines=True)
+    parser = UnifiedDiffParser(builder)
+    for line in text.split("\n"):
+        parser.feed(line)
+    return builder.finish()
+
+
+def test_unified_diff_is_indexed_per_file_and_hunk() -> None:
+    index = _parse(DIFF)
+    summary = [(f.path, f.previous_path, f.status, f.additions, f.deletions, len(f.hunks)) for f in index.files]
+    assert summary == [
+        ("src/app.py", None, "modified", 2, 1, 2),
+        ("new.txt", "old.txt", "renamed", 1, 1, 1),
+        ("added.md", None, "added", 2, 0, 1),
+        ("gone.txt", None, "removed", 0, 1, 1),
+        ("logo.png", None, "modified", 0, 0, 0),
+    ]
+    assert index.files[4].binary
+    second = index.files[0].hunks[1]
+    assert (second.old_start, second.old_lines, second.new_start, second.new_lines) == (10, 2, 11, 2)
+    assert index.patch(second) == "@@ -10,2 +11,2 @@ def main():\n-    return 0\n+    return 1\n # end\n"
+    assert index.find("old.txt") is index.files[1]
+
+
+def _files_handler(calls: list):
+    files = [
+        {"filename": "src/app.py", "status": "modified", "additions": 2, "deletions": 1,
+         "patch": DIFF.split("+++ b/src/app.py\n")[1].split("diff --git")[0].rstrip("\n")},
+        {"filename": "logo.png", "status": "modified", "additions": 0, "deletions": 0},
+        {"filename": "huge.sql", "status": "added", "additions": 90000, "deletions": 0},
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/files"):
+            return httpx.Response(200, json=files)
+        return httpx.Response(200, json=PULL)
+
+    return handler
+
+
+def test_file_index_then_hunk_windows_reuse_the_parsed_diff(mock_github) -> None:
+    calls = []
+    mock_github(_files_handler(calls))
+
+    index = json.loads(asyncio.run(get_pull_request_diff(GetPullRequestDiffInput(
+        repository="acme/app", pull_number=7,
+    ))))
+    assert index["changed_files"] == 3 and index["head_sha"] == "a" * 40
+    assert index["items"][0] == {"path": "src/app.py", "status": "modified", "additions": 2, "deletions": 1, "hunk_count": 2}
+    assert index["items"][2]["patch_missing"] is True
+
+    window = json.loads(asyncio.run(get_pull_request_diff(GetPullRequestDiffInput(
+        repository="acme/app", pull_number=7, file="src/app.py", max_hunks=1,
+    ))))
+    assert [h["hunk"] for h in window["items"]] == [1] and window["next_hunk"] == 2
+    assert window["items"][0]["patch"].startswith("@@ -1,3 +1,4 @@ import os\n import os\n+import sys")
+
+    markdown = asyncio.run(get_pull_request_diff(GetPullRequestDiffInput(
+        repository="acme/app", pull_number=7, file="src/app.py", hunk=2, format="markdown",
+    )))
+    assert "```diff\n@@ -10,2 +11,2 @@ def main():\n-    return 0" in markdown
+    assert calls.count("/repos/acme/app/pulls/7/files") == 1
+
+
+def test_streamed_diff_source(mock_github) -> None:
+    accepts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        accepts.append(request.headers.get("accept"))
+        if request.headers.get("accept") == DIFF_ACCEPT:
+            return httpx.Response(200, content=DIFF.encode("utf-8"))
+        return httpx.Response(200, json=PULL)
+
+    mock_github(handler)
+    window = json.loads(asyncio.run(get_pull_request_diff(GetPullRequestDiffInput(
+        repository="acme/app", pull_number=7, file="new.txt", source="diff",
+    ))))
+    assert window["previous_path"] == "old.txt" and window["status"] == "renamed"
+    assert window["items"][0]["patch"] == "@@ -1 +1 @@\n-hello\n+hello world\n"
+    assert DIFF_ACCEPT in accepts
+
+
+def test_unknown_file_and_hunk_are_rejected(mock_github) -> None:
+    mock_github(_files_handler([]))
+    with pytest.raises(MCPError) as exc:
+        asyncio.run(get_pull_request_diff(GetPullRequestDiffInput(repository="acme/app", pull_number=7, file="nope.py")))
+    assert exc.value.code == 404
+    with pytest.raises(MCPError) as exc:
+        asyncio.run(get_pull_request_diff(GetPullRequestDiffInput(
+            repository="acme/app", pull_number=7, file="src/app.py", hunk=5,
+        )))
+    assert exc.value.code == 400
+
+
+def test_hunk_windows_are_sized_by_the_token_budget(mock_github, monkeypatch) -> None:
+    lines = "".join(f"+line {n} of a long hunk\n" for n in range(200))
+    patch = "".join(f"@@ -{n * 1000},1 +{n * 1000},201 @@\n-old\n{lines}" for n in range(1, 6))
+    files = [{"filename": "big.py", "status": "modified", "additions": 1000, "deletions": 5, "patch": patch}]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=files if request.url.path.endswith("/files") else PULL)
+
+    mock_github(handler)
+    monkeypatch.setenv("GITHUB_OUTPUT_TOKEN_LIMIT", "5000")
+
+    window = json.loads(asyncio.run(get_pull_request_diff(GetPullRequestDiffInput(
+        repository="acme/app", pull_number=7, file="big.py",
+    ))))
+    assert "_truncation" not in window
+    returned = [h["hunk"] for h in window["items"]]
+    assert 1 <= len(returned) < 5 and window["next_hunk"] == returned[-1] + 1
+    assert all(h["patch"].endswith("+line 199 of a long hunk\n") for h in window["items"])
+
+    markdown = asyncio.run(get_pull_request_diff(GetPullRequestDiffInput(
+        repository="acme/app", pull_number=7, file="big.py", format="markdown", fields=["path", "next_hunk"],
+    )))
+    assert "big.py" in markdown and "```diff" not in markdown
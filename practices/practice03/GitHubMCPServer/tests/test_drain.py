@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastmcp import Client, FastMCP
+
+from github_mcp_server.utils.drain import DrainMiddleware
+
+
+def _server(drain: DrainMiddleware, release: asyncio.Event) -> FastMCP:
+    server = FastMCP(name="drain-test")
+    server.add_middleware(drain)
+
+    @server.tool
+    async def slow() -> str:
+        await release.wait()
+        return "done"
+
+    return server
+
+
+def test_draining_refuses_new_calls_and_waits_for_running_ones() -> None:
+    drain = DrainMiddleware()
+
+    async def run():
+        release = asyncio.Event()
+        async with Client(_server(drain, release)) as client:
+            running = asyncio.create_task(client.call_tool("slow", {}))
+            while drain.in_flight == 0:
+                await asyncio.sleep(0.01)
+
+            drain.begin()
+            refused = await client.call_tool("slow", {}, raise_on_error=False)
+            assert await drain.wait_idle(0.05) is False
+
+            release.set()
+            assert await drain.wait_idle(1) is True
+            return (await running).data, refused
+
+    result, refused = asyncio.run(run())
+    assert result == "done"
+    assert refused.is_error and "shutting down" in refused.content[0].text
+    assert drain.stats() == {"in_flight": 0, "completed": 1, "refused": 1, "draining": True}
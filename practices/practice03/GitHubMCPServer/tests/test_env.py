@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+
+from github_mcp_server.utils.env import env_bool, env_float, env_int, env_int_set
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, True), ("", True), ("off", False), ("No", False), ("1", True), (" TRUE ", True), ("maybe", True)],
+)
+def test_env_bool_uses_one_rule(monkeypatch, value, expected) -> None:
+    if value is None:
+        monkeypatch.delenv("X_FLAG", raising=False)
+    else:
+        monkeypatch.setenv("X_FLAG", value)
+    assert env_bool("X_FLAG", True) is expected
+
+
+def test_env_numbers_fall_back_and_clamp(monkeypatch) -> None:
+    monkeypatch.setenv("X_INT", "abc")
+    assert env_int("X_INT", 4) == 4
+    monkeypatch.setenv("X_INT", "0")
+    assert env_int("X_INT", 4) == 0
+    assert env_int("X_INT", 4, minimum=1) == 1
+    monkeypatch.setenv("X_FLOAT", "-2.5")
+    assert env_float("X_FLOAT", 30.0) == -2.5
+    assert env_float("X_FLOAT", 30.0, minimum=0.0) == 0.0
+    monkeypatch.setenv("X_FLOAT", "")
+    assert env_float("X_FLOAT", 30.0) == 30.0
+
+
+def test_env_int_set_parses_comma_lists(monkeypatch) -> None:
+    default = frozenset({500})
+    monkeypatch.setenv("X_CODES", " 502, 503,,")
+    assert env_int_set("X_CODES", default) == {502, 503}
+    monkeypatch.setenv("X_CODES", "502,bad")
+    assert env_int_set("X_CODES", default) == default
+    monkeypatch.setenv("X_CODES", "")
+    assert env_int_set("X_CODES", default) == default
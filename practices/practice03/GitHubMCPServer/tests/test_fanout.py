@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from github_mcp_server.tools.search_across_repositories import (
+    SearchAcrossRepositoriesInput,
+    search_across_repositories,
+)
+from github_mcp_server.utils.errors import MCPError
+from github_mcp_server.utils.fanout import MAX_QUERY_LENGTH, merge_results, pack_qualifiers
+
+
+REPOS = [f"acme/service-{i:02d}" for i in range(40)]
+
+
+def _issue(repository: str, number: int, updated: str) -> dict:
+    return {
+        "id": hash((repository, number)),
+        "number": number,
+        "title": f"Leak in {repository}",
+        "state": "open",
+        "html_url": f"https://github.com/{repository}/issues/{number}",
+        "repository_url": f"https://api.github.com/repos/{repository}",
+        "user": {"login": "octocat"},
+        "comments": number,
+        "updated_at": updated,
+        "body": "x" * 200,
+    }
+
+
+def test_qualifiers_are_packed_into_the_fewest_queries() -> None:
+    qualifiers = [f"repo:{repo}" for repo in REPOS]
+    queries = pack_qualifiers("memory leak", qualifiers)
+    assert all(len(query) <= MAX_QUERY_LENGTH for query in queries)
+    total = sum(len(q) + 1 for q in qualifiers)
+    assert len(queries) == -(-total // (MAX_QUERY_LENGTH - len("memory leak")))
+    packed = [part for query in queries for part in query.split() if part.startswith("repo:")]
+    assert sorted(packed) == sorted(qualifiers)
+    assert all(query.startswith("memory leak repo:") for query in queries)
+
+
+def test_qualifier_that_cannot_fit_is_rejected() -> None:
+    with pytest.raises(MCPError) as exc:
+        pack_qualifiers("x" * 250, ["repo:acme/service"])
+    assert exc.value.code == 400
+
+
+def test_merge_dedupes_and_reranks() -> None:
+    a = {"total_count": 2, "incomplete_results": False, "items": [
+        _issue("acme/a", 1, "2024-01-03"), _issue("acme/a", 2, "2024-01-01"),
+    ]}
+    b = {"total_count": 2, "incomplete_results": True, "items": [
+        _issue("acme/b", 3, "2024-01-02"), _issue("acme/a", 1, "2024-01-03"),
+    ]}
+    merged = merge_results([a, b], sort="updated", order="desc", limit=10)
+    assert [item["number"] for item in merged["items"]] == [1, 3, 2]
+    assert merged["total_count"] == 4 and merged["incomplete_results"] is True
+    ascending = merge_results([a, b], sort="updated", order="asc", limit=2)
+    assert [item["number"] for item in ascending["items"]] == [2, 3]
+
+
+def test_fan_out_runs_queries_concurrently_and_merges(mock_github) -> None:
+    seen = []
+    active = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        query = request.url.params["q"]
+        seen.append(query)
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        repos = [part[5:] for part in query.split() if part.startswith("repo:")]
+        items = [_issue(repo, i + 1, f"2024-01-{i + 1:02d}") for i, repo in enumerate(repos[:3])]
+        return httpx.Response(200, json={"total_count": len(items), "incomplete_results": False, "items": items})
+
+    mock_github(handler)
+    result = json.loads(asyncio.run(search_across_repositories(SearchAcrossRepositoriesInput(
+        query="leak", repositories=REPOS, sort="updated", limit=5,
+    ))))
+
+    assert result["queries"] == len(seen) > 1 and peak > 1
+    assert all(request.startswith("leak repo:") for request in seen)
+    updated = [item["updated_at"] for item in result["items"]]
+    assert len(updated) == 5 and updated == sorted(updated, reverse=True)
+    assert result["items"][0]["repository"].startswith("acme/service-")
+    assert "body" not in result["items"][0]
+
+
+def test_failed_queries_are_reported(mock_github) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["q"])
+        if len(calls) == 1:
+            return httpx.Response(422, json={"message": "Validation Failed"})
+        return httpx.Response(200, json={"total_count": 1, "incomplete_results": False, "items": [
+            _issue("acme/service-00", len(calls), "2024-01-01"),
+        ]})
+
+    mock_github(handler)
+    result = json.loads(asyncio.run(search_across_repositories(SearchAcrossRepositoriesInput(
+        query="leak", repositories=REPOS,
+    ))))
+    assert len(result["errors"]) == 1 and result["errors"][0]["code"] == 400
+    assert len(result["items"]) == result["queries"] - 1
+
+
+def test_organization_needs_a_single_query(mock_github) -> None:
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.path, request.url.params["q"], request.url.params.get("sort")))
+        return httpx.Response(200, json={"total_count": 0, "incomplete_results": False, "items": []})
+
+    mock_github(handler)
+    asyncio.run(search_across_repositories(SearchAcrossRepositoriesInput(
+        query="def login", organization="acme", type="code", sort="updated",
+    )))
+    assert seen == [("/search/code", "def login org:acme", None)]
+
+
+def test_repositories_or_organization_is_required() -> None:
+    with pytest.raises(MCPError) as exc:
+        asyncio.run(search_across_repositories(SearchAcrossRepositoriesInput(query="leak")))
+    assert exc.value.code == 400
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+import subprocess
+from pathlib import Path
+
+import httpx
+import pytest
+
+from github_mcp_server.utils.git_mirror import GitMirror, MirrorManager, set_mirror_manager
+
+get_file_content = importlib.import_module("github_mcp_server.tools.get_file_content")
+list_contents = importlib.import_module("github_mcp_server.tools.list_repository_contents")
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+        cwd=cwd, check=True, capture_output=True, text=True,
+    ).stdout
+
+
+@pytest.fixture
+def origin(tmp_path) -> Path:
+    repo = tmp_path / "origin"
+    (repo / "src" / "pkg").mkdir(parents=True)
+    (repo / "README.md").write_text("# Demo\n")
+    (repo / "src" / "app.py").write_text("".join(f"print({n})\n" for n in range(1, 101)))
+    (repo / "src" / "pkg" / "util.py").write_text("X = 1\n")
+    _git(tmp_path, "init", "-q", "-b", "main", str(repo))
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "initial")
+    return repo
+
+
+@pytest.fixture
+def mirror(tmp_path, origin):
+    mirror = GitMirror("o", "r", tmp_path / "mirrors" / "o" / "r.git", str(origin))
+    manager = MirrorManager([mirror])
+    asyncio.run(manager.sync_all())
+    set_mirror_manager(manager)
+    yield mirror
+    asyncio.run(manager.stop())
+    set_mirror_manager(None)
+
+
+def _no_network(request: httpx.Request) -> httpx.Response:
+    raise AssertionError(f"unexpected API request {request.url}")
+
+
+def test_mirror_reads_files_and_trees(mirror) -> None:
+    async def run():
+        found = await mirror.read_file("main", "src/pkg/util.py", 1024)
+        missing = await mirror.read_file("main", "nope.txt", 1024)
+        index = await mirror.tree_index(None, prefix="src")
+        await mirror.close()
+        return found, missing, index
+
+    found, missing, index = asyncio.run(run())
+
+    assert found[1:] == (6, b"X = 1\n")
+    assert missing is None
+    assert [index.paths[i] for i in index.select("src")] == ["src/app.py", "src/pkg", "src/pkg/util.py"]
+    assert index.entry(index.paths.index("src/pkg/util.py"))["size"] == 6
+
+
+def test_tools_use_the_mirror_without_network(mirror, mock_github) -> None:
+    mock_github(_no_network)
+
+    async def run():
+        file_params = get_file_content.GetFileContentInput(repository="o/r", path="src/app.py", start_line=99)
+        dir_params = list_contents.ListRepositoryContentsInput(repository="o/r", path="src", detail="detailed")
+        window = await get_file_content.get_file_content(file_params)
+        listing = await list_contents.list_repository_contents(dir_params)
+        await mirror.close()
+        return json.loads(window), json.loads(listing)
+
+    window, listing = asyncio.run(run())
+    assert window["content"] == "print(99)\nprint(100)\n"
+    assert window["total_lines"] == 100
+    assert [(e["name"], e["type"]) for e in listing] == [("app.py", "file"), ("pkg", "dir")]
+
+
+def test_fetch_picks_up_new_commits(mirror, origin) -> None:
+    (origin / "NEW.md").write_text("new\n")
+    _git(origin, "add", ".")
+    _git(origin, "commit", "-q", "-m", "second")
+
+    async def run():
+        before = await mirror.read_file("main", "NEW.md", 1024)
+        await mirror.sync()
+        after = await mirror.read_file("main", "NEW.md", 1024)
+        await mirror.close()
+        return before, after
+
+    before, after = asyncio.run(run())
+    assert before is None
+    assert after[2] == b"new\n"
+
+
+def test_large_mirrored_files_are_read_up_to_the_blob_cap(mirror, mock_github, monkeypatch) -> None:
+    mock_github(_no_network)
+    monkeypatch.setenv("GITHUB_BLOB_MAX_BYTES", "100")
+
+    async def run():
+        prefix = await mirror.read_file("main", "src/app.py", 100)
+        params = get_file_content.GetFileContentInput(repository="o/r", path="src/app.py", start_line=1)
+        window = await get_file_content.get_file_content(params)
+        await mirror.close()
+        return prefix, json.loads(window)
+
+    prefix, window = asyncio.run(run())
+    assert prefix[1] == 992
+    assert len(prefix[2]) == 100
+    assert window["total_lines"] is None
+    assert window["content"].startswith("print(1)\nprint(2)\n")
+    assert len(window["content"]) <= 100
+
+
+def test_close_waits_for_queries_in_flight(mirror) -> None:
+    async def run():
+        names = ["main:src/app.py"] * 200
+        queries = asyncio.gather(mirror._contents.query(names), mirror._contents.query(names))
+        await asyncio.sleep(0)
+        await mirror.close()
+        results = await queries
+        await mirror.close()
+        return results
+
+    results = asyncio.run(run())
+    assert all(info is not None for result in results for info in result)
+
+
+def test_mirror_errors_fall_back_to_the_api(mirror, mock_github, monkeypatch) -> None:
+    async def broken(*args, **kwargs):
+        raise RuntimeError("git cat-file exited unexpectedly")
+
+    monkeypatch.setattr(mirror, "read_file", broken)
+    monkeypatch.setattr(mirror, "list_directory", broken)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/contents/src"):
+            return httpx.Response(200, json=[{"name": "app.py", "path": "src/app.py", "type": "file", "sha": "s1", "size": 1}])
+        return httpx.Response(200, json={"type": "file", "name": "app.py", "path": "src/app.py", "sha": "s1", "size": 1})
+
+    mock_github(handler)
+
+    async def run():
+        file_params = get_file_content.GetFileContentInput(repository="o/r", path="src/app.py")
+        dir_params = list_contents.ListRepositoryContentsInput(repository="o/r", path="src")
+        return (
+            json.loads(await get_file_content.get_file_content(file_params)),
+            await list_contents.list_repository_contents(dir_params),
+        )
+
+    found, listing = asyncio.run(run())
+    assert found["sha"] == "s1"
+    assert "app.py" in listing
+
+
+def test_unmirrored_repositories_fall_back_to_the_api(mirror, mock_github) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"type": "file", "name": "a.py", "path": "a.py", "sha": "s1", "size": 1})
+
+    mock_github(handler)
+    params = get_file_content.GetFileContentInput(repository="other/repo", path="a.py")
+    result = json.loads(asyncio.run(get_file_content.get_file_content(params)))
+    assert result["name"] == "a.py"
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+
+import pytest
+
+from github_mcp_server.utils import json_codec
+from github_mcp_server.utils.serializer import encode_json
+
+
+BACKENDS = [
+    pytest.param(name, marks=pytest.mark.skipif(
+        name != "json" and importlib.util.find_spec(name) is None, reason=f"{name} not installed"
+    ))
+    for name in ("json", "orjson", "msgspec")
+]
+
+PULL = {
+    "id": 2**40,
+    "number": 42,
+    "title": "Fix \"quotes\", back\\slashes and\nnewlines\t",
+    "body": "中文正文 🚀 \u2028 \x00\x1f\x7f é",
+    "draft": False,
+    "merged_at": None,
+    "score": 1.0,
+    "ratio": 0.25,
+    "labels": [{"name": "bug", "color": "d73a4a"}, {"name": "ui", "color": ""}],
+    "user": {"login": "octocat", "site_admin": False},
+    "head": {"ref": "feature", "repo": {"full_name": "a/b", "topics": []}},
+    "empty": {},
+    "nested": [[], [[]], [{}], [1, -2, 3.5, -0.0, 123456789012.125]],
+}
+
+FALLBACKS = [
+    {"big": 2**70},
+    {"nan": float("nan"), "inf": float("-inf")},
+    {"tiny": 1e-7, "huge": 1e20},
+    {1: "int key", None: "null key", True: "bool key"},
+    {"surrogate": "\ud800"},
+    ("tuple", ["inside"]),
+]
+
+
+@pytest.fixture
+def backend(request):
+    active = json_codec.backend_name()
+    yield json_codec.set_backend(request.param)
+    json_codec.set_backend(active)
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+@pytest.mark.parametrize("value", [PULL, [PULL, PULL], {"total_count": 2, "items": [PULL]}, [], {}, "s", 3, None])
+def test_dumps_matches_stdlib(backend, value) -> None:
+    assert json_codec.dumps(value) == json.dumps(value, indent=2, ensure_ascii=False)
+    assert json_codec.dumps(value, compact=True) == json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+@pytest.mark.parametrize("value", FALLBACKS)
+def test_values_fast_backends_handle_differently_fall_back(backend, value) -> None:
+    assert json_codec.dumps(value) == json.dumps(value, indent=2, ensure_ascii=False)
+    assert json_codec.dumps(value, compact=True) == json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+@pytest.mark.parametrize("text", [
+    json.dumps(PULL),
+    '{"big": 1180591620717411303424, "nan": NaN}',
+    "[1.5e300, -0.0, \"\\u00e9\"]",
+])
+def test_loads_matches_stdlib(backend, text) -> None:
+    expected = json.loads(text)
+    for data in (text, text.encode("utf-8")):
+        assert json.dumps(json_codec.loads(data)) == json.dumps(expected)
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+def test_loads_rejects_invalid_json(backend) -> None:
+    with pytest.raises(ValueError):
+        json_codec.loads(b"{not json")
+
+
+@pytest.mark.parametrize("backend", BACKENDS, indirect=True)
+def test_budgeted_encoder_compact_mode(backend) -> None:
+    data = {"total_count": 300, "items": [PULL] * 300}
+    assert encode_json(data, 10**7, compact=True).text == json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    result = encode_json(data, 20_000, compact=True)
+    parsed = json.loads(result.text)
+    assert "\n" not in result.text.replace("\\n", "")
+    assert len(parsed["items"]) == result.emitted and parsed["_truncation"]["omitted_count"] == 300 - result.emitted
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+
+import httpx
+
+from github_mcp_server.utils.pagination import (
+    collect_items,
+    collect_search_results,
+    paginate,
+    parse_link_header,
+)
+
+list_pull_requests = importlib.import_module("github_mcp_server.tools.list_pull_requests")
+fetch_more = importlib.import_module("github_mcp_server.tools.fetch_more")
+
+API = "https://api.github.com"
+
+
+def _link(path: str, **rels: int) -> str:
+    return ", ".join(f'<{API}{path}?per_page=100&page={page}>; rel="{rel}"' for rel, page in rels.items())
+
+
+def test_parse_link_header() -> None:
+    links = parse_link_header(_link("/repos/o/r/pulls", next=2, last=5))
+    assert links["next"].endswith("page=2")
+    assert links["last"].endswith("page=5")
+    assert parse_link_header(None) == {}
+
+
+def test_known_last_page_is_fetched_concurrently_in_order(mock_github) -> None:
+    in_flight = 0
+    peak = 0
+    requested = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        page = int(request.url.params["page"])
+        requested.append(page)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later pages answer first to prove ordering is preserved
+        await asyncio.sleep(0.01 * (6 - page))
+        in_flight -= 1
+        items = [{"number": (page - 1) * 100 + i} for i in range(100)]
+        headers = {"link": _link("/repos/o/r/pulls", next=page + 1, last=5)} if page == 1 else {}
+        return httpx.Response(200, json=items, headers=headers)
+
+    mock_github(handler)
+
+    async def run():
+        pages = paginate("/repos/o/r/pulls", max_items=350, concurrency=3)
+        return await collect_items(pages, 350)
+
+    items, first, next_page = asyncio.run(run())
+
+    assert [item["number"] for item in items] == list(range(350))
+    assert first.number == 1 and next_page is None
+    # Only the pages needed for 350 items, pages 2-4 in parallel
+    assert sorted(requested) == [1, 2, 3, 4]
+    assert peak == 3
+
+
+def test_next_links_are_followed_until_exhausted(mock_github) -> None:
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        requested.append(page)
+        headers = {"link": _link("/search/issues", next=page + 1)} if page < 3 else {}
+        body = {"total_count": 250, "incomplete_results": False, "items": [{"id": page}] * 100}
+        if page == 3:
+            body["items"] = [{"id": 3}] * 50
+        return httpx.Response(200, json=body, headers=headers)
+
+    mock_github(handler)
+
+    result, resume = asyncio.run(collect_search_results("/search/issues", {"q": "bug"}, limit=1000))
+
+    assert requested == [1, 2, 3]
+    assert result["total_count"] == 250
+    assert len(result["items"]) == 250 and resume is None
+
+
+def test_detailed_list_over_budget_is_resumable_with_fetch_more(mock_github) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        items = [{"number": (page - 1) * 100 + i, "body": "x" * 2000} for i in range(100)]
+        return httpx.Response(200, json=items, headers={"link": _link("/repos/o/r/pulls", next=page + 1)})
+
+    mock_github(handler)
+    list_input = list_pull_requests.ListPullRequestsInput(repository="o/r", detail="detailed", limit=150)
+    page = json.loads(asyncio.run(list_pull_requests.list_pull_requests(list_input)))
+    seen = [item["number"] for item in page["items"]]
+    assert page["_truncation"]["omitted_count"] == 150 - len(seen) > 0
+
+    while "_truncation" in page:
+        more = fetch_more.FetchMoreInput(cursor=page["_truncation"]["next_cursor"])
+        page = json.loads(asyncio.run(fetch_more.fetch_more(more)))
+        seen.extend(item["number"] for item in page["items"])
+    assert seen == list(range(150))
+
+
+def test_pages_stop_at_the_budget_and_fetch_more_resumes_from_github(mock_github) -> None:
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        requested.append((page, int(request.url.params["per_page"])))
+        items = [{"number": (page - 1) * 100 + i, "body": "lorem ipsum " * 100} for i in range(100)]
+        return httpx.Response(200, json=items, headers={"link": _link("/repos/o/r/pulls", next=page + 1)})
+
+    mock_github(handler)
+    list_input = list_pull_requests.ListPullRequestsInput(repository="o/r", detail="detailed", limit=1000)
+    page = json.loads(asyncio.run(list_pull_requests.list_pull_requests(list_input)))
+    first_requests = len(requested)
+    assert first_requests < 10
+    seen = [item["number"] for item in page["items"]]
+
+    while "_truncation" in page:
+        more = fetch_more.FetchMoreInput(cursor=page["_truncation"]["next_cursor"])
+        page = json.loads(asyncio.run(fetch_more.fetch_more(more)))
+        seen.extend(item["number"] for item in page["items"])
+        # Pages are only fetched as the stored items run out
+        assert len(requested) <= first_requests + len(seen) // 100
+
+    assert seen == list(range(1000))
+    assert requested == [(page, 100) for page in range(1, 11)]
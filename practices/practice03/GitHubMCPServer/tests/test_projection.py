@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+
+import httpx
+import pytest
+
+from github_mcp_server.utils.errors import MCPError
+from github_mcp_server.utils.formatters import format_response
+from github_mcp_server.utils.projection import IDENTITY, Projection, compile_fields
+
+
+PULL = {
+    "number": 7,
+    "title": "Fix",
+    "user": {"login": "octocat", "id": 1, "avatar_url": "https://x"},
+    "labels": [{"name": "bug", "color": "f00"}, {"name": "ui", "color": "0f0"}],
+    "head": {"ref": "feature", "sha": "abc", "repo": {"full_name": "a/b", "owner": {"login": "a"}}},
+    "base": {"ref": "main", "repo": {"full_name": "a/b"}},
+}
+
+
+def test_compile_fields_builds_a_cached_tree() -> None:
+    spec = compile_fields(("number", "user.login", "labels[].name", "head"))
+    assert spec == {"number": None, "user": {"login": None}, "labels": {"name": None}, "head": None}
+    assert compile_fields(("number", "user.login", "labels[].name", "head")) is spec
+    # A shorter path wins over a longer one on the same key
+    assert compile_fields(("head.ref", "head")) == {"head": None}
+    assert compile_fields(("head", "head.ref")) == {"head": None}
+
+
+@pytest.mark.parametrize("field", ["", "user.", ".login", "a..b"])
+def test_compile_fields_rejects_malformed_paths(field: str) -> None:
+    with pytest.raises(MCPError) as exc:
+        compile_fields((field,))
+    assert exc.value.code == 400
+
+
+def test_projection_selects_nested_fields_in_order() -> None:
+    projection = Projection(["title", "user.login", "labels[].name", "head.ref", "missing"])
+    assert projection.apply(PULL) == {
+        "title": "Fix",
+        "user": {"login": "octocat"},
+        "labels": [{"name": "bug"}, {"name": "ui"}],
+        "head": {"ref": "feature"},
+    }
+
+
+def test_projection_follows_payload_shape() -> None:
+    projection = Projection(["number"])
+    assert projection.apply([PULL, PULL]) == [{"number": 7}, {"number": 7}]
+    envelope = {"total_count": 2, "incomplete_results": False, "facets": {"x": 1}, "items": [PULL, "plain"]}
+    assert projection.apply(envelope) == {
+        "total_count": 2,
+        "incomplete_results": False,
+        "items": [{"number": 7}, "plain"],
+    }
+
+
+def test_format_response_uses_projection_only_when_concise() -> None:
+    projection = Projection(["number", "head.ref"])
+    concise = json.loads(format_response(PULL, detail="concise", projection=projection))
+    assert concise == {"number": 7, "head": {"ref": "feature"}}
+    detailed = json.loads(format_response(PULL, detail="detailed", projection=projection))
+    assert detailed == PULL
+    # Caller-selected fields override both
+    selected = json.loads(format_response(PULL, detail="detailed", projection=projection, fields=["base.ref"]))
+    assert selected == {"base": {"ref": "main"}}
+
+
+def test_concise_output_without_a_field_set_uses_the_identity_projection() -> None:
+    envelope = {"total_count": 1, "facets": {"x": 1}, "items": [PULL]}
+    assert IDENTITY.apply(envelope) is envelope
+    assert json.loads(format_response(envelope, detail="concise")) == envelope
+    text = format_response([PULL], format="markdown", detail="concise")
+    assert text.startswith("| number | title |")
+
+
+def test_pull_request_details_concise_and_fields(mock_github) -> None:
+    mock_github(lambda request: httpx.Response(200, json=PULL))
+    module = importlib.import_module("github_mcp_server.tools.get_pull_request_details")
+
+    async def run(**kwargs) -> dict:
+        input = module.GetPullRequestDetailsInput(repository="a/b", pull_number=7, **kwargs)
+        return json.loads(await module.get_pull_request_details(input))
+
+    concise = asyncio.run(run())
+    assert concise["head"] == {"ref": "feature", "sha": "abc"}
+    assert concise["user"] == {"login": "octocat"}
+    assert asyncio.run(run(fields=["labels[].name"])) == {"labels": [{"name": "bug"}, {"name": "ui"}]}
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from github_mcp_server.utils.api_client import make_github_request
+from github_mcp_server.utils.errors import MCPError
+from github_mcp_server.utils.rate_limit import ResourceBucket, get_scheduler, resource_for
+
+
+def test_resource_mapping() -> None:
+    assert resource_for("/search/code") == "code_search"
+    assert resource_for("/search/issues") == "search"
+    assert resource_for("/repos/o/r/pulls") == "core"
+
+
+def test_token_bucket_paces_in_arrival_order() -> None:
+    bucket = ResourceBucket(limit=2, window=1.0)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[0] == waits[1] == 0
+    assert 0.4 < waits[2] < 0.6
+    assert 0.9 < waits[3] < 1.1
+
+
+def test_secondary_limit_is_retried_after_retry_after(mock_github) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            return httpx.Response(403, headers={"retry-after": "0"}, json={"message": "secondary rate limit"})
+        return httpx.Response(200, json={"items": []}, headers={"x-ratelimit-resource": "search"})
+
+    mock_github(handler)
+    assert asyncio.run(make_github_request("/search/issues", params={"q": "x"})) == {"items": []}
+    assert len(calls) == 2
+
+
+def test_secondary_limit_without_resource_header_blocks_the_request_resource(mock_github) -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            return httpx.Response(403, headers={"retry-after": "0"}, json={"message": "secondary rate limit"})
+        return httpx.Response(200, json={"items": []})
+
+    mock_github(handler)
+    asyncio.run(make_github_request("/search/code", params={"q": "x"}))
+    resources = {key.split(":", 1)[1] for key in get_scheduler().stats()["buckets"]}
+    assert resources == {"code_search"}
+
+
+def test_exhausted_quota_fails_fast_when_reset_is_too_far(mock_github) -> None:
+    calls = []
+    reset = int(time.time()) + 3600
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(
+            200,
+            json={"ok": True},
+            headers={
+                "x-ratelimit-resource": "core",
+                "x-ratelimit-limit": "5000",
+                "x-ratelimit-remaining": "0",
+                "x-ratelimit-reset": str(reset),
+            },
+        )
+
+    mock_github(handler)
+
+    async def run():
+        assert await make_github_request("/repos/o/r") == {"ok": True}
+        await make_github_request("/repos/o/r/pulls")
+
+    with pytest.raises(MCPError) as excinfo:
+        asyncio.run(run())
+
+    assert excinfo.value.code == 429
+    assert 3500 < excinfo.value.details["wait_seconds"] <= 3600
+    assert len(calls) == 1
+    assert get_scheduler().stats()["rejected"] == 1
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+import time
+
+import pytest
+
+from github_mcp_server.utils.cache import cache_clear, get_cache
+from github_mcp_server.utils.errors import MCPError
+from github_mcp_server.utils.formatters import format_response
+from github_mcp_server.utils.result_store import ResultStore, get_result_store, parse_cursor
+from github_mcp_server.utils.tool_cache import CachePolicy, cached_tool
+
+
+fetch_more_mod = importlib.import_module("github_mcp_server.tools.fetch_more")
+
+
+def _fetch(cursor: str, format: str | None = None) -> str:
+    return asyncio.run(fetch_more_mod.fetch_more(fetch_more_mod.FetchMoreInput(cursor=cursor, format=format)))
+
+
+def _search_result(n: int) -> dict:
+    return {"total_count": n, "items": [{"number": i, "title": "t" * 200} for i in range(n)]}
+
+
+def test_store_is_bounded_by_bytes_with_lru_eviction() -> None:
+    store = ResultStore(max_bytes=2_000, ttl=60)
+    first = store.save("text", "a" * 800, "json")
+    second = store.save("text", "b" * 800, "json")
+    assert store.load(first) is not None  # first is now the most recently used
+    store.save("text", "c" * 800, "json")
+    assert store.load(second) is None
+    assert store.load(first).payload == "a" * 800
+    assert store.save("text", "d" * 5_000, "json") is None
+
+
+def test_parse_cursor_rejects_malformed_values() -> None:
+    assert parse_cursor("abc:12") == ("abc", 12)
+    with pytest.raises(MCPError):
+        parse_cursor("abc")
+
+
+def test_fetch_more_pages_through_all_items_without_gaps() -> None:
+    data = _search_result(2_000)
+    page = json.loads(format_response(data, detail="detailed"))
+    seen = [item["number"] for item in page["items"]]
+    pages = 1
+    while "_truncation" in page:
+        page = json.loads(_fetch(page["_truncation"]["next_cursor"]))
+        assert page["total_count"] == 2_000
+        seen.extend(item["number"] for item in page["items"])
+        pages += 1
+    assert seen == list(range(2_000))
+    assert pages > 2
+
+
+def test_markdown_cursor_continues_in_markdown() -> None:
+    text = format_response(_search_result(2_000), format="markdown", detail="detailed")
+    cursor = text.rsplit('next_cursor: "', 1)[1].split('"')[0]
+    assert get_result_store().load(parse_cursor(cursor)[0]) is not None
+    assert "| number | title |" in _fetch(cursor)
+
+
+def test_clipped_string_continues_where_it_was_cut() -> None:
+    content = "".join(f"line {i}\n" for i in range(40_000))
+    data = {"name": "big.txt", "decoded_content": content}
+    page = json.loads(format_response(data, detail="detailed"))
+    kept = page["decoded_content"][:-len("... [truncated]")]
+    rest = json.loads(_fetch(page["_truncation"]["next_cursor"]))
+    assert content.startswith(kept)
+    assert rest["content"].startswith(content[len(kept):len(kept) + 100])
+    assert rest["total_length"] == len(content)
+
+
+def test_unknown_cursor_is_a_404() -> None:
+    with pytest.raises(MCPError) as exc:
+        _fetch("missing:0")
+    assert exc.value.code == 404
+
+
+def test_cached_results_do_not_outlive_their_cursors(monkeypatch) -> None:
+    monkeypatch.setenv("GITHUB_RESULT_STORE_TTL", "30")
+    cache_clear()
+
+    async def tool(input: fetch_more_mod.FetchMoreInput) -> str:
+        return format_response(_search_result(2_000), detail="detailed")
+
+    wrapped = cached_tool(tool, CachePolicy(ttl=3_600), name="big")
+    asyncio.run(wrapped(fetch_more_mod.FetchMoreInput(cursor="x:0")))
+    entries = [entry for key, entry in get_cache()._entries.items() if key.startswith("tool.big:")]
+    assert len(entries) == 1
+    assert entries[0].expires_at - time.time() <= 30
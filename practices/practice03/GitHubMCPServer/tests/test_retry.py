@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from github_mcp_server.utils.api_client import make_github_request
+from github_mcp_server.utils.errors import MCPError
+from github_mcp_server.utils.retry import RetryPolicy, get_retry_stats, set_retry_policy
+
+
+@pytest.fixture
+def fast_retries():
+    set_retry_policy(RetryPolicy(max_attempts=3, deadline=5.0, base_delay=0.01, max_delay=0.02))
+    yield
+    set_retry_policy(None)
+
+
+def test_transient_failures_are_retried(mock_github, fast_retries) -> None:
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise httpx.ConnectTimeout("timed out", request=request)
+        if len(attempts) == 2:
+            return httpx.Response(502, json={"message": "Bad Gateway"})
+        return httpx.Response(200, json={"ok": True})
+
+    mock_github(handler)
+    before = get_retry_stats()
+
+    assert asyncio.run(make_github_request("/repos/o/r")) == {"ok": True}
+
+    after = get_retry_stats()
+    assert len(attempts) == 3
+    assert after["retries"] == before["retries"] + 2
+    assert after["retried_requests"] == before["retried_requests"] + 1
+    assert [e["reason"] for e in after["recent"][-2:]] == ["ConnectTimeout", "HTTP 502"]
+
+
+def test_retries_stop_at_max_attempts(mock_github, fast_retries) -> None:
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(1)
+        return httpx.Response(503, json={"message": "Unavailable"})
+
+    mock_github(handler)
+
+    with pytest.raises(MCPError) as excinfo:
+        asyncio.run(make_github_request("/repos/o/r"))
+
+    assert excinfo.value.code == 503
+    assert len(attempts) == 3
+
+
+def test_non_idempotent_requests_are_not_retried(mock_github, fast_retries) -> None:
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(1)
+        return httpx.Response(502)
+
+    mock_github(handler)
+
+    with pytest.raises(MCPError):
+        asyncio.run(make_github_request("/repos/o/r/issues", method="POST", data={"title": "x"}))
+
+    assert len(attempts) == 1
+
+
+def test_deadline_bounds_total_backoff() -> None:
+    policy = RetryPolicy(max_attempts=10, deadline=0.0, base_delay=1.0)
+    assert policy.next_delay(1, started=0.0) is None
+
+
+def test_retry_statuses_are_configurable(monkeypatch) -> None:
+    monkeypatch.setenv("GITHUB_RETRY_STATUSES", "502,503,520")
+    policy = RetryPolicy.from_env()
+    assert policy.is_retryable_status(520) and policy.is_retryable_status(502)
+    assert not policy.is_retryable_status(500)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from github_mcp_server.utils.formatters import format_markdown, format_response
+from github_mcp_server.utils.serializer import CLIP_MARKER, encode_json
+
+
+def _items(n: int, size: int = 40) -> list:
+    return [{"number": i, "title": f"Item {i} " + "x" * size} for i in range(n)]
+
+
+@pytest.mark.parametrize("data", [
+    [],
+    _items(3),
+    {"total_count": 3, "items": _items(3), "incomplete_results": False},
+    {"name": "README.md", "nested": {"a": [1, 2, {"b": "ü"}]}},
+    "plain",
+])
+def test_output_matches_json_dumps_when_it_fits(data) -> None:
+    result = encode_json(data, 100_000)
+    assert result.text == json.dumps(data, indent=2, ensure_ascii=False)
+    assert not result.truncated
+
+
+def test_envelope_is_closed_with_omitted_count_and_cursor() -> None:
+    data = {"total_count": 500, "items": _items(500)}
+    result = encode_json(data, 5_000)
+    assert len(result.text) <= 5_000
+    parsed = json.loads(result.text)
+    assert parsed["total_count"] == 500
+    assert len(parsed["items"]) == result.emitted > 0
+    assert parsed["_truncation"] == {
+        "omitted_count": result.omitted,
+        "next_cursor": str(result.emitted),
+    }
+    assert result.omitted == 500 - result.emitted
+    assert parsed["items"] == data["items"][:result.emitted]
+
+
+def test_payload_keys_never_collide_with_truncation_metadata() -> None:
+    data = {"tree_sha": "t", "truncated": False, "next_cursor": "x", "items": _items(500)}
+    parsed = json.loads(encode_json(data, 5_000).text)
+    assert parsed["truncated"] is False and parsed["next_cursor"] == "x"
+    assert parsed["_truncation"]["omitted_count"] > 0
+
+    parsed = json.loads(encode_json({"_truncation": 1, "items": _items(500)}, 5_000).text)
+    assert parsed["__truncation"] == 1
+    assert parsed["_truncation"]["omitted_count"] > 0
+
+
+def test_truncated_list_is_wrapped_and_cursor_is_customizable() -> None:
+    result = encode_json(_items(200), 3_000, cursor=lambda offset: f"c:{offset}")
+    parsed = json.loads(result.text)
+    assert parsed["_truncation"]["next_cursor"] == f"c:{result.emitted}"
+
+
+def test_list_cut_to_one_clipped_item_is_marked() -> None:
+    data = [{"number": 1, "body": "z" * 50_000}]
+    result = encode_json(data, 5_000, clip_cursor=lambda original, kept: f"t:{kept}")
+    parsed = json.loads(result.text)
+    assert result.clipped and len(result.text) <= 5_000
+    assert parsed["items"][0]["body"].endswith(CLIP_MARKER)
+    kept = len(parsed["items"][0]["body"]) - len(CLIP_MARKER)
+    assert parsed["_truncation"] == {"clipped": True, "next_cursor": f"t:{kept}"}
+
+
+def test_oversized_envelope_is_clipped_and_items_still_written() -> None:
+    data = {"description": "d" * 20_000, "items": _items(500)}
+    result = encode_json(data, 5_000)
+    parsed = json.loads(result.text)
+    assert len(result.text) <= 5_000
+    assert parsed["description"].endswith(CLIP_MARKER)
+    assert result.emitted > 0
+    assert parsed["_truncation"]["clipped"] is True
+    assert parsed["_truncation"]["omitted_count"] == 500 - result.emitted
+
+
+def test_oversized_object_has_its_longest_string_clipped() -> None:
+    data = {"name": "big.txt", "decoded_content": "y" * 50_000}
+    result = encode_json(data, 10_000)
+    parsed = json.loads(result.text)
+    assert result.clipped and len(result.text) <= 10_000
+    assert parsed["name"] == "big.txt"
+    assert parsed["decoded_content"].endswith(CLIP_MARKER)
+    assert parsed["_truncation"] == {"clipped": True}
+
+
+def test_format_response_never_cuts_json_mid_token() -> None:
+    data = {"total_count": 5000, "items": _items(5000, size=100)}
+    parsed = json.loads(format_response(data, detail="detailed"))
+    assert parsed["_truncation"]["omitted_count"] > 0
+
+
+def test_markdown_table_stops_at_budget() -> None:
+    text = format_markdown(_items(1000), "detailed", max_size=4_000)
+    assert len(text) <= 4_000
+    assert "more items omitted" in text
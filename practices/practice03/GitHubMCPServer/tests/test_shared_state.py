@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from github_mcp_server.utils.cache import CacheEngine
+from github_mcp_server.utils.conditional import ConditionalEntry
+from github_mcp_server.utils.errors import MCPError
+from github_mcp_server.utils.rate_limit import RateLimitScheduler, credential_id
+from github_mcp_server.utils.result_store import ResultStore
+from github_mcp_server.utils.shared_state import SharedState
+from github_mcp_server.utils.tables import Column, TableSchema
+
+
+@pytest.fixture
+def processes(tmp_path):
+    """Two independent connections to one state file, as two worker processes hold."""
+    states = [SharedState(tmp_path / "state.sqlite3") for _ in range(2)]
+    yield states
+    for state in states:
+        state.close()
+
+
+def _engine(state: SharedState) -> CacheEngine:
+    engine = CacheEngine(max_entries=100, max_bytes=10**6)
+    engine.shared = state.cache("cache")
+    return engine
+
+
+def test_cache_entries_are_visible_to_other_processes(processes) -> None:
+    first, second = _engine(processes[0]), _engine(processes[1])
+    first.set("tool.search:1", {"items": [1, 2]}, 60)
+    first.set("etag:/repos/o/r", "body", 60)
+    processes[0].flush()
+
+    assert second.get("tool.search:1") == {"items": [1, 2]}
+    assert second.get("tool.search:1") == {"items": [1, 2]}  # now a local hit
+    stats = second.stats()["namespaces"]["tool.search"]
+    assert (stats["hits"], stats["shared_hits"], stats["misses"]) == (2, 1, 0)
+
+    first.clear("tool.")
+    processes[0].flush()
+    assert _engine(processes[1]).get("tool.search:1") is None
+    assert _engine(processes[1]).get("etag:/repos/o/r") == "body"
+
+
+def test_expired_and_over_budget_entries_are_swept(processes) -> None:
+    engine = _engine(processes[0])
+    engine.set("a:gone", "x", 0)
+    time.sleep(0.01)
+    for i in range(5):
+        engine.set(f"a:{i}", "y" * 1000, 60 + i)
+    processes[0].flush()
+    assert _engine(processes[1]).get("a:gone") is None
+
+    engine.max_bytes = 2500
+    engine.sweep()
+    processes[0].flush()
+    reader = _engine(processes[1])
+    # The entries expiring first were dropped to fit the budget
+    assert [reader.get(f"a:{i}") is not None for i in range(5)] == [False, False, False, True, True]
+
+
+def test_cursor_issued_by_one_process_continues_on_another(processes) -> None:
+    issuing, serving = ResultStore(), ResultStore()
+    issuing.share(processes[0].cache("results"))
+    serving.share(processes[1].cache("results"))
+    table = TableSchema([Column("number", "#"), "title"])
+
+    result_id = issuing.save("items", [{"number": 1, "title": "Bug"}], "markdown", table)
+    processes[0].flush()
+    stored = asyncio.run(serving.aload(result_id))
+    assert stored.payload == [{"number": 1, "title": "Bug"}]
+    assert stored.table.columns[0].get({"number": 1}) == "1"
+
+
+def test_rate_limit_quota_is_shared(processes) -> None:
+    first, second = RateLimitScheduler(max_wait=0.5), RateLimitScheduler(max_wait=0.5)
+    first.shared, second.shared = processes
+
+    # Tokens taken by one process are gone for the other
+    for _ in range(10):
+        asyncio.run(first.acquire("abc", "code_search"))
+    with pytest.raises(MCPError) as exc:
+        asyncio.run(second.acquire("abc", "code_search"))
+    assert exc.value.code == 429
+
+    # An exhausted quota reported to one process blocks the other until reset
+    request = httpx.Request("GET", "https://api.github.com/repos/o/r")
+    response = httpx.Response(
+        200,
+        request=request,
+        headers={
+            "x-ratelimit-resource": "core",
+            "x-ratelimit-limit": "60",
+            "x-ratelimit-remaining": "0",
+            "x-ratelimit-reset": str(int(time.time()) + 600),
+        },
+    )
+    first.observe(response)
+    processes[0].flush()
+    with pytest.raises(MCPError):
+        asyncio.run(second.acquire("anonymous", "core"))
+    assert second.bucket("anonymous", "core").remaining == 0
+
+
+def test_large_values_stay_process_local(tmp_path) -> None:
+    states = [SharedState(tmp_path / "state.sqlite3", max_value_bytes=4096) for _ in range(2)]
+    try:
+        first, second = _engine(states[0]), _engine(states[1])
+        first.set("blob:big", "x" * 10_000, 60)
+        first.set("blob:small", "x" * 100, 60)
+        states[0].flush()
+        assert first.get("blob:big") == "x" * 10_000
+        assert asyncio.run(second.aget("blob:big")) is None
+        assert asyncio.run(second.aget("blob:small")) == "x" * 100
+        assert states[0].stats.oversized == 1
+    finally:
+        for state in states:
+            state.close()
+
+
+def test_values_are_stored_as_json_and_never_unpickled(processes) -> None:
+    first, second = _engine(processes[0]), _engine(processes[1])
+    first.set("etag:k", ConditionalEntry('"v1"', None, b"\x00\xffbody", {"content-type": "application/json"}), 60)
+    first.set("diff:k", object(), 60)
+    processes[0].flush()
+
+    entry = second.get("etag:k")
+    assert (entry.etag, entry.content, entry.headers) == ('"v1"', b"\x00\xffbody", {"content-type": "application/json"})
+    assert second.get("diff:k") is None
+    assert processes[0].stats.unencodable == 1
+
+    # A row that is not JSON (e.g. a pickle) is ignored rather than loaded
+    processes[0]._db.execute(
+        "INSERT OR REPLACE INTO entries VALUES ('cache', 'tool.x:1', ?, ?, 1)",
+        (b"\x80\x04K\x01.", time.time() + 60),
+    )
+    assert second.get("tool.x:1") is None
+
+
+def test_shared_quota_transactions_never_touch_the_loop_buckets(processes, monkeypatch) -> None:
+    scheduler = RateLimitScheduler(max_wait=0.5)
+    scheduler.shared = processes[0]
+    bucket = scheduler.bucket("abc", "core")
+    handed = []
+    update_quota = processes[0].update_quota
+
+    def recording(credential, resource, target, change):
+        handed.append(target)
+        return update_quota(credential, resource, target, change)
+
+    monkeypatch.setattr(processes[0], "update_quota", recording)
+    asyncio.run(scheduler.acquire("abc", "core"))
+
+    request = httpx.Request("GET", "https://api.github.com/repos/o/r", headers={"Authorization": "token abc"})
+    scheduler.observe(httpx.Response(200, request=request, headers={"x-ratelimit-remaining": "7"}))
+    # The header update is visible at once, before the shared write is done
+    assert scheduler.bucket(credential_id("token abc"), "core").remaining == 7
+    processes[0].flush()
+
+    assert handed and all(target is not bucket for target in handed)
+    assert bucket.tokens < bucket.limit
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import importlib
+
+from github_mcp_server.utils.formatters import format_response
+from github_mcp_server.utils.tables import Column, TableSchema, escape_cell
+
+
+def _pull(number: int) -> dict:
+    return {
+        "number": number,
+        "title": f"Fix | pipes\nand newlines #{number}",
+        "state": "open",
+        "draft": False,
+        "user": {"login": "octocat", "id": 1},
+        "labels": [{"name": "bug"}, {"name": "ui"}],
+        "head": {"ref": "feature", "repo": {"full_name": "a/b", "owner": {"login": "a"}}},
+        "base": {"ref": "main"},
+        "merged_at": None,
+    }
+
+
+def test_nested_paths_are_flattened() -> None:
+    table = TableSchema([Column("number", "#"), Column("user.login", "author"), "labels[].name", "head.repo.owner.login"])
+    lines = table.render([_pull(1)]).splitlines()
+    assert lines[0] == "| # | author | labels[].name | head.repo.owner.login |"
+    assert lines[2] == "| 1 | octocat | bug, ui | a |"
+
+
+def test_cells_are_escaped_and_shortened() -> None:
+    assert escape_cell("a|b\nc") == "a\\|b c"
+    assert escape_cell("x" * 80, width=10) == "x" * 9 + "…"
+    row = TableSchema(["title", "merged_at", "draft"]).render([_pull(7)]).splitlines()[2]
+    assert row == "| Fix \\| pipes and newlines #7 |  | false |"
+
+
+def test_rows_stop_at_the_budget_with_a_cursor() -> None:
+    table = TableSchema(["number", "title"])
+    items = [_pull(i) for i in range(1000)]
+    text = table.render(items, max_size=3_000, cursor=lambda offset: f"c:{offset}")
+    shown = len(text.split("\n\n")[0].splitlines()) - 2
+    assert 0 < shown < 1000
+    assert text.endswith(f'{1000 - shown} more items omitted (next_cursor: "c:{shown}")')
+    # Blocks give the same rows as rendering everything
+    assert table.render(items).splitlines()[2:2 + shown] == text.splitlines()[2:2 + shown]
+
+
+def test_pull_request_list_markdown_uses_the_tool_schema() -> None:
+    module = importlib.import_module("github_mcp_server.tools.list_pull_requests")
+    text = format_response(
+        [_pull(i) for i in range(100)],
+        format="markdown",
+        detail="detailed",
+        projection=module.PROJECTION,
+        table=module.TABLE,
+    )
+    lines = text.splitlines()
+    assert lines[0].startswith("| # | title | state | draft | author | head | base |")
+    assert lines[2].startswith("| 0 | Fix \\| pipes and newlines #0 | open | false | octocat | feature | main |")
+    assert "{" not in text
+
+
+def test_fields_select_the_columns() -> None:
+    text = format_response([_pull(1)], format="markdown", fields=["number", "user.login"])
+    assert text.splitlines()[:3] == ["| number | user.login |", "|---|---|", "| 1 | octocat |"]
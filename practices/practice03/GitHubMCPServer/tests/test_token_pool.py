@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import httpx
+
+from github_mcp_server.utils.api_client import make_github_request
+from github_mcp_server.utils.rate_limit import RateLimitScheduler, credential_id
+from github_mcp_server.utils.token_pool import (
+    TokenPool,
+    authorization_for,
+    get_token_pool_stats,
+    load_tokens_from_env,
+)
+
+
+def test_tokens_are_loaded_from_env_and_file(tmp_path, monkeypatch) -> None:
+    tokens_file = tmp_path / "tokens.txt"
+    tokens_file.write_text("# pool\ntok-c\ntok-a  # duplicate\n\n", encoding="utf-8")
+    monkeypatch.setenv("GITHUB_TOKEN", "tok-a")
+    monkeypatch.setenv("GITHUB_TOKENS", "tok-b, tok-a,")
+    monkeypatch.setenv("GITHUB_TOKENS_FILE", str(tokens_file))
+
+    assert load_tokens_from_env() == ["tok-a", "tok-b", "tok-c"]
+
+
+def test_select_prefers_token_with_most_headroom() -> None:
+    scheduler = RateLimitScheduler()
+    pool = TokenPool(["tok-a", "tok-b"], scheduler=scheduler)
+    scheduler.bucket(credential_id(authorization_for("tok-a")), "core").update(5000, 100, None)
+    scheduler.bucket(credential_id(authorization_for("tok-b")), "core").update(5000, 4000, None)
+    assert pool.select("core") == "tok-b"
+
+    # An exhausted token is skipped until its reset time
+    reset = int(time.time()) + 600
+    scheduler.bucket(credential_id(authorization_for("tok-b")), "core").update(5000, 0, reset)
+    assert pool.select("core") == "tok-a"
+
+
+def test_unauthorized_token_is_quarantined_and_request_rerouted(mock_github, monkeypatch) -> None:
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.setenv("GITHUB_TOKENS", "bad-token,good-token")
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        auth = request.headers.get("authorization")
+        seen.append(auth)
+        if auth == "Bearer bad-token":
+            return httpx.Response(401, json={"message": "Bad credentials"})
+        return httpx.Response(200, json={"ok": True})
+
+    mock_github(handler)
+
+    async def run():
+        first = await make_github_request("/repos/o/r")
+        second = await make_github_request("/repos/o/r/pulls")
+        return first, second
+
+    assert asyncio.run(run()) == ({"ok": True}, {"ok": True})
+    assert seen.count("Bearer bad-token") == 1
+    assert seen[-1] == "Bearer good-token"
+
+
+def test_quarantine_follows_the_reset_time_of_the_401(mock_github, monkeypatch) -> None:
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.setenv("GITHUB_TOKENS", "bad-token,good-token")
+    reset = int(time.time()) + 120
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("authorization") == "Bearer bad-token":
+            return httpx.Response(401, json={"message": "Bad credentials"}, headers={"x-ratelimit-reset": str(reset)})
+        return httpx.Response(200, json={"ok": True})
+
+    mock_github(handler)
+    asyncio.run(make_github_request("/repos/o/r"))
+    benched = [t for t in get_token_pool_stats()["members"] if t["quarantined_for"] > 0]
+    assert len(benched) == 1 and 100 < benched[0]["quarantined_for"] <= 120
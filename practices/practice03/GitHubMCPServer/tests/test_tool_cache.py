@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+
+import httpx
+
+from github_mcp_server.utils.cache import cache_clear
+from github_mcp_server.utils.tool_cache import cached_tool
+
+# Import tool submodules explicitly (the package re-exports same-named functions)
+get_file_content_mod = importlib.import_module("github_mcp_server.tools.get_file_content")
+get_issue_details_mod = importlib.import_module("github_mcp_server.tools.get_issue_details")
+
+
+def test_identical_calls_are_served_from_cache(mock_github) -> None:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(200, json={"number": 7, "title": "Bug"})
+
+    mock_github(handler)
+    cache_clear()
+    tool = cached_tool(
+        get_issue_details_mod.get_issue_details,
+        get_issue_details_mod.CACHE_POLICY,
+        name="get_issue_details",
+    )
+    Input = get_issue_details_mod.GetIssueDetailsInput
+
+    async def run():
+        first = await tool(Input(repository="o/r", issue_number=7))
+        second = await tool(Input(repository="o/r", issue_number=7))
+        other_format = await tool(Input(repository="o/r", issue_number=7, format="markdown"))
+        return first, second, other_format
+
+    first, second, other_format = asyncio.run(run())
+
+    assert first == second
+    assert other_format != first
+    assert requests == ["/repos/o/r/issues/7", "/repos/o/r/issues/7"]
+
+
+def test_file_content_ttl_depends_on_ref() -> None:
+    Input = get_file_content_mod.GetFileContentInput
+    policy = get_file_content_mod.CACHE_POLICY
+    pinned = Input(repository="o/r", path="a.py", ref="a" * 40)
+    branch = Input(repository="o/r", path="a.py", ref="main")
+    assert policy.ttl_for(pinned) > policy.ttl_for(branch)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+from fastmcp import Client, FastMCP
+
+from github_mcp_server.utils.cache import cache_clear
+from github_mcp_server.utils.tool_registry import (
+    TOOL_NAMES,
+    LazyTool,
+    build_manifest,
+    load_manifest,
+    registered_tools,
+)
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+
+
+def _server(lazy: bool) -> FastMCP:
+    server = FastMCP(name="registry-test")
+    for tool in registered_tools(lazy=lazy):
+        server.add_tool(tool)
+    return server
+
+
+async def _list_tools(server: FastMCP) -> list:
+    async with Client(server) as client:
+        return [tool.model_dump() for tool in await client.list_tools()]
+
+
+def test_manifest_is_up_to_date() -> None:
+    # Fails after a tool changes: run scripts/build_tool_manifest.py
+    assert load_manifest() == build_manifest()
+
+
+def test_lazy_and_eager_servers_list_the_same_tools() -> None:
+    lazy = _server(lazy=True)
+    lazy_tools = asyncio.run(_list_tools(lazy))
+    assert [tool["name"] for tool in lazy_tools] == list(TOOL_NAMES)
+    assert lazy_tools == asyncio.run(_list_tools(_server(lazy=False)))
+
+
+def test_lazy_tool_is_built_on_first_call(mock_github) -> None:
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return httpx.Response(200, json={"number": 7, "title": "Bug", "state": "open"})
+
+    mock_github(handler)
+    cache_clear()
+    tool = next(t for t in registered_tools(lazy=True) if t.name == "get_issue_details")
+    assert isinstance(tool, LazyTool) and not tool.loaded
+
+    arguments = {"input": {"repository": "o/r", "issue_number": 7}}
+    first = asyncio.run(tool.run(arguments))
+    second = asyncio.run(tool.run(arguments))
+    assert tool.loaded
+    assert json.loads(first.structured_content["result"])["title"] == "Bug"
+    # The real tool keeps its CACHE_POLICY
+    assert second.structured_content == first.structured_content and requests == ["/repos/o/r/issues/7"]
+
+
+def test_stale_manifest_falls_back_to_eager(tmp_path) -> None:
+    manifest = build_manifest()
+    manifest["source_digest"] = "0" * 64
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+    assert load_manifest(path) is None
+    assert load_manifest(tmp_path / "missing.json") is None
+
+
+def test_server_import_loads_neither_tools_nor_the_http_stack() -> None:
+    code = (
+        "import sys; import github_mcp_server.server; "
+        "print(sorted(m for m in sys.modules if m.startswith('github_mcp_server.tools.') or m == 'httpx'))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(SRC_PATH), "GITHUB_LAZY_TOOLS": "true"},
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+
+import httpx
+
+from github_mcp_server.utils.trees import TreeIndex, fetch_tree_index
+
+list_contents = importlib.import_module("github_mcp_server.tools.list_repository_contents")
+
+ENTRIES = [
+    {"path": "README.md", "type": "blob", "sha": "a1", "size": 10},
+    {"path": "src", "type": "tree", "sha": "t1"},
+    {"path": "src/app.py", "type": "blob", "sha": "a2", "size": 20},
+    {"path": "src/pkg", "type": "tree", "sha": "t2"},
+    {"path": "src/pkg/util.py", "type": "blob", "sha": "a3", "size": 30},
+    {"path": "src/pkg/data.json", "type": "blob", "sha": "a4", "size": 40},
+    {"path": "src0.txt", "type": "blob", "sha": "a5", "size": 50},
+]
+
+
+def test_tree_index_prefix_glob_and_depth() -> None:
+    index = TreeIndex(ENTRIES, tree_sha="root")
+
+    def paths(**kwargs):
+        return [index.paths[i] for i in index.select(**kwargs)]
+
+    assert paths(prefix="src") == ["src/app.py", "src/pkg", "src/pkg/data.json", "src/pkg/util.py"]
+    assert paths(prefix="src", max_depth=1) == ["src/app.py", "src/pkg"]
+    assert paths(pattern="*.py") == ["src/app.py", "src/pkg/util.py"]
+    assert paths(prefix="src", pattern="src/pkg/*") == ["src/pkg/data.json", "src/pkg/util.py"]
+    assert index.entry(0) == {"path": "README.md", "type": "file", "sha": "a1", "size": 10}
+
+
+def test_recursive_listing_uses_one_tree_request(mock_github) -> None:
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append((request.url.path, request.url.params.get("recursive")))
+        return httpx.Response(200, json={"sha": "root", "tree": ENTRIES, "truncated": False})
+
+    mock_github(handler)
+    params = list_contents.ListRepositoryContentsInput(
+        repository="o/r", path="src", recursive=True, pattern="*.py", ref="main"
+    )
+    result = json.loads(asyncio.run(list_contents.list_repository_contents(params)))
+
+    assert requested == [("/repos/o/r/git/trees/main", "1")]
+    assert result["items"] == ["src/app.py", "src/pkg/util.py"]
+    assert result["total_count"] == 2
+    assert result["limit_reached"] is False
+
+
+def test_truncated_tree_is_walked_by_subtree(mock_github) -> None:
+    trees = {
+        "root": [
+            {"path": "README.md", "type": "blob", "sha": "a1", "size": 10},
+            {"path": "src", "type": "tree", "sha": "t1"},
+            {"path": "docs", "type": "tree", "sha": "t3"},
+        ],
+        "t1": [
+            {"path": "app.py", "type": "blob", "sha": "a2", "size": 20},
+            {"path": "pkg", "type": "tree", "sha": "t2"},
+            {"path": "pkg/util.py", "type": "blob", "sha": "a3", "size": 30},
+        ],
+        "t3": [{"path": "index.md", "type": "blob", "sha": "a6", "size": 5}],
+    }
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sha = request.url.path.rsplit("/", 1)[-1]
+        recursive = request.url.params.get("recursive") == "1"
+        requested.append((sha, recursive))
+        if sha == "HEAD":
+            return httpx.Response(200, json={"sha": "root", "tree": trees["root"][:1], "truncated": True})
+        tree = trees[sha] if recursive else [e for e in trees[sha] if "/" not in e["path"]]
+        return httpx.Response(200, json={"sha": sha, "tree": tree, "truncated": False})
+
+    mock_github(handler)
+    index = asyncio.run(fetch_tree_index("o", "r", prefix="src"))
+
+    # docs/ cannot contain entries below src/ and is never fetched
+    assert ("t3", True) not in requested
+    assert index.paths == ["README.md", "docs", "src", "src/app.py", "src/pkg", "src/pkg/util.py"]
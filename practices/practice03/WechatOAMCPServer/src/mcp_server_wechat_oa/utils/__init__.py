@@ -4,10 +4,12 @@
 - api_client: 通用 HTTP 客户端封装
 - formatters: 响应格式化（JSON/Markdown）
 - errors: 统一错误处理与异常类
+- budget: 按 token 计算的输出预算
 """
 
 __all__ = [
     "api_client",
     "formatters",
     "errors",
+    "budget",
 ]
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""按 token 计算输出预算
+
+固定的“每 token 4 个字符”会把中文内容（约每字一个 token）的 token 数低估
+3–4 倍。安装了 tiktoken 时使用真实的 BPE 分词器计数，否则按字符类别快速估算：
+中文等 CJK 字符每字计 1 个 token，英文按 BPE 预分词的方式（单词连同前导空格
+或符号、数字每三位一组、标点串、空白串）计数。不超过 MEMO_MAX_CHARS 的字符串
+缓存计数结果，更长的文本（整篇文章、完整响应）每次直接计数，避免缓存长期持有
+大字符串。
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Optional
+
+
+TOKEN_LIMIT = 25000  # 单次响应的 token 预算
+
+MEMO_MAX_CHARS = 8192  # 超过此长度的字符串不缓存计数结果
+
+_CJK = (
+    "\u1100-\u11ff\u2e80-\u2fdf\u3000-\u30ff\u3100-\u31ff\u3400-\u4dbf"
+    "\u4e00-\u9fff\ua960-\ua97f\uac00-\ud7ff\uf900-\ufaff\ufe30-\ufe4f\uff00-\uffef"
+)
+_PUNCT = r"!-/:-@\[-`{-~"
+
+# 每个匹配估计为一个 token
+_PIECE = re.compile(
+    f"[{_CJK}]"
+    f"|[ {_PUNCT}]?[A-Za-z]{{1,12}}"
+    r"|[0-9]{1,3}"
+    "|[\u00c0-\u1fff]{1,3}"
+    f"| ?[{_PUNCT}]{{1,2}}"
+    r"|\s+"
+    r"|.",
+    re.S,
+)
+
+
+def _load_tiktoken() -> Optional[Callable[[str], int]]:
+    try:
+        import tiktoken
+
+        encode = tiktoken.get_encoding("cl100k_base").encode
+    except Exception:
+        return None
+    return lambda text: len(encode(text, disallowed_special=()))
+
+
+_encoder = _load_tiktoken()
+
+
+def _count(text: str) -> int:
+    if _encoder is not None:
+        return _encoder(text)
+    return _PIECE.subn("", text)[1]
+
+
+_memo = lru_cache(maxsize=1024)(_count)
+
+
+def count_tokens(text: str) -> int:
+    """统计文本的 token 数（不超过 MEMO_MAX_CHARS 的字符串缓存结果）。"""
+    if len(text) <= MEMO_MAX_CHARS:
+        return _memo(text)
+    return _count(text)
+
+
+def fit_prefix(text: str, limit: int) -> int:
+    """返回 token 数不超过 limit 的最长前缀长度。"""
+    if count_tokens(text) <= limit:
+        return len(text)
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if _count(text[:middle]) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return low
@@ -3,8 +3,7 @@
 import json
 from typing import Any, Literal
 
-
-CHARACTER_LIMIT = 25000 * 4  # ~25k tokens
+from .budget import TOKEN_LIMIT, count_tokens, fit_prefix
 
 
 def format_response(
@@ -28,14 +27,14 @@ def format_response(
             else format_markdown_detailed(data)
         )
 
-    if len(result) > CHARACTER_LIMIT:
-        result = truncate_response(result, CHARACTER_LIMIT)
+    if count_tokens(result) > TOKEN_LIMIT:
+        result = truncate_response(result, TOKEN_LIMIT)
     return result
 
 
-def truncate_response(text: str, max_chars: int) -> str:
-    """截断过长的响应。"""
-    truncated = text[:max_chars]
+def truncate_response(text: str, max_tokens: int) -> str:
+    """截断过长的响应（按 token 计）。"""
+    truncated = text[:fit_prefix(text, max_tokens)]
     return (
         f"""{truncated}
 